@@ -3,7 +3,10 @@ import os
 import re
 import logging
 from sfdbtester.common import userinput as ui
+from sfdbtester.common.sfdb_report import REPORT_FORMATS
 from sfdbtester.sfdb import sfdb
+from sfdbtester.sfdb.sfdb_stream import SFDBHeader, read_sfdb_header
+from sfdbtester.sfdb.sql_table_schema import SCHEMA_STORE_MANIFEST
 
 
 class WrongArgumentError(Exception):
@@ -39,6 +42,11 @@ def exclusion_index(i):
 
 
 def sfdb_file(input_filepath):
+    """Checks whether the filepath provided as argument leads to an actual file and loads it."""
+    return sfdb.SFDBContainer.from_file(sfdb_filepath(input_filepath), keep_lines=False)
+
+
+def sfdb_filepath(input_filepath):
     """Checks whether the filepath provided as argument leads to an actual file."""
     if input_filepath == '':
         raise WrongArgumentError('argument sfdb_new or -c/--comparison_sfdb: expected one argument')
@@ -51,7 +59,21 @@ def sfdb_file(input_filepath):
         raise WrongArgumentError(f'argument sfdb_new or -c/--comparison_sfdb: '
                                  f'The file \'{input_filepath}\' does not exist!')
     else:
-        return sfdb.SFDBContainer.from_file(input_filepath)
+        return input_filepath
+
+
+def schema_source(input_path):
+    """Checks whether the path provided as argument leads to a schema file or a schema store directory."""
+    manifest_path = os.path.join(input_path, SCHEMA_STORE_MANIFEST)
+    if os.path.isdir(input_path) and not os.path.isfile(manifest_path):
+        raise WrongArgumentError(f'argument -ss/--schema_source: '
+                                 f'The directory \'{input_path}\' is not a schema store! It has no manifest.')
+
+    elif not os.path.exists(input_path):
+        raise WrongArgumentError(f'argument -ss/--schema_source: '
+                                 f'The file \'{input_path}\' does not exist!')
+    else:
+        return input_path
 
 
 # TODO: Use add_arguments "dest=" to change the namespace some of the variables are assigned to for more readable
@@ -66,8 +88,12 @@ def parse_args(args):
 
     _check_regex(parsed_args.column_patterns, parsed_args.sfdb_new)
     _check_excluded_line_indices(parsed_args.excluded_lines1, parsed_args.sfdb_new)
+    sfdb_old_header = _read_header(parsed_args.sfdb_old) if parsed_args.sfdb_old else None
+    _check_excluded_columns(parsed_args.excluded_columns, parsed_args.sfdb_new.sfdb_header, sfdb_old_header)
+    parsed_args.sfdb_old = _load_comparison_sfdb(parsed_args.sfdb_old, sfdb_old_header, parsed_args.excluded_columns)
     _check_excluded_line_indices(parsed_args.excluded_lines2, parsed_args.sfdb_old)
-    _check_excluded_columns(parsed_args.excluded_columns, parsed_args.sfdb_new, parsed_args.sfdb_old)
+    _check_summary(parsed_args.summary, parsed_args.report_format)
+    _check_reject_invalid(parsed_args.reject_invalid, parsed_args.repair)
 
     parsed_args.column_patterns = _make_column_regex_dict(parsed_args.column_patterns)
 
@@ -83,7 +109,7 @@ def _build_parser():
                         dest='column_patterns',
                         help='A list of column names of columns in the SFDB file and regular expressions. All values '
                              'of the columns are checked whether they comply with the provided regular expression.')
-    parser.add_argument('-c',  '--comparison_sfdb', type=sfdb_file, default=None, dest='sfdb_old',
+    parser.add_argument('-c',  '--comparison_sfdb', type=sfdb_filepath, default=None, dest='sfdb_old',
                         help='Filepath to a second SFDB file to compare to the first')
     parser.add_argument('-x1', '--excluded_lines1', default=[], type=exclusion_index, nargs='+',
                         help='Indices of lines in new SFDB file to exclude from comparison with second SFDB file. '
@@ -94,10 +120,28 @@ def _build_parser():
     parser.add_argument('-xc', '--excluded_columns', default=[], type=str, nargs='+',
                         help='Names of columns occurring in first or second SFDB file to exclude from their '
                                'comparison')
+    parser.add_argument('-ss', '--schema_source', type=schema_source, default=None,
+                        help='Path to a schema file or schema store directory to take the SQL table schemas from '
+                             'instead of the sfdb_schemas.json resource')
     parser.add_argument('-w', '--write', action='store_true',
                         help='If SFDB file contains duplicates, write new SFDB file without duplicates')
     parser.add_argument('-s',  '--sorted', action='store_true',
                         help='Sorts line of SFDB file before writing with -w')
+    parser.add_argument('-rp', '--repair', action='store_true',
+                        help='Writes a repaired SFDB file without entries with a wrong number of values and without '
+                             'duplicates. Rejected entries are written with their line index to a separate file')
+    parser.add_argument('-ri', '--reject_invalid', action='store_true',
+                        help='Also rejects entries that fail the datatype test or a regular expression of -re when '
+                             'repairing with -rp')
+    parser.add_argument('-rf', '--report_format', choices=REPORT_FORMATS, default=None,
+                        help='Additionally writes every finding of the checks as a record to a machine-readable '
+                             'report file next to the log file')
+    parser.add_argument('-su', '--summary', action='store_true',
+                        help='Only logs the number of findings of each check per column and per kind of error instead '
+                             'of every single finding')
+    parser.add_argument('-is', '--infer_schema', action='store_true',
+                        help='Proposes an SQL table schema for the SFDB file from its values and writes it as JSON '
+                             'snippet in the format of the schema file next to the log file')
     parser.add_argument('-r',  '--request', action='store_true',
                         help='If enabled requests command line arguments individually via user-input')
 
@@ -119,7 +163,7 @@ def _check_regex(column_regex_list, sfdb_object):
 
     column_list = [val for i, val in enumerate(column_regex_list) if i % 2 == 0]
     for column in column_list:
-        if column not in sfdb_object.columns:
+        if column not in sfdb_object.sfdb_header.column_indices:
             raise WrongArgumentError(f'argument -re/--regular_expression: '
                                      f'{column} is not a column in {sfdb_object.name}! ')
 
@@ -146,25 +190,59 @@ def _check_excluded_line_indices(index_list_for_sfdb, args_sfdb):
     if not index_list_for_sfdb:
         return
 
-    invalid_indices = [i for i in index_list_for_sfdb if i >= len(args_sfdb.sfdb_lines)]
+    line_count = len(args_sfdb) + args_sfdb.i_header_end
+    invalid_indices = [i for i in index_list_for_sfdb if i >= line_count]
     if invalid_indices:
         raise WrongArgumentError(f'argument -x1/--exclusion_index1 or -x2/--exclusion_index2: '
                                  f'Indices {invalid_indices} are out of bounds for {args_sfdb.name} with '
-                                 f'{len(args_sfdb.sfdb_lines)} lines!')
+                                 f'{line_count} lines!')
 
 
-def _check_excluded_columns(excluded_columns, sfdb1, sfdb2):
+def _check_excluded_columns(excluded_columns, sfdb_header1, sfdb_header2):
     if not excluded_columns:
         return
 
-    if not sfdb2:
+    if not sfdb_header2:
         raise WrongArgumentError('argument -xc/-excluded_columns: Can not use argument -xc without argument -c')
 
-    invalid_columns = [col for col in excluded_columns if (col not in sfdb1.columns or col not in sfdb2.columns)]
+    invalid_columns = [col for col in excluded_columns
+                       if (col not in sfdb_header1.column_indices or col not in sfdb_header2.column_indices)]
     if invalid_columns:
         raise WrongArgumentError(f'argument -xc/-excluded_columns: '
-                                 f'Table columns {invalid_columns} are not present in both {sfdb1.name} and '
-                                 f'{sfdb2.name} !')
+                                 f'Table columns {invalid_columns} are not present in both {sfdb_header1.name} and '
+                                 f'{sfdb_header2.name} !')
+
+
+def _read_header(sfdb_filepath):
+    """Reads only the header of an sfdb file."""
+    with open(sfdb_filepath, encoding='utf8') as sfdb_stream:
+        return SFDBHeader(read_sfdb_header(sfdb_stream, sfdb_filepath))
+
+
+def _load_comparison_sfdb(sfdb_filepath, sfdb_header, excluded_columns):
+    """Loads the sfdb to compare with. The comparison is the only check run on it, so the columns excluded from the
+    comparison are not loaded at all, unless some entries have a wrong number of values."""
+    if sfdb_filepath is None:
+        return None
+
+    compared_columns = [column for column in sfdb_header.columns if column not in excluded_columns]
+    if excluded_columns and compared_columns:
+        try:
+            return sfdb.SFDBContainer.from_file(sfdb_filepath, columns=compared_columns)
+        except ValueError:
+            pass
+    return sfdb.SFDBContainer.from_file(sfdb_filepath, keep_lines=False)
+
+
+def _check_summary(summary, report_format):
+    if summary and report_format:
+        raise WrongArgumentError('argument -su/--summary: Can not use argument -su together with argument -rf, as no '
+                                 'individual findings are collected')
+
+
+def _check_reject_invalid(reject_invalid, repair):
+    if reject_invalid and not repair:
+        raise WrongArgumentError('argument -ri/--reject_invalid: Can not use argument -ri without argument -rp')
 
 
 def request_missing_args(partial_args):
@@ -0,0 +1,61 @@
+"""This module writes the results of the SFDB checks into a machine-readable report file. Each finding of a check is
+written as a single record with the fields check, line, column, value and message the moment it is handed over, so
+the report never has to be held in memory. The findings of a check are handed over after the check finished, one
+record at a time from the check's compact result, see the report_* functions of sfdb_checks. Supported formats are
+JSON-lines (one JSON object per line) and CSV."""
+import csv
+import json
+
+REPORT_FORMATS = ('jsonl', 'csv')
+REPORT_FIELDS = ('check', 'line', 'column', 'value', 'message')
+
+
+class FindingsReport:
+    """A file-backed stream of finding records. Can be used as a context manager, which closes the report file."""
+    def __init__(self, report_filepath, report_format='jsonl'):
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(f'Unknown report format {report_format}! Allowed formats are {REPORT_FORMATS}')
+
+        self.filepath = report_filepath
+        self.report_format = report_format
+        self.record_count = 0
+        self._stream = open(report_filepath, mode='w', encoding='utf-8', newline='')
+
+        self._csv_writer = None
+        if report_format == 'csv':
+            self._csv_writer = csv.writer(self._stream)
+            self._csv_writer.writerow(REPORT_FIELDS)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, check, line, column, value, message):
+        """Writes a single finding to the report file.
+
+        Parameters:
+            check (str): The name of the check that produced the finding.
+            line (int): The (human) line index of the finding in the sfdb file. Starts from 1.
+            column (str): The name of the column with the faulty value. None if the finding concerns an entire line.
+            value (str): The faulty value or line.
+            message (str): A message explaining why the value is faulty.
+        """
+        line = None if line is None else int(line)
+        if self._csv_writer is not None:
+            self._csv_writer.writerow((check, line, '' if column is None else column, value, message))
+        else:
+            record = dict(zip(REPORT_FIELDS, (check, line, column, value, message)))
+            self._stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        self.record_count += 1
+
+    def close(self):
+        if not self._stream.closed:
+            self._stream.close()
+
+
+def create_report_filepath(log_filepath, report_format):
+    """Returns the filepath of the report file that belongs to a log file."""
+    return f'{log_filepath[:-4]}.{report_format}'
@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 
+import numpy as np
+
 
 def get_resource_filepath(resource_name):
     """Returns the absolute filepath of a file or directory in the resource folder."""
@@ -14,3 +16,16 @@ def get_resource_filepath(resource_name):
         raise ValueError(f'{file_path} is not a file nor a directory!')
 
     return str(file_path)
+
+
+def vectorized_search(pattern, values, prefilter=None):
+    """Returns a boolean array that is True wherever a compiled regular expression can be found in an array of string
+    values. If prefilter is given, the regular expression is only run on values that contain the prefilter substring."""
+    is_match = np.zeros(len(values), dtype=bool)
+    if len(values) == 0:
+        return is_match
+
+    i_candidates = np.arange(len(values)) if prefilter is None else np.flatnonzero(np.char.find(values, prefilter) >= 0)
+    search = pattern.search
+    is_match[i_candidates] = [search(value) is not None for value in values[i_candidates]]
+    return is_match
@@ -0,0 +1,149 @@
+"""This module proposes an SQL table schema for SFDB files whose table is not recorded in the sfdb_schemas.json
+resource. The SFDB file is streamed through once in chunks of entries, and only a handful of statistics per column are
+kept in between chunks, so the inference runs in bounded memory even on files of several GB.
+
+The proposed columns can be written as a JSON snippet in the format of the schema file, ready to be reviewed and added
+to it."""
+import json
+
+import numpy as np
+
+from sfdbtester.sfdb.sfdb_stream import DEFAULT_CHUNK_SIZE, get_header_columns, iter_line_chunks, read_sfdb_header
+from sfdbtester.sfdb.sql_datatypes import DATETIME_RANGES, to_datetime64, to_decimal_digits, to_int64
+from sfdbtester.sfdb.sql_table_schema import Column
+
+INT_MAX_DIGITS = 9  # Unsigned integers with up to 9 digits always fit into an SQL int
+DECIMAL_MAX_PRECISION = 38
+DATETIME_MIN_DATE = np.datetime64(DATETIME_RANGES['datetime'][0], 'D')
+
+
+class ColumnStatistics:
+    """Statistics of the values of a column that are needed to propose its SQL datatype. Values are added array by
+    array with update.
+
+    Parameters:
+        name (str): The name of the column.
+    """
+    __slots__ = ('name', 'max_length', 'has_null', 'value_count', 'is_bit', 'is_int', 'is_bigint', 'is_decimal',
+                 'integer_digits', 'fraction_digits', 'is_date', 'min_date')
+
+    def __init__(self, name):
+        self.name = name
+        self.max_length = 0
+        self.has_null = False
+        self.value_count = 0
+        self.is_bit = True
+        self.is_int = True
+        self.is_bigint = True
+        self.is_decimal = True
+        self.integer_digits = 0
+        self.fraction_digits = 0
+        self.is_date = True
+        self.min_date = None
+
+    def update(self, values):
+        """Adds an array of values of the column to the statistics."""
+        if len(values) == 0:
+            return
+
+        lengths = np.char.str_len(values)
+        self.max_length = max(self.max_length, int(lengths.max()))
+        is_null = values == ''
+        self.has_null = self.has_null or bool(is_null.any())
+
+        values = values[~is_null]
+        lengths = lengths[~is_null]
+        if len(values) == 0:
+            return
+        self.value_count += len(values)
+
+        if self.is_bit:
+            self.is_bit = bool(np.all((values == '0') | (values == '1')))
+
+        if self.is_bigint:
+            _, is_integer = to_int64(values)
+            self.is_bigint = bool(is_integer.all())
+            self.is_int = self.is_int and self.is_bigint and bool(np.all(lengths <= INT_MAX_DIGITS) and
+                                                                  not np.any(np.char.startswith(values, '-')))
+
+        if self.is_decimal:
+            integer_digits, fraction_digits, is_decimal = to_decimal_digits(values)
+            self.is_decimal = bool(is_decimal.all())
+            if self.is_decimal:
+                self.integer_digits = max(self.integer_digits, int(integer_digits.max()))
+                self.fraction_digits = max(self.fraction_digits, int(fraction_digits.max()))
+
+        if self.is_date:
+            dates = to_datetime64(values)
+            self.is_date = not bool(np.isnat(dates).any())
+            if self.is_date:
+                self.min_date = dates.min() if self.min_date is None else min(self.min_date, dates.min())
+
+    def propose_column(self):
+        """Proposes the SQL column definition that fits all values added so far. Prefers the most specific datatype in
+        the order bit, int, bigint, decimal, datetime and datetime2 and falls back to nvarchar."""
+        if self.value_count == 0:
+            return Column(self.name, 'nvarchar', max(self.max_length, 1), self.has_null)
+
+        if self.is_bit:
+            return Column(self.name, 'bit', 1, self.has_null)
+        elif self.is_int:
+            return Column(self.name, 'int', self.max_length, self.has_null)
+        elif self.is_bigint:
+            return Column(self.name, 'bigint', 8, self.has_null)
+        elif self.is_decimal and self.integer_digits + self.fraction_digits <= DECIMAL_MAX_PRECISION:
+            precision = max(self.integer_digits + self.fraction_digits, 1)
+            return Column(self.name, f'decimal({precision},{self.fraction_digits})', self.max_length, self.has_null)
+        elif self.is_date:
+            datatype = 'datetime' if self.min_date >= DATETIME_MIN_DATE else 'datetime2'
+            return Column(self.name, datatype, 10, self.has_null)
+        else:
+            return Column(self.name, 'nvarchar', self.max_length, self.has_null)
+
+
+def infer_schema(sfdb_filepath, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Proposes an SQL table schema for an SFDB file in a single streaming pass. Entries with a wrong number of values
+    are ignored, as they are reported by the content format check.
+
+    Parameters:
+        sfdb_filepath (str): Path of the sfdb file.
+        chunk_size (int): The number of entries that are held in memory at once.
+    Returns:
+        str: The name of the table.
+        list: List of Column tuples, one per column of the sfdb.
+    """
+    with open(sfdb_filepath, encoding='utf8') as sfdb_stream:
+        header_lines = read_sfdb_header(sfdb_stream, sfdb_filepath)
+        table_name, column_names = get_header_columns(header_lines)
+        statistics = [ColumnStatistics(column_name) for column_name in column_names]
+
+        for lines in iter_line_chunks(sfdb_stream, chunk_size):
+            entries = [entry for entry in (line.split('\t') for line in lines) if len(entry) == len(column_names)]
+            if not entries:
+                continue
+
+            table = np.array(entries)
+            for column_index, column_statistics in enumerate(statistics):
+                column_statistics.update(table[:, column_index])
+
+    return table_name, [column_statistics.propose_column() for column_statistics in statistics]
+
+
+def create_schema_snippet(table_name, columns):
+    """Turns the columns of a table into a JSON snippet in the format of the sfdb_schemas.json resource."""
+    table_columns = [{'column_name': column.name,
+                      'datatype': column.datatype,
+                      'length': column.length,
+                      'with_null': column.with_null} for column in columns]
+    return json.dumps({table_name: table_columns}, indent=4)
+
+
+def write_schema_snippet(snippet_filepath, table_name, columns):
+    """Writes the JSON snippet of the columns of a table to a file."""
+    with open(snippet_filepath, mode='w', encoding='utf-8') as snippet_stream:
+        snippet_stream.write(create_schema_snippet(table_name, columns) + '\n')
+
+
+def create_schema_snippet_filepath(log_filepath):
+    """Returns the filepath of the schema snippet that belongs to a log file."""
+    return f'{log_filepath[:-4]}_schema.json'
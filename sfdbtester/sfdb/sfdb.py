@@ -14,38 +14,67 @@ each value. Entries start at the 5th (i=5) line in the file, as all lines before
 useful for fast comparisons and tests.
 
 For line- and entry-indices the following rule applies: line_index - 5 = entry_index."""
+import hashlib
 import os
-from functools import lru_cache
+import re
+from collections import namedtuple
+from itertools import chain, compress, islice
 
 import numpy as np
 
+from sfdbtester.common.utilities import vectorized_search
+from sfdbtester.sfdb.sfdb_cache import DerivedCache, DuplicateTracker
+from sfdbtester.sfdb.sfdb_index import INDEX_KINDS, build_index, get_index_filepath, join_keys, load_index
+from sfdbtester.sfdb.sfdb_stream import NotSFDBFileError, SFDBHeader, get_line_offsets, is_sfdb_header, \
+    iter_line_chunks, read_entry_lines, read_sfdb_header
+from sfdbtester.sfdb.sql_datatypes import INTEGER_DATATYPES, to_int64
 from sfdbtester.sfdb.sql_table_schema import SQLTableSchema
 
+QUERY_OPERATORS = ('eq', 'ne', 'in', 'regex')
+DIGEST_SIZE = 16  # Bytes of the blake2b digest of the lines of an sfdb
+DIGEST_CHUNK_SIZE = 100000  # Number of lines that are joined and hashed at once
 
-class NotSFDBFileError(Exception):
-    """This custom error is to be raised when a function/method that expects an SFDB file as parameter receives
-    something else instead."""
-    pass
+# The values of a column converted into a numpy datatype. is_valid is False wherever the conversion failed.
+TypedColumn = namedtuple('TypedColumn', ['values', 'is_valid'])
 
 
 class SFDBContainer:
     """This class is designed to contain the content of sfdb (smartFix-Datbases) files. It loads database-entries
     into numpy-arrays for faster access. Further it has an SQLTableSchemas that shows which datatypes an SQL table,
-    that you might upload this file to, would expect and enforce. This requires the SQL table being known beforehand."""
+    that you might upload this file to, would expect and enforce. This requires the SQL table being known beforehand.
+    The schema is shared with all other SFDBContainers of the same table and only looked up when it is first used.
+    Columns with an integer datatype in the schema can be accessed as typed int64 arrays, which are only converted once
+    and cached until the content is replaced, just like indexes on columns and duplicates. Each container has its own
+    cache of such derived results with a byte budget, see sfdb_cache. Entries and columns can be selected with
+    numpy-style keys, see __getitem__, which returns views of the content or SFDBViews instead of copies. To save
+    memory, the lines of the entries can be dropped, so that only the content is kept, see drop_lines. A container can
+    also hold only a range of the entries of a file, see from_file. Entry i of it is entry entry_offset + i of the
+    file. Entries can be appended in place, see extend."""
     i_table_name_line = 2
     i_column_line = 3
     i_header_end = 5
+    entry_offset = 0
+    file_selection = ''  # Describes the rows and columns of the file an sfdb loaded, if it did not load all of them
 
-    def __init__(self, sfdb_lines, filepath=''):
+    def __init__(self, sfdb_lines, filepath='', keep_lines=True):
         self.sfdb_lines = sfdb_lines
+        self._cache = DerivedCache()
         self.content = self.__create_sfdb_table()
-        self.schema = SQLTableSchema(self.name)
+        self._schema = None
         self.filepath = filepath
+        if not keep_lines:
+            self.drop_lines()
 
     def __create_sfdb_table(self):
         """Generates a 2D numpy array of all entries in an SFDB file. Ignores the SFDB-file header."""
         content_lines = self.sfdb_lines[type(self).i_header_end:]
-        return np.array([line.split('\t') for line in content_lines])
+        entries = [line.split('\t') for line in content_lines]
+        try:
+            return np.array(entries)
+        except ValueError:  # Entries with differing numbers of values can only be stored as an array of lists
+            content = np.empty(len(entries), dtype=object)
+            content[:] = entries
+            return content
 
     def __len__(self):
         """Get the number of entries in the sfdb file"""
@@ -53,17 +82,26 @@ class SFDBContainer:
 
     def __getitem__(self, key):
         """Returns content of the sfdb file based on the provided key.
-        If the key is a slice object, a slice of the sfdb file is provided.
-        If the key is an index, the line of the sfdb file at index is provided.
+        If the key is an index, the entry of the sfdb file at index is provided.
+        If the key is a slice object, a slice of the content is provided as a view of the content array.
+        If the key is a column name, the values of that column are provided as a view of the content array.
+        If the key is a boolean mask or a sequence of indices, an SFDBView of the selected entries is provided.
+        If the key is a tuple (rows, columns), the values of the selected rows and columns are provided. Rows can be
+        any of the keys above except a column name, columns can be a name, an index, a list of those or a slice.
         """
         if isinstance(key, slice):  # If the key is a slice object
-            start, stop, step = key.indices(len(self))
-            return [self[i] for i in range(start, stop, step)]
-        elif isinstance(key, int):  # If they key is an index
+            return self.content[key]
+        elif isinstance(key, (int, np.integer)):  # If they key is an index
             if key >= len(self):
                 raise IndexError(f'Index {key} is out of range of 0-{len(self)-1}')
 
             return self.content[key]
+        elif isinstance(key, str):
+            return self.get_column(key)
+        elif isinstance(key, tuple) and len(key) == 2:
+            return self._get_cells(*key)
+        elif isinstance(key, (list, np.ndarray)):
+            return SFDBView(self, self._get_row_ids(key))
         else:
             raise TypeError(f'Invalid argument type for getting item from '
                             f'SFDBContainer : {type(key)}')
@@ -74,9 +112,8 @@ class SFDBContainer:
 
     def __add__(self, other_sfdb):
         """Add 2 SFDBs with identical headers together by appending the entries of one to the other"""
-        if self._is_sfdb(other_sfdb) and self.header == other_sfdb.header:
-            other_sfdb_content_lines = other_sfdb.sfdb_lines[type(self).i_header_end:]
-            return SFDBContainer(self.sfdb_lines + other_sfdb_content_lines)
+        if self._is_sfdb(other_sfdb) and self.sfdb_header == other_sfdb.sfdb_header:
+            return SFDBContainer.concat([self, other_sfdb])
         else:
             raise ValueError('You can not add sfdb files with different headers!')
 
@@ -92,39 +129,213 @@ class SFDBContainer:
                         f'Columns: {self.columns}\n' \
                         f'Entries: \n'
 
-        entry_string = '\n'.join(self.sfdb_lines[self.i_header_end:])
+        entry_string = '\n'.join(self._iter_entry_lines())
         return header_string + entry_string
 
     def __eq__(self, other_sfdb):
-        """Allows for equality comparison between SFDB files."""
-        return self.sfdb_lines == other_sfdb.sfdb_lines
+        """Allows for equality comparison between SFDB files by the digests of their lines."""
+        return self is other_sfdb or self.digest == other_sfdb.digest
 
     def __hash__(self):
-        hash_tuple = (tuple(self.sfdb_lines), self.filepath)
+        hash_tuple = (self.digest, self.filepath)
         return hash(hash_tuple)
 
+    @property
+    def sfdb_lines(self):
+        """Get the lines of the sfdb file without line-endings. If the lines were dropped, they are generated from the
+        content on every access."""
+        if self._sfdb_lines is None:
+            return list(chain(self.sfdb_header.lines, self._iter_entry_lines()))
+        return self._sfdb_lines
+
+    @sfdb_lines.setter
+    def sfdb_lines(self, sfdb_lines):
+        self._sfdb_lines = sfdb_lines
+        self._owns_lines = False  # The list may be shared, so it is copied before entries are appended to it
+        self._sfdb_header = None
+        self._digest = None
+
+    @property
+    def digest(self):
+        """Get the blake2b digest of the lines of the sfdb. It is only computed on first access and identifies the
+        content for hashing, equality and caches across runs."""
+        if self._digest is None:
+            self._digest = get_lines_digest(chain(self.sfdb_header.lines, self._iter_entry_lines()))
+        return self._digest
+
+    @property
+    def has_lines(self):
+        """Get whether the lines of the entries are kept next to the content"""
+        return self._sfdb_lines is not None
+
+    @property
+    def sfdb_header(self):
+        """Get the immutable SFDBHeader of this sfdb. The header lines are only parsed on first access."""
+        if self._sfdb_header is None:
+            self._sfdb_header = SFDBHeader(self.sfdb_lines[:type(self).i_header_end])
+        return self._sfdb_header
+
     @property
     def header(self):
-        """Get the lines of the table header"""
-        header_lines = self.sfdb_lines[:type(self).i_header_end]
-        return [line.split('\t') for line in header_lines]
+        """Get the lines of the table header, each as list of its tab-separated fields"""
+        return [list(fields) for fields in self.sfdb_header.fields]
 
     @property
     def name(self):
         """Get the name of the SQL table for this SFDB"""
-        return self.header[type(self).i_table_name_line][1]
+        return self.sfdb_header.name
 
     @property
     def columns(self):
-        """Get a list of the name of all columns in this sfdb file"""
-        column_line = self.header[type(self).i_column_line]
-        return column_line[1:]
+        """Get a tuple of the name of all columns in this sfdb file"""
+        return self.sfdb_header.columns
+
+    @property
+    def content(self):
+        """Get the 2D numpy array of all entries. Modifying it in place requires a call of clear_cache, which also
+        discards the digest."""
+        return self._content
+
+    @content.setter
+    def content(self, content):
+        self._content = content
+        self._buffer = None
+        self.clear_cache()
+
+    @property
+    def schema(self):
+        """Get the SQLTableSchema of this sfdb. Defaults to the shared schema of the table from the schema registry,
+        which is only looked up on first access."""
+        if self._schema is None:
+            self._schema = SQLTableSchema.get_shared(self.name)
+        return self._schema
+
+    @schema.setter
+    def schema(self, sql_table_schema):
+        self._schema = sql_table_schema
+
+    @classmethod
+    def _from_content(cls, sfdb_lines, content, filepath='', schema=None):
+        """Creates an SFDBContainer out of its lines and its already parsed content without splitting the lines again"""
+        sfdb = cls.__new__(cls)
+        sfdb.sfdb_lines = sfdb_lines
+        sfdb._cache = DerivedCache()
+        sfdb.content = content
+        sfdb._schema = schema
+        sfdb.filepath = filepath
+        return sfdb
+
+    @classmethod
+    def concat(cls, sfdbs, remove_duplicates=False):
+        """Concatenates the entries of SFDBContainers with identical headers into a new SFDBContainer in linear time.
+        The headers are compared once and the existing content arrays are copied into a single new array instead of
+        parsing the lines again.
+
+        Parameters:
+            sfdbs (iterable): SFDBContainers with identical headers.
+            remove_duplicates (bool): Whether to only keep the first occurrence of entries across all sfdbs.
+        Returns:
+            SFDBContainer: The concatenated sfdb. It only keeps lines if all sfdbs do.
+        """
+        sfdbs = list(sfdbs)
+        if not sfdbs:
+            raise ValueError('You can not concatenate an empty sequence of sfdb files!')
+
+        sfdb_header = sfdbs[0].sfdb_header if cls._is_sfdb(sfdbs[0]) else None
+        for sfdb in sfdbs:
+            if not cls._is_sfdb(sfdb) or sfdb.sfdb_header != sfdb_header:
+                raise ValueError('You can not add sfdb files with different headers!')
+
+        masks = _get_first_occurrence_masks(sfdbs) if remove_duplicates else [None] * len(sfdbs)
+        keep_lines = all(sfdb.has_lines for sfdb in sfdbs)
+        sfdb_lines = list(sfdb_header.lines)
+        for sfdb, mask in zip(sfdbs, masks):
+            if not keep_lines:
+                break
+            content_lines = sfdb._iter_entry_lines()
+            sfdb_lines.extend(content_lines if mask is None else compress(content_lines, mask))
+
+        content = _concat_content([sfdb.content for sfdb in sfdbs], masks)
+        concatenated_sfdb = cls._from_content(sfdb_lines, content, schema=sfdbs[0]._schema)
+        if not keep_lines:
+            concatenated_sfdb.drop_lines()
+        return concatenated_sfdb
 
     @classmethod
-    def from_file(cls, sfdb_file_path):
-        """Creates an SFDBContainer out of the contents of the passed file"""
+    def from_file(cls, sfdb_file_path, keep_lines=True, columns=None, rows=None):
+        """Creates an SFDBContainer out of the contents of the passed file.
+
+        Parameters:
+            sfdb_file_path (str): Path of the sfdb file.
+            keep_lines (bool): Whether to keep the lines next to the content table, see drop_lines.
+            columns (list): Names of the columns to load. Only these values are extracted from each line and the
+                header only lists these columns. The entries keep their indices, so line numbers stay the same. Such
+                an sfdb never keeps lines. Defaults to all columns.
+            rows (range): Entry indices of the entries to load, e.g. range(1000, 2000). Only these lines are read,
+                using the line offset index kept next to the file, see sfdb_stream.get_line_offsets. The first loaded
+                entry becomes entry 0 of the container and its index in the file is kept as entry_offset, so that line
+                numbers still refer to the file, see get_line_number. Defaults to all entries.
+        Returns:
+            SFDBContainer: The sfdb.
+        """
+        if rows is not None:
+            return cls._from_file_window(sfdb_file_path, rows, keep_lines, columns)
+        if columns is not None:
+            return cls._from_file_projected(sfdb_file_path, columns)
+
         sfdb_lines = cls.read_sfdb_from_file(sfdb_file_path)
-        return cls(sfdb_lines, filepath=sfdb_file_path)
+        return cls(sfdb_lines, filepath=sfdb_file_path, keep_lines=keep_lines)
+
+    @classmethod
+    def _from_file_projected(cls, sfdb_file_path, columns):
+        """Creates an SFDBContainer of only some columns of the passed file. See from_file."""
+        if not os.path.exists(sfdb_file_path):
+            raise FileNotFoundError(f'{sfdb_file_path} does not exist !')
+
+        with open(sfdb_file_path, encoding='utf8') as input_stream:
+            sfdb_header = SFDBHeader(read_sfdb_header(input_stream, sfdb_file_path))
+            column_indices = sfdb_header.get_column_indices(columns)
+            column_count = len(sfdb_header.columns)
+
+            parts = []
+            line_index = cls.i_header_end
+            for lines in iter_line_chunks(input_stream):
+                parts.append(_project_lines(lines, column_indices, column_count, line_index))
+                line_index += len(lines)
+
+        content = _concat_content(parts, [None] * len(parts))
+        sfdb = cls._from_content(_get_projected_header_lines(sfdb_header, column_indices), content,
+                                 filepath=sfdb_file_path)
+        sfdb.drop_lines()
+        sfdb.file_selection = _get_file_selection(None, sfdb.columns)
+        return sfdb
+
+    @classmethod
+    def _from_file_window(cls, sfdb_file_path, rows, keep_lines, columns):
+        """Creates an SFDBContainer of only a range of entries of the passed file. See from_file."""
+        if not os.path.exists(sfdb_file_path):
+            raise FileNotFoundError(f'{sfdb_file_path} does not exist !')
+        if not isinstance(rows, range):
+            raise TypeError(f'Rows must be a range of entry indices, not {type(rows)}!')
+        if rows.step != 1:
+            raise ValueError(f'Can only load a range of consecutive entries, not {rows}!')
+
+        with open(sfdb_file_path, encoding='utf8') as input_stream:
+            sfdb_header = SFDBHeader(read_sfdb_header(input_stream, sfdb_file_path))
+        entry_lines = read_entry_lines(sfdb_file_path, rows.start, rows.stop, get_line_offsets(sfdb_file_path))
+
+        if columns is None:
+            sfdb = cls(list(sfdb_header.lines) + entry_lines, filepath=sfdb_file_path, keep_lines=keep_lines)
+        else:
+            column_indices = sfdb_header.get_column_indices(columns)
+            content = _project_lines(entry_lines, column_indices, len(sfdb_header.columns),
+                                     cls.i_header_end + rows.start)
+            sfdb = cls._from_content(_get_projected_header_lines(sfdb_header, column_indices), content,
+                                     filepath=sfdb_file_path)
+            sfdb.drop_lines()
+        sfdb.entry_offset = rows.start
+        sfdb.file_selection = _get_file_selection(rows, None if columns is None else sfdb.columns)
+        return sfdb
 
     @staticmethod
     def read_sfdb_from_file(file_path):
@@ -186,16 +397,7 @@ class SFDBContainer:
     @staticmethod
     def _has_sfdb_header(line_list):
         """Checks whether each line in the header of an sfdb file follows the sfdb format specifications."""
-        if len(line_list) < 5:
-            return False
-
-        header = [line.split('\t') for line in line_list[:5]]
-        is_correct_header = ((header[0][0] == 'ENCODING UTF8') and (len(header[0]) == 1) and
-                             (header[1][0] == 'INIT')          and (len(header[1]) == 1) and
-                             (header[2][0] == 'TABLE')         and (len(header[2]) == 2) and
-                             (header[3][0] == 'COLUMNS')       and (len(header[3]) > 1) and
-                             (header[4][0] == 'INSERT')        and (len(header[4]) == 1))
-        return is_correct_header
+        return is_sfdb_header(line_list)
 
     def get_entry_string(self, entry_index):
         """Returns the string representation of an entry in the SFDB"""
@@ -204,32 +406,245 @@ class SFDBContainer:
         if entry_index < 0:
             raise IndexError(f'Index out of bounds. No negative Indices allowed!')
 
+        if self._sfdb_lines is None:
+            return entry_to_line(self.content[entry_index])
         return self.sfdb_lines[entry_index + self.i_header_end]
 
+    def get_line_number(self, entry_index):
+        """Returns the number of the line of an entry in the sfdb file, counted from 1 like in text editors. Takes the
+        entry_offset of an sfdb that only holds a range of the entries of its file into account."""
+        return self.entry_offset + entry_index + self.i_header_end + 1
+
+    def drop_lines(self):
+        """Discards the lines of the entries and only keeps the content table, which roughly halves the memory of the
+        sfdb. Lines are generated from the content whenever they are needed, e.g. by get_entry_string."""
+        self._sfdb_header = self.sfdb_header  # The header is parsed from the lines, so before they are dropped
+        self._sfdb_lines = None
+
+    def _iter_entry_lines(self):
+        """Iterates over the lines of the entries, generating them from the content if the lines were dropped."""
+        if self._sfdb_lines is None:
+            return map(entry_to_line, self.content)
+        return islice(self._sfdb_lines, self.i_header_end, None)
+
+    def get_column(self, column):
+        """Returns the values of a column as 1D numpy array of strings. The array is a view of the content, not a copy.
+
+        Parameters:
+            column (str / int): The name or index of the column.
+        Returns:
+            np.ndarray: The values of the column, one per entry.
+        """
+        return self._get_table()[:, self._get_column_index(column)]
+
+    def _get_column_index(self, column):
+        """Returns the index of a column given by name or index. Raises a KeyError for unknown column names."""
+        if isinstance(column, (int, np.integer)):
+            return range(len(self.columns))[column]
+        return self.sfdb_header.index(column)
+
+    def _get_table(self):
+        """Returns the content as 2D array. Raises a ValueError if the entries have differing numbers of values."""
+        if len(self) == 0:
+            return np.empty((0, len(self.columns)), dtype=str)
+        if self.content.ndim != 2:
+            raise ValueError(f'Can not access the columns of {self.name}, as its entries have differing numbers of '
+                             f'values!')
+        return self.content
+
+    def _get_cells(self, rows, columns):
+        """Returns the values of the selected rows and columns. See __getitem__."""
+        if isinstance(columns, slice):
+            column_index = columns
+        elif isinstance(columns, (str, int, np.integer)):
+            column_index = self._get_column_index(columns)
+        else:
+            column_index = [self._get_column_index(column) for column in columns]
+
+        entries = self._get_table()[rows]
+        return entries[column_index] if entries.ndim == 1 else entries[:, column_index]
+
+    def _get_row_ids(self, key):
+        """Turns a boolean mask or a sequence of entry indices into an array of non-negative entry indices."""
+        key = np.asarray(key) if len(key) > 0 else np.arange(0)
+        if key.dtype == bool and len(key) != len(self):
+            raise IndexError(f'Boolean mask of length {len(key)} does not match the {len(self)} entries!')
+        if key.dtype != bool and not np.issubdtype(key.dtype, np.integer):
+            raise TypeError(f'Invalid array type for getting item from SFDBContainer : {key.dtype}')
+        return np.arange(len(self))[key]
+
+    def where(self, **predicates):
+        """Selects the entries that fulfill all predicates. A predicate is a column name with an optional operator
+        suffix, separated by a double underscore, and an operand:
+            COLUMN=value               values equal to value
+            COLUMN__ne=value           values not equal to value
+            COLUMN__in=[values]        values that are one of values
+            COLUMN__regex=pattern      values in which the regular expression pattern (str or compiled) can be found
+        Each predicate is evaluated as a vectorized mask over a column, only for the entries left by the previous ones.
+
+        Parameters:
+            predicates: Operands by column name and operator.
+        Returns:
+            SFDBView: View of the entries that fulfill all predicates.
+        """
+        row_ids = np.arange(len(self))
+        for predicate, operand in predicates.items():
+            column, _, operator = predicate.rpartition('__')
+            if operator not in QUERY_OPERATORS:
+                column, operator = predicate, 'eq'
+            values = self.get_column(column)
+            row_ids = row_ids[get_predicate_mask(values[row_ids], operator, operand)]
+        return SFDBView(self, row_ids)
+
+    def get_typed_column(self, column):
+        """Returns the values of a column with an integer datatype in the schema as int64 array. The conversion is done
+        once for the whole column and cached until the content changes.
+
+        Parameters:
+            column (str / int): The name or index of the column.
+        Returns:
+            TypedColumn: Read-only arrays of the int64 values and of whether each value is a valid integer.
+            None: If the column has no integer datatype in the schema or the sfdb has no schema.
+        """
+        column_name = self.columns[column] if isinstance(column, (int, np.integer)) else column
+        return self._cache.get(('typed_column', column_name), lambda: self._derive_typed_column(column_name))
+
+    def _derive_typed_column(self, column_name):
+        """Converts the values of a column with an integer datatype in the schema. See get_typed_column."""
+        typed_column = None
+        if self.has_schema() and column_name in self.schema.columns and \
+                self.schema[column_name].datatype.lower() in INTEGER_DATATYPES:
+            typed_column = TypedColumn(*to_int64(self.get_column(column_name)))
+            typed_column.values.flags.writeable = False
+            typed_column.is_valid.flags.writeable = False
+        return typed_column
+
+    def create_index(self, columns, kind='hash', persist=False):
+        """Builds an index on one or more columns for point lookups and range scans, see sfdb_index. The index is
+        cached until the content changes.
+
+        Parameters:
+            columns (str / list): The name of the column or the names of the columns to index.
+            kind (str): 'hash' for point lookups only or 'sorted' for point lookups and range scans.
+            persist (bool): Whether to keep the index in a file next to the sfdb file. As long as the digest saved in
+                that file matches the digest of the sfdb, the index is loaded from it instead of being built. Sfdbs
+                that only loaded some rows or columns of the file keep their own index files.
+        Returns:
+            HashIndex / SortedIndex: The index.
+        """
+        columns = (columns,) if isinstance(columns, str) else tuple(columns)
+        if kind not in INDEX_KINDS:
+            raise ValueError(f'{kind} is no index kind! Use one of {INDEX_KINDS}.')
+        return self._cache.get(('index', columns, kind), lambda: self._derive_index(columns, kind, persist))
+
+    def _derive_index(self, columns, kind, persist):
+        """Builds an index or loads it from the file next to the sfdb file. See create_index."""
+        column_values = [self.get_column(column) for column in columns]
+        index_filepath = None
+        if persist and self.filepath:
+            index_filepath = get_index_filepath(self.filepath, columns, kind, self.file_selection)
+        index = None
+        if index_filepath is not None and os.path.exists(index_filepath):
+            index = load_index(index_filepath)
+            index = index if index.digest == self.digest else None
+
+        if index is None:
+            index = build_index(columns, join_keys(column_values), kind)
+            if index_filepath is not None:
+                index.digest = self.digest
+                index.save(index_filepath)
+        return index
+
+    def clear_cache(self):
+        """Discards all cached results derived from the content, including the digest, e.g. after the content was
+        modified in place."""
+        self._digest = None
+        self._cache.clear()
+        self._duplicate_tracker = None
+
+    def append(self, entry):
+        """Appends a single entry, a sequence of one value per column, to the sfdb. See extend."""
+        self.extend([entry])
+
+    def extend(self, entries):
+        """Appends entries to the sfdb in place. The content is kept in a buffer with spare capacity that doubles
+        whenever it is full, so appending costs amortized time linear in the number of new entries. The duplicates are
+        updated with the new entries, all other derived results are discarded.
+
+        Parameters:
+            entries (SFDBContainer / iterable): An sfdb with an identical header or entries, each a sequence of one
+                value per column.
+        """
+        if isinstance(entries, SFDBContainer):
+            if entries.sfdb_header != self.sfdb_header:
+                raise ValueError('You can not add sfdb files with different headers!')
+            entries = entries.content
+
+        new_entries = _to_entry_table(entries, len(self.columns), self.name)
+        if len(new_entries) == 0:
+            return
+        new_lines = [entry_to_line(entry) for entry in new_entries]
+
+        table = self._get_table()
+        if self._duplicate_tracker is None:
+            duplicate_tracker = DuplicateTracker()
+            duplicate_tracker.add(self._iter_entry_lines(), table)
+        else:
+            duplicate_tracker = self._duplicate_tracker
+
+        entry_count = len(table) + len(new_entries)
+        dtype = np.result_type(table.dtype, new_entries.dtype)
+        if self._buffer is None or len(self._buffer) < entry_count or self._buffer.dtype != dtype:
+            self._buffer = np.empty((max(entry_count, 2 * len(table)), table.shape[1]), dtype=dtype)
+            self._buffer[:len(table)] = table
+        self._buffer[len(table):entry_count] = new_entries
+        self._content = self._buffer[:entry_count]
+
+        if self._sfdb_lines is not None:
+            if not self._owns_lines:
+                self._sfdb_lines = list(self._sfdb_lines)
+                self._owns_lines = True
+            self._sfdb_lines.extend(new_lines)
+        self._digest = None
+        self._cache.clear()
+        duplicate_tracker.add(new_lines, self._content)
+        self._duplicate_tracker = duplicate_tracker
+
     def has_schema(self):
         """Checks whether the sfdb file has a functional SQL Table Schema in its SQLTableSchema object"""
         return self.schema.is_full_schema()
 
-    def write_to_file(self, filepath, remove_duplicates=False, sort=False):
+    def write_to_file(self, filepath, remove_duplicates=False, sort=False, sort_columns=None):
         """"Creates an IOStream to a file and writes this sfdb to it. Records in written file can be sorted and have
-        duplicates filtered out."""
+        duplicates filtered out. Sorting is row-wise lexicographic by the values of sort_columns, which defaults to all
+        columns."""
         with open(filepath, mode='w', encoding='utf-8') as output_stream:
-            self._write(output_stream, remove_duplicates=remove_duplicates, sort=sort)
+            self._write(output_stream, remove_duplicates=remove_duplicates, sort=sort, sort_columns=sort_columns)
 
-    def _write(self, output_stream, remove_duplicates=False, sort=False):
+    def _write(self, output_stream, remove_duplicates=False, sort=False, sort_columns=None):
         """"Writes the sfdb to an IOStream. Records in written file can be sorted and have duplicates filtered out"""
-        for header_line in self.header:
-            header_string = entry_to_line(header_line)
-            output_stream.write(f'{header_string}\n')
+        for header_line in self.sfdb_header.lines:
+            output_stream.write(f'{header_line}\n')
 
-        i_duplicates = self._get_duplicate_index_list()
-        entries = np.sort(self.content, axis=0) if sort else self.content
+        i_duplicates = self._get_duplicate_index_list() if remove_duplicates else set()
+        order = self.get_sort_order(sort_columns) if sort else range(len(self))
 
-        for i, entry in enumerate(entries):
-            if remove_duplicates and i in i_duplicates:
+        for i in order:
+            if i in i_duplicates:
                 continue
 
-            output_stream.write(entry_to_line(entry) + '\n')
+            output_stream.write(entry_to_line(self.content[i]) + '\n')
+
+    def get_sort_order(self, sort_columns=None):
+        """Returns the entry indices that sort the sfdb row-wise lexicographically. The sort is stable.
+
+        Parameters:
+            sort_columns (list): Names of the columns to sort by, the most significant first. Defaults to all columns.
+        Returns:
+            np.ndarray: Array of entry indices in sorted order.
+        """
+        column_indices = self.sfdb_header.get_column_indices(sort_columns)
+        return get_sort_order(self.content, column_indices)
 
     def _get_duplicate_index_list(self):
         """Return a list of the indices all duplicate entries. Does not include the first occurrence of each entry."""
@@ -239,14 +654,22 @@ class SFDBContainer:
             i_duplicates.extend(indices[1:])
         return set(i_duplicates)
 
-    @lru_cache(3)
     def get_duplicates(self):
         """Returns a list of duplicate sfdb entries. Each entry in that list is an index list of all entries that are
-        duplicates to each other. The lists are sorted smallest to largest index.
+        duplicates to each other. The lists are sorted smallest to largest index. The list is cached until the content
+        changes, unless it is larger than the budget of the cache on its own. Then every call finds the duplicates
+        again, so callers that need them repeatedly should keep the returned list. Once entries were appended, it is
+        kept up to date with every further append instead.
         Parameters:
             -
         Returns:
             list(array, str): The array contains all indices with the duplicate, the second is the entry itself."""
+        if self._duplicate_tracker is not None:
+            return self._duplicate_tracker.duplicates
+        return self._cache.get(('duplicates',), self._find_duplicates)
+
+    def _find_duplicates(self):
+        """Finds the duplicate sfdb entries. See get_duplicates."""
         values, inverse, count = np.unique(self.content, return_inverse=True, return_counts=True, axis=0)
         idx_values_repeated = np.where(count > 1)[0]
         if not idx_values_repeated.size > 0:
@@ -261,6 +684,245 @@ class SFDBContainer:
         return duplicate_list
 
 
+class SFDBView(SFDBContainer):
+    """A selection of the entries of an SFDBContainer that does not copy them. Only the indices of the selected entries
+    in the source are stored. Columns are gathered from the source when they are accessed, while the full content and
+    the lines are only built if they are needed, e.g. for duplicates or writing. A view of a view refers to the
+    original source directly.
+
+    All entry indices of a view, including those in findings of checks, refer to its own entries. These are the entries
+    of the file that write_to_file of the view creates.
+
+    Parameters:
+        source (SFDBContainer): The sfdb of which entries are selected.
+        row_ids (np.ndarray): The indices of the selected entries in the source.
+    """
+
+    def __init__(self, source, row_ids):
+        row_ids = np.asarray(row_ids, dtype=np.intp)
+        if isinstance(source, SFDBView):
+            row_ids = source._row_ids[row_ids]
+            source = source._source
+        row_ids.flags.writeable = False
+
+        self._source = source
+        self._row_ids = row_ids
+        self._sfdb_lines = None
+        self._digest = None
+        self._cache = DerivedCache()
+        self._duplicate_tracker = None
+        self._content = None
+        self._schema = source._schema
+        self.filepath = ''
+
+    def __len__(self):
+        """Get the number of selected entries"""
+        return len(self._row_ids)
+
+    @property
+    def row_ids(self):
+        """Get the read-only array of the indices of the selected entries in the source"""
+        return self._row_ids
+
+    @property
+    def sfdb_lines(self):
+        """Get the lines of the header and of the selected entries. They are only built on first access."""
+        if self._sfdb_lines is None:
+            self._sfdb_lines = list(chain(self.sfdb_header.lines, self._iter_entry_lines()))
+        return self._sfdb_lines
+
+    @sfdb_lines.setter
+    def sfdb_lines(self, sfdb_lines):
+        self._sfdb_lines = sfdb_lines
+        self._digest = None
+
+    @property
+    def sfdb_header(self):
+        """Get the SFDBHeader of the source"""
+        return self._source.sfdb_header
+
+    @property
+    def content(self):
+        """Get the array of the selected entries. It is only copied out of the source on first access."""
+        if self._content is None:
+            self._content = self._source.content[self._row_ids]
+        return self._content
+
+    @content.setter
+    def content(self, content):
+        self._content = content
+        self.clear_cache()
+
+    def get_column(self, column):
+        """Returns the values of a column for the selected entries, gathered from the source column."""
+        if self._content is not None:
+            return super().get_column(column)
+        return self._source.get_column(column)[self._row_ids]
+
+    def _get_cells(self, rows, columns):
+        """Returns the values of the selected rows and columns, gathered from the source."""
+        if self._content is not None:
+            return super()._get_cells(rows, columns)
+        return self._source._get_cells(self._row_ids[rows], columns)
+
+    def extend(self, entries):
+        """Views can not grow, as they only select entries of their source."""
+        raise TypeError('Entries can not be appended to an SFDBView!')
+
+    def get_entry_string(self, entry_index):
+        """Returns the string representation of an entry in the view"""
+        if not isinstance(entry_index, int):
+            raise TypeError(f'Index must be an integer!')
+        if entry_index < 0:
+            raise IndexError(f'Index out of bounds. No negative Indices allowed!')
+
+        return self._source.get_entry_string(int(self._row_ids[entry_index]))
+
+    def _iter_entry_lines(self):
+        """Iterates over the lines of the selected entries, taken from the source if they were not built yet."""
+        if self._sfdb_lines is None:
+            return map(self._source.get_entry_string, self._row_ids.tolist())
+        return islice(self._sfdb_lines, self.i_header_end, None)
+
+
 def entry_to_line(entry):
     """Turns a table entry, a sequence of values (list / ndarray) into a the sequences string representation"""
     return '\t'.join(entry)
+
+
+def get_lines_digest(sfdb_lines):
+    """Returns the blake2b digest of lines, as if they were written to a file with a line-ending after each line. The
+    lines can be any iterable."""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    lines = iter(sfdb_lines)
+    chunk = list(islice(lines, DIGEST_CHUNK_SIZE))
+    while chunk:
+        digest.update(('\n'.join(chunk) + '\n').encode('utf-8'))
+        chunk = list(islice(lines, DIGEST_CHUNK_SIZE))
+    return digest.digest()
+
+
+def get_predicate_mask(values, operator, operand):
+    """Returns a boolean array that is True for every value that fulfills a predicate. See SFDBContainer.where.
+
+    Parameters:
+        values (np.ndarray): Array of string values.
+        operator (str): One of QUERY_OPERATORS.
+        operand: The value, list of values or regular expression to compare the values with.
+    Returns:
+        np.ndarray: Boolean array of the same length as values.
+    """
+    if operator == 'eq':
+        return values == str(operand)
+    elif operator == 'ne':
+        return values != str(operand)
+    elif operator == 'in':
+        return np.isin(values, np.array(list(operand), dtype=str))
+    elif operator == 'regex':
+        pattern = re.compile(operand) if isinstance(operand, str) else operand
+        return vectorized_search(pattern, values)
+    else:
+        raise ValueError(f'{operator} is no query operator! Use one of {QUERY_OPERATORS}.')
+
+
+def _project_lines(lines, column_indices, column_count, first_line_index):
+    """Splits lines and returns a 2D array of only the values at column_indices. Raises a ValueError for lines that do
+    not have column_count values, as they can not be projected."""
+    entries = [line.split('\t') for line in lines]
+    for i, entry in enumerate(entries):
+        if len(entry) != column_count:
+            raise ValueError(f'Can not load only some columns, as line {first_line_index + i + 1} has {len(entry)} '
+                             f'instead of {column_count} values!')
+
+    return np.array([[entry[j] for j in column_indices] for entry in entries])
+
+
+def _to_entry_table(entries, column_count, name):
+    """Turns entries into a 2D array of strings. Raises a ValueError if not every entry has column_count values."""
+    try:
+        table = np.array(entries if isinstance(entries, np.ndarray) else list(entries), dtype=str)
+    except ValueError:
+        table = None
+
+    if table is not None and table.shape == (0,):
+        return table.reshape(0, column_count)
+    if table is None or table.ndim != 2 or table.shape[1] != column_count:
+        raise ValueError(f'Can not append the entries to {name}, as they do not all have {column_count} values!')
+    return table
+
+
+def _get_file_selection(rows, columns):
+    """Returns the file_selection of an sfdb that loaded a range of rows and/or some columns of its file."""
+    parts = [] if rows is None else [f'rows_{rows.start}-{rows.stop}']
+    parts += [] if columns is None else [f'columns_{"-".join(columns)}']
+    return '_'.join(parts)
+
+
+def _get_projected_header_lines(sfdb_header, column_indices):
+    """Returns the header lines of an sfdb whose COLUMNS line only lists the columns at column_indices."""
+    header_lines = list(sfdb_header.lines)
+    header_lines[SFDBContainer.i_column_line] = entry_to_line(['COLUMNS'] +
+                                                              [sfdb_header.columns[j] for j in column_indices])
+    return header_lines
+
+
+def _get_first_occurrence_masks(sfdbs):
+    """Returns a boolean array for each sfdb that is True for every entry that did not occur before in any sfdb."""
+    seen_lines = set()
+    masks = []
+    for sfdb in sfdbs:
+        mask = np.zeros(len(sfdb), dtype=bool)
+        for i, line in enumerate(sfdb._iter_entry_lines()):
+            if line not in seen_lines:
+                seen_lines.add(line)
+                mask[i] = True
+        masks.append(mask)
+    return masks
+
+
+def _concat_content(contents, masks):
+    """Concatenates content arrays, each reduced to the entries of its mask if it has one, into a single new array.
+    Contents with entries that have differing numbers of values are concatenated into an array of lists."""
+    parts = [(content, mask) for content, mask in zip(contents, masks) if len(content) > 0]
+    counts = [len(content) if mask is None else int(np.count_nonzero(mask)) for content, mask in parts]
+    if not parts:
+        return np.array([])
+
+    is_table = all(content.ndim == 2 for content, _ in parts) and len({content.shape[1] for content, _ in parts}) == 1
+    if not is_table:
+        entries = [list(entry) for content, mask in parts
+                   for entry in (content if mask is None else compress(content, mask))]
+        content = np.empty(len(entries), dtype=object)
+        content[:] = entries
+        return content
+
+    content = np.empty((sum(counts), parts[0][0].shape[1]), dtype=np.result_type(*[part for part, _ in parts]))
+    start = 0
+    for (part, mask), count in zip(parts, counts):
+        if mask is None:
+            content[start:start + count] = part
+        else:
+            np.compress(mask, part, axis=0, out=content[start:start + count])
+        start += count
+    return content
+
+
+def get_sort_order(entries, column_indices):
+    """Returns the indices that sort entries row-wise lexicographically by the values in the columns at column_indices,
+    the most significant first, using np.lexsort. The sort is stable. Entries with too few values, which can only be
+    passed as list or array of lists, are treated as if the missing values were empty.
+
+    Parameters:
+        entries (np.ndarray / list): 2D array of entries or sequence of entries.
+        column_indices (list): The indices of the columns to sort by.
+    Returns:
+        np.ndarray: Array of indices in sorted order.
+    """
+    if len(entries) == 0:
+        return np.arange(0)
+
+    if isinstance(entries, np.ndarray) and entries.ndim == 2:
+        keys = [entries[:, j] for j in reversed(column_indices)]
+    else:
+        keys = [np.array([entry[j] if j < len(entry) else '' for entry in entries]) for j in reversed(column_indices)]
+    return np.lexsort(keys)
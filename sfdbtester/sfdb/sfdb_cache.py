@@ -0,0 +1,152 @@
+"""This module contains the cache for results that an SFDBContainer derives from its content, like typed columns,
+indexes and duplicates. Every container owns its own cache, so cached results are released together with the container
+and are never shared between containers.
+
+The cache keeps track of the approximate memory of its results. Once they exceed the byte budget, the least recently
+used results are evicted and simply derived again on their next use.
+
+The duplicates of an sfdb that grows by appending entries are not derived again, but kept up to date by a
+DuplicateTracker."""
+import bisect
+import hashlib
+import sys
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_CACHE_BUDGET = 256 * 1024 ** 2  # Bytes of derived results a single SFDBContainer keeps in memory
+FINGERPRINT_SIZE = 16  # Bytes of the blake2b fingerprint of a line. Makes accidental collisions practically impossible
+
+
+class DerivedCache:
+    """Least recently used cache of derived results with a byte budget and hit/miss counters.
+
+    Parameters:
+        budget (int): The maximum number of bytes of all cached results. Results that are larger on their own are
+            returned, but not cached.
+    """
+
+    def __init__(self, budget=DEFAULT_CACHE_BUDGET):
+        self.budget = budget
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._results = OrderedDict()
+
+    def __len__(self):
+        return len(self._results)
+
+    def __contains__(self, key):
+        return key in self._results
+
+    def get(self, key, derive):
+        """Returns the cached result for the key. On a miss the result is derived by calling derive and cached.
+
+        Parameters:
+            key (hashable): The key of the result, e.g. a tuple of its kind and its parameters.
+            derive (callable): Function without parameters that derives the result.
+        Returns:
+            The cached or derived result.
+        """
+        if key in self._results:
+            self.hits += 1
+            self._results.move_to_end(key)
+            return self._results[key][0]
+
+        self.misses += 1
+        result = derive()
+        self.put(key, result)
+        return result
+
+    def put(self, key, result):
+        """Caches a result under a key and evicts the least recently used results until the budget is kept."""
+        self.discard(key)
+        nbytes = get_nbytes(result)
+        if nbytes > self.budget:
+            return
+
+        self._results[key] = (result, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.budget:
+            self._evict()
+
+    def discard(self, key):
+        """Removes the result of a key from the cache, if it is cached."""
+        if key in self._results:
+            _, nbytes = self._results.pop(key)
+            self.nbytes -= nbytes
+
+    def clear(self):
+        """Removes all results from the cache. The counters are kept."""
+        self._results.clear()
+        self.nbytes = 0
+
+    def _evict(self):
+        """Removes the least recently used result."""
+        _, (_, nbytes) = self._results.popitem(last=False)
+        self.nbytes -= nbytes
+        self.evictions += 1
+
+
+class DuplicateTracker:
+    """Keeps the duplicate entries of a growing sfdb up to date. Entries are recognized by a blake2b fingerprint of
+    their line, so adding entries only costs time for the new entries and the groups of duplicates they belong to. The
+    duplicates are kept in the format and order of SFDBContainer.get_duplicates.
+    """
+
+    def __init__(self):
+        self.entry_count = 0
+        self.duplicates = []
+        self._first_indices = {}  # Fingerprint of every line -> index of the first entry with that line
+        self._groups = {}  # Fingerprint of every duplicate line -> list of the indices of all entries with that line
+        self._results = {}  # Fingerprint of every duplicate line -> its (index array, entry) in duplicates
+        self._sorted_keys = []  # (line, fingerprint) of every duplicate line in ascending order
+
+    def add(self, lines, content):
+        """Adds the next entries and updates the duplicates.
+
+        Parameters:
+            lines (iterable): The lines of the new entries.
+            content (np.ndarray): The content of the sfdb including the new entries.
+        """
+        changed_fingerprints = set()
+        for entry_index, line in enumerate(lines, self.entry_count):
+            fingerprint = get_line_fingerprint(line)
+            first_index = self._first_indices.setdefault(fingerprint, entry_index)
+            self.entry_count = entry_index + 1
+            if first_index == entry_index:
+                continue
+
+            if fingerprint not in self._groups:
+                self._groups[fingerprint] = [first_index]
+                bisect.insort(self._sorted_keys, (line, fingerprint))
+            self._groups[fingerprint].append(entry_index)
+            changed_fingerprints.add(fingerprint)
+
+        if not changed_fingerprints:
+            return
+        for fingerprint in changed_fingerprints:
+            indices = self._groups[fingerprint]
+            self._results[fingerprint] = (np.array(indices), content[indices[0]].copy())
+        self.duplicates = [self._results[fingerprint] for _, fingerprint in self._sorted_keys]
+
+
+def get_line_fingerprint(line):
+    """Returns a short digest of a line that identifies it among all lines of an sfdb file."""
+    return hashlib.blake2b(line.encode('utf-8'), digest_size=FINGERPRINT_SIZE).digest()
+
+
+def get_nbytes(result):
+    """Estimates the memory of a derived result. Numpy arrays count with the size of their data, containers and objects
+    with the sum of their items or attributes."""
+    if isinstance(result, np.ndarray):
+        return result.nbytes
+    elif isinstance(result, (list, tuple, set)):
+        return sum(get_nbytes(item) for item in result)
+    elif isinstance(result, dict):
+        return sum(get_nbytes(item) for item in result.values())
+    elif hasattr(result, '__dict__'):
+        return get_nbytes(vars(result))
+    else:
+        return sys.getsizeof(result)
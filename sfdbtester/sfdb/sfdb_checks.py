@@ -7,9 +7,14 @@ import re
 import numpy as np
 
 from sfdbtester.common.sfdb_logging import LOGFILE_LEVEL
+from sfdbtester.common.utilities import vectorized_search
 from sfdbtester.sfdb.sfdb import entry_to_line
+from sfdbtester.sfdb.sfdb_findings import ExcelFindings, RegexFindings, DatatypeFindings, FindingsSummary
+from sfdbtester.sfdb.sfdb_findings import NULL_NOT_ALLOWED, VALUE_TOO_LONG, DATATYPE_MISMATCH, REGEX_MISMATCH, \
+    EXCEL_AUTOFORMATTING
 
 INDEX_SHIFT = 5+1  # The shift between an (machine) entry index and a (human) line index of that entry in the sfdb file
+EXCEL_FORMAT_PATTERN = re.compile(r'\dE\+\d')
 
 # TODO: Move all logging calls that you can that are in the "check" functions out of there into other parts of the code
 
@@ -20,11 +25,12 @@ class ComparisonError(Exception):
     pass
 
 
-def log_sfdb_content_format_check(column_count, faulty_entries):
+def log_sfdb_content_format_check(column_count, faulty_entries, entry_offset=0):
     """Logs the result of a check of an sfdb's content format.
     Parameters:
         column_count (int): The number of columns in the sfdb and thus the number of values each entry must have.
         faulty_entries(list(int, string)): The entries with incorrect format and their indices.
+        entry_offset (int): The entry_offset of the sfdb, see SFDBContainer.entry_offset.
     Returns:
         Nothing
     """
@@ -39,7 +45,7 @@ def log_sfdb_content_format_check(column_count, faulty_entries):
                                f' {column1} | {column2} | {column3}')
 
     for entry_index, entry in faulty_entries:
-        line_index = f'{entry_index + INDEX_SHIFT:>{len(column1)}}'
+        line_index = f'{_get_line_number(entry_index, entry_offset):>{len(column1)}}'
         value_count = f'{len(entry):<{len(column2)}}'
         line = entry_to_line(entry)
 
@@ -61,15 +67,27 @@ def check_content_format(sfdb):
     return [(i, entry) for i, entry in enumerate(sfdb.content) if not len(entry) == num_columns]
 
 
-def log_excel_autoformatting_check(formatted_cells_list):
+def report_content_format_check(report, column_count, faulty_entries, entry_offset=0):
+    """Writes the result of a check of an sfdb's content format to a FindingsReport. One record per faulty entry."""
+    for entry_index, entry in faulty_entries:
+        report.write('content_format', _get_line_number(entry_index, entry_offset), None, entry_to_line(entry),
+                     f'Entry has {len(entry)} values! Required number of values is {column_count}!')
+
+
+def _get_line_number(entry_index, entry_offset):
+    """Returns the (human) line index of an entry in its sfdb file, see SFDBContainer.get_line_number. Negative entry
+    indices refer to header lines, which are not shifted by the entry_offset."""
+    return int(entry_index) + INDEX_SHIFT + (entry_offset if entry_index >= 0 else 0)
+
+
+def log_excel_autoformatting_check(formatted_cells):
     """Logs the result of a check whether an sfdb had entries with signs of excel autoformatting.
     Parameters:
-        formatted_cells_list (list(int, int, string): The entries with excel autoformatting, the entries index and the
-            index of the column with the value displaying excel autoformatting.
+        formatted_cells (ExcelFindings): The cells with excel autoformatting.
     Returns:
         Nothing
     """
-    if len(formatted_cells_list) == 0:
+    if len(formatted_cells) == 0:
         logging.log(LOGFILE_LEVEL, '    No issues.')
         return
 
@@ -78,9 +96,9 @@ def log_excel_autoformatting_check(formatted_cells_list):
     table_header = f' {column1} | {column2}'
     logging.log(LOGFILE_LEVEL, table_header)
 
-    for i_entry, i_col, entry in formatted_cells_list:
-        line_index = f'{i_entry + INDEX_SHIFT:>{len(column1)}}'
-        line = entry_to_line(entry)
+    for k in range(len(formatted_cells)):
+        line_index = f'{formatted_cells.get_line_number(k):>{len(column1)}}'
+        line = formatted_cells.get_line(k)
         logging.log(LOGFILE_LEVEL, f' {line_index} | \'{line}\'')
 
 
@@ -92,28 +110,37 @@ def check_excel_autoformatting(sfdb):
     Parameters:
         sfdb (SFDBContainer): The SFDB file.
     Returns:
-        list: List of tuples (i (int),j (int), entry(str)).
+        ExcelFindings: Findings that render as tuples (i (int),j (int), entry(str)).
                 i: index of an entry with a value displaying excel autoformatting
                 j: index of the entry's column with the value displaying excel autoformatting
                 entry : The entry with the value that displaying excel autoformatting
     """
-    entries = sfdb.content
-    excel_formatted_cells = []
-    for i, entry in enumerate(entries):
+    column_codes = _get_excel_column_codes(sfdb)
+    return ExcelFindings.from_column_codes(sfdb, column_codes, entry_major=True)
 
-        for j, column in enumerate(entry):
-            cell_value = str(column)
-            if re.search(r'\dE\+\d', cell_value) is not None:
-                excel_formatted_cells.append((i, j, entry))
 
-    return excel_formatted_cells
+def _get_excel_column_codes(sfdb):
+    """Returns pairs of column index and an array of error codes for every value in that column. Values with signs of
+    excel autoformatting have the error code EXCEL_AUTOFORMATTING, all others 0."""
+    column_codes = []
+    for j in range(len(sfdb.columns)):
+        values = sfdb.get_column(j)
+        is_formatted = vectorized_search(EXCEL_FORMAT_PATTERN, values, prefilter='E+')
+        column_codes.append((j, is_formatted * np.int8(EXCEL_AUTOFORMATTING)))
+    return column_codes
 
 
-def log_duplicates_check(duplicates_list):
+def report_excel_autoformatting_check(report, formatted_cells):
+    """Writes the result of a check for excel autoformatting to a FindingsReport. One record per formatted cell."""
+    _report_cell_findings(report, 'excel_autoformatting', formatted_cells)
+
+
+def log_duplicates_check(duplicates_list, entry_offset=0):
     """Logs the result of a check whether an sfdb had any duplicate entries.
     Parameters:
         duplicates_list (list(list(int), string)): A list of indices that share an identical entry as well as the
             entry itself.
+        entry_offset (int): The entry_offset of the sfdb, see SFDBContainer.entry_offset.
     Returns:
         Nothing
     """
@@ -127,7 +154,7 @@ def log_duplicates_check(duplicates_list):
     logging.log(LOGFILE_LEVEL, f' {column1} | {column2} | {column3}')
 
     for entry_indices, entry in duplicates_list:
-        line_indices = [i + INDEX_SHIFT for i in entry_indices]
+        line_indices = [_get_line_number(i, entry_offset) for i in entry_indices]
         first_index = f'{line_indices[0]:>{len(column1)}}'
 
         duplicate_indices_string = str(line_indices[1:])[1:-1]
@@ -149,16 +176,64 @@ def check_for_duplicates(sfdb):
     return sfdb.get_duplicates()
 
 
-def log_regex_check(unmatched_lines):
+def report_duplicates_check(report, duplicates_list, entry_offset=0):
+    """Writes the result of a check for duplicate entries to a FindingsReport. One record per duplicate occurrence,
+    the first occurrence of an entry is not reported."""
+    for entry_indices, entry in duplicates_list:
+        line = entry_to_line(entry)
+        first_line_index = _get_line_number(entry_indices[0], entry_offset)
+        for entry_index in entry_indices[1:]:
+            report.write('duplicates', _get_line_number(entry_index, entry_offset), None, line,
+                         f'Duplicate of line {first_line_index}!')
+
+
+def log_shard_duplicates_check(shard_duplicates):
+    """Logs the duplicate entries that a merge of sfdb shards dropped, in the format of log_duplicates_check.
+    Parameters:
+        shard_duplicates (list(ShardDuplicate)): The duplicates returned by sfdb_tools.merge_sorted_sfdb_files.
+    Returns:
+        Nothing
+    """
+    if len(shard_duplicates) == 0:
+        logging.log(LOGFILE_LEVEL, '    No issues.')
+        return
+
+    column1 = f'{"Line":>12}'
+    column2 = 'Duplicate Lines'
+    column3 = 'Entry'
+    logging.log(LOGFILE_LEVEL, f' {column1} | {column2} | {column3}')
+
+    for shard_duplicate in shard_duplicates:
+        output_line = f'{shard_duplicate.output_line:>{len(column1)}}'
+
+        duplicate_lines_string = ', '.join(f'{filepath}:{line_index}'
+                                           for filepath, line_index in shard_duplicate.occurrences[1:])
+        other_occurrences = f'{duplicate_lines_string:<{len(column2)}}'
+
+        line = entry_to_line(shard_duplicate.entry)
+
+        logging.log(LOGFILE_LEVEL, f' {output_line} | {other_occurrences} | \'{line}\'')
+
+
+def report_shard_duplicates_check(report, shard_duplicates):
+    """Writes the duplicate entries that a merge of sfdb shards dropped to a FindingsReport. One record per dropped
+    occurrence with its line in its shard, the kept first occurrence is not reported."""
+    for shard_duplicate in shard_duplicates:
+        line = entry_to_line(shard_duplicate.entry)
+        for filepath, line_index in shard_duplicate.occurrences[1:]:
+            report.write('shard_duplicates', line_index, None, line,
+                         f'Duplicate in {filepath} of line {shard_duplicate.output_line} of the merged file!')
+
+
+def log_regex_check(unmatched_values):
     """Logs the result of a check whether an sfdb had a valid header
     Parameters:
-        unmatched_lines (list(int, str, np.ndarray, str, SRE_Pattern)): A list of entries with values that did not
-            comply with a provided regular_expression for their column. Contains The index of the entry, the column
-            with the non-compliant value, the entry itself, the non-compliant value and the regular-expression.
+        unmatched_values (RegexFindings): The values that did not comply with a provided regular_expression for
+            their column.
     Returns:
         Nothing
     """
-    if len(unmatched_lines) == 0:
+    if len(unmatched_values) == 0:
         logging.log(LOGFILE_LEVEL, '    No issues.')
         return
 
@@ -169,14 +244,14 @@ def log_regex_check(unmatched_lines):
     column5 = 'Entry'
     logging.log(LOGFILE_LEVEL, f' {column1} | {column2} | {column3} | {column4} | {column5}')
 
-    for entry_index, column, entry, value, regex in unmatched_lines:
-        line_index = f'{entry_index + INDEX_SHIFT:>{len(column1)}}'
-        column = f'{column:<{len(column2)}}'
-        regex = f"\'{regex}\'"
+    for k in range(len(unmatched_values)):
+        line_index = f'{unmatched_values.get_line_number(k):>{len(column1)}}'
+        column = f'{unmatched_values.get_column_string(k):<{len(column2)}}'
+        regex = f"\'{unmatched_values.patterns[int(unmatched_values.column_indices[k])]}\'"
         regex = f'{regex:<{len(column3)}}'
-        value = f"\'{value}\'"
+        value = f"\'{unmatched_values.get_value(k)}\'"
         value = f'{value:<{len(column4)}}'
-        line = entry_to_line(entry)
+        line = unmatched_values.get_line(k)
         logging.log(LOGFILE_LEVEL, f' {line_index} | {column} | {regex} | {value} | \'{line}\'')
 
 # TODO: Add flag that allows inversing of regex search. By default logs all entries that DON'T comply with regex
@@ -191,39 +266,50 @@ def check_content_against_regex(sfdb, column_patterns):
         column_patterns (dict(str: SRE_Pattern): A dictionary mapping columns to regular expression patterns that their
             values should comply with.
     Returns:
-        list: A list of tuples(i (int), line (list)).
-                i: Index of line that did not match regular expression.
-                line : List of strings. A line that did not contain the
-                    regular expression
-        None: If regular expression pattern object is "None".
+        RegexFindings: Findings that render as tuples (i (int), column_string (str), entry (np.ndarray), value (str),
+            regex (str)), sorted by entry first and column second.
+                i: Index of the entry with a value that did not match the regular expression.
+                column_string: A string representation of the column with the value. Includes the column's index.
+                entry: The entry with the value.
+                value: The value that did not match the regular expression.
+                regex: The regular expression.
     """
-    column_indices = [(sfdb.columns.index(col), col) for col in column_patterns]
-    unmatched_entries = []
+    column_codes, patterns = _get_regex_column_codes(sfdb, column_patterns)
+    return RegexFindings.from_column_codes(sfdb, column_codes, patterns, entry_major=True)
+
 
-    for entry_index, entry in enumerate(sfdb.content):
-        for i, column_name in column_indices:
-            pattern = column_patterns[column_name]
+def _get_regex_column_codes(sfdb, column_patterns):
+    """Returns pairs of column index and an array of error codes for every value in that column, as well as a
+    dictionary mapping the column indices to their regular expressions. Values not matching their regular expression
+    have the error code REGEX_MISMATCH, all others 0."""
+    column_codes = []
+    patterns = {}
+    for column_name, pattern in column_patterns.items():
+        j = sfdb.sfdb_header.index(column_name)
+        values = sfdb.get_column(j)
+        is_mismatch = ~vectorized_search(pattern, values)
+        column_codes.append((j, is_mismatch * np.int8(REGEX_MISMATCH)))
+        patterns[j] = pattern.pattern
+    return column_codes, patterns
 
-            if not pattern.search(entry[i]):
-                column_string = f'{i + 1:>2}-{column_name}'
-                regex = pattern.pattern
-                unmatched_entries.append((entry_index, column_string, entry, entry[i], regex))
 
-    return unmatched_entries
+def report_regex_check(report, unmatched_values):
+    """Writes the result of a regular expression check to a FindingsReport. One record per non-compliant value."""
+    _report_cell_findings(report, 'regex', unmatched_values)
 
 
-def log_datatype_check(non_conform_entries):
+def log_datatype_check(non_conform_values):
     """Logs the result of a check whether an sfdb had a valid header
     Parameters:
-        non_conform_entries (): A list of entries where 1 or more values did not conform with their column's datatype.
+        non_conform_values (DatatypeFindings): The values that did not conform with their column's datatype.
     Returns:
         Nothing
     """
-    if non_conform_entries is None:
+    if non_conform_values is None:
         logging.log(LOGFILE_LEVEL, '    No Column Definitions found. Test skipped')
         return
 
-    elif len(non_conform_entries) == 0:
+    elif len(non_conform_values) == 0:
         logging.log(LOGFILE_LEVEL, '    No issues.')
         return
 
@@ -234,12 +320,12 @@ def log_datatype_check(non_conform_entries):
     column5 = 'Entry'
     logging.log(LOGFILE_LEVEL, f' {column1} | {column2} | {column3} | {column4} | {column5}')
 
-    for entry_index, column_string, entry, faulty_value, error_msg in non_conform_entries:
-        line_index = f'{entry_index + INDEX_SHIFT:>{len(column1)}}'
-        column = f'{column_string:<{len(column2)}}'
-        error_string = f'{error_msg:<{len(column3)}}'
-        value = f'{faulty_value:<20}'
-        line = entry_to_line(entry)
+    for k in range(len(non_conform_values)):
+        line_index = f'{non_conform_values.get_line_number(k):>{len(column1)}}'
+        column = f'{non_conform_values.get_column_string(k):<{len(column2)}}'
+        error_string = f'{non_conform_values.get_message(k):<{len(column3)}}'
+        value = f'{non_conform_values.get_value(k):<20}'
+        line = non_conform_values.get_line(k)
 
         logging.log(LOGFILE_LEVEL, f' {line_index} | {column} | {error_string} | {value} | \'{line}\'')
 
@@ -251,62 +337,161 @@ def check_datatype_conformity(sfdb):
     Parameters:
         sfdb (SFDBContainer): The SFDB file
     Returns:
-        list: A list of tuples (entry_index (int), column_string (str), entry(np.ndarray), cell_value, error_msg (str)).
+        DatatypeFindings: Findings that render as tuples (entry_index (int), column_string (str), entry(np.ndarray),
+            cell_value, error_msg (str)), sorted by column first and entry second.
             entry_index: The index of the entry that has a faulty value
             column_string: A string representation of the column that has a faulty value. Includes the column's index.
             entry: An SFDBContainer entry, thus a 1 dimensional numpy ndarray
             cell_value: The faulty cell value. Is either int or str
             error_msg: An error message explaining why the cell_value is faulty.
+        None: If the sfdb has no SQL table schema.
     """
     if not sfdb.has_schema():
         return None
 
-    list_of_issues = []
+    column_codes, patterns = _get_datatype_column_codes(sfdb)
+    return DatatypeFindings.from_column_codes(sfdb, column_codes, patterns)
+
+
+def _get_datatype_column_codes(sfdb):
+    """Returns pairs of column index and an array of error codes for every value in that column, as well as a
+    dictionary mapping the column indices to their datatype-patterns. Columns with a datatype that is not known are
+    skipped."""
+    column_codes = []
+    patterns = {}
     for column_index, column_name in enumerate(sfdb.columns):
         column = sfdb.schema[column_name]
-        regex_pattern = sfdb.schema.get_datatype_regex_pattern(column_name)
+        validator = sfdb.schema.get_datatype_validator(column_name)
 
-        if regex_pattern is None:  # if datatype is not known to function, skip comparison
+        if validator is None:  # if datatype is not known to function, skip comparison
             logging.log(LOGFILE_LEVEL, f'    Skipped comparison! {column_name} has unknown datatype {column.datatype}.')
             continue
 
-        for entry_index, entry in enumerate(sfdb.content):
-            cell_value = entry[column_index]
+        values = sfdb.get_column(column_index)
+        typed_column = sfdb.get_typed_column(column_index) if validator.value_range is not None else None
+        is_conform = validator(values) if typed_column is None else validator.validate_numbers(*typed_column, values)
+        column_codes.append((column_index, get_datatype_error_codes(values, column, validator, is_conform)))
+        patterns[column_index] = validator.pattern
+    return column_codes, patterns
 
-            if _is_non_conform_with_column(cell_value, column, regex_pattern):
-                column_string = f'{column_index + 1:>2}-{column.name}'
-                error_msg = _get_datatype_error_message(cell_value, column, regex_pattern)
 
-                list_of_issues.append((entry_index, column_string, entry, cell_value, error_msg))
+def report_datatype_check(report, non_conform_values):
+    """Writes the result of a datatype check to a FindingsReport. One record per non-conform value."""
+    if non_conform_values is None:
+        return
+
+    _report_cell_findings(report, 'datatype', non_conform_values)
 
-    return list_of_issues
 
+def get_datatype_error_codes(values, column, validator, is_conform=None):
+    """Determines for an array of values of a column whether they are conform with the column's datatype. Returns an
+    array with an error code for each value, 0 if it is conform. Illegal nulls take precedence over values that are
+    too long, which take precedence over values that do not match the datatype. Empty values are NULL and thus
+    conform with any datatype if the column allows NULL.
 
-def _is_non_conform_with_column(entry, column, column_pattern):
-    """Determines whether an entry is conform with a column's datatype or not."""
-    has_illegal_null = not column.with_null and entry == ''
-    entry_too_long = len(entry) > column.length
-    entry_not_match = column_pattern.search(entry) is None
-    return has_illegal_null or entry_too_long or entry_not_match
+    Parameters:
+        values (np.ndarray): The values of the column.
+        column (Column): The definition of the column in the SQL table schema.
+        validator (DatatypeValidator): The validator of the column's datatype.
+        is_conform (np.ndarray): The result of the validator for the values if it is already known.
+    Returns:
+        np.ndarray: Array of int8 error codes.
+    """
+    is_conform = validator(values) if is_conform is None else is_conform
+    is_null = values == ''
+    has_illegal_null = is_null & (not column.with_null)
+    entry_too_long = np.char.str_len(values) > column.length if validator.uses_length else np.zeros_like(is_null)
+    entry_not_match = ~is_conform & ~(is_null & column.with_null)
 
+    return np.select([has_illegal_null, entry_too_long, entry_not_match],
+                     [NULL_NOT_ALLOWED, VALUE_TOO_LONG, DATATYPE_MISMATCH], default=0).astype(np.int8)
 
-def _get_datatype_error_message(entry, column, column_pattern):
-    """Determines the error message why this entry was not conform with the column's datatype"""
-    has_illegal_null = not column.with_null and entry == ''
-    entry_too_long = len(entry) > column.length
-    entry_not_match = column_pattern.search(entry) is None
 
-    if has_illegal_null:
-        return "Null not allowed in column !"
-    elif entry_too_long:
-        return f"Entry too long with {len(entry)} chars! Allowed length is {column.length}!"
-    elif entry_not_match:
-        return f"Mismatch to SQL datatype-pattern \'{column_pattern.pattern}\'!"
-    else:
-        return "Unknown Error"
+def _report_cell_findings(report, check_name, cell_findings):
+    """Writes one record per finding of a CellFindings object to a FindingsReport."""
+    for k in range(len(cell_findings)):
+        report.write(check_name, cell_findings.get_line_number(k), cell_findings.get_column_name(k),
+                     cell_findings.get_value(k), cell_findings.get_message(k))
 
 
-def log_sfdb_comparison(diverging_lines):
+def log_summary(summary):
+    """Logs the aggregated result of a check.
+    Parameters:
+        summary (FindingsSummary): The counts of the findings of a check. None if the check was skipped.
+    Returns:
+        Nothing
+    """
+    if summary is None:
+        logging.log(LOGFILE_LEVEL, '    No Column Definitions found. Test skipped')
+        return
+
+    elif summary.total == 0:
+        logging.log(LOGFILE_LEVEL, '    No issues.')
+        return
+
+    logging.log(LOGFILE_LEVEL, f'    Findings: {summary.total}')
+    if summary.group_count is not None:
+        logging.log(LOGFILE_LEVEL, f'    Groups:   {summary.group_count}')
+    for error_kind, count in summary.per_error_kind.items():
+        logging.log(LOGFILE_LEVEL, f'    {error_kind:>22} | {count}')
+
+    if summary.per_column:
+        column1 = f'{"Column_index - Column":<25}'
+        logging.log(LOGFILE_LEVEL, f'    {column1} | Findings')
+        for column_string, count in summary.per_column.items():
+            logging.log(LOGFILE_LEVEL, f'    {column_string:<{len(column1)}} | {count}')
+
+
+def summarize_excel_autoformatting(sfdb):
+    """Counts the values in an SFDB file with signs of excel autoformatting without collecting the individual
+    findings. See check_excel_autoformatting."""
+    return FindingsSummary.from_column_codes('excel_autoformatting', sfdb, _get_excel_column_codes(sfdb))
+
+
+def summarize_content_against_regex(sfdb, column_patterns):
+    """Counts the values in an SFDB file that do not match the regular expression of their column without collecting
+    the individual findings. See check_content_against_regex."""
+    column_codes, _ = _get_regex_column_codes(sfdb, column_patterns)
+    return FindingsSummary.from_column_codes('regex', sfdb, column_codes)
+
+
+def summarize_datatype_conformity(sfdb):
+    """Counts the values in an SFDB file that are not in accordance with their SQL datatype without collecting the
+    individual findings. See check_datatype_conformity.
+
+    Returns:
+        FindingsSummary: The counts of non-conform values.
+        None: If the sfdb has no SQL table schema.
+    """
+    if not sfdb.has_schema():
+        return None
+
+    column_codes, _ = _get_datatype_column_codes(sfdb)
+    return FindingsSummary.from_column_codes('datatype', sfdb, column_codes)
+
+
+def summarize_duplicates(sfdb):
+    """Counts the duplicate entries of an SFDB file without collecting which entries are duplicates of each other.
+    The first occurrence of an entry does not count as duplicate. The number of distinct entries with duplicates is
+    the group_count of the summary."""
+    if len(sfdb) == 0:
+        return FindingsSummary('duplicates', 0, group_count=0)
+
+    _, counts = np.unique(sfdb.content, return_counts=True, axis=0)
+    duplicate_count = int(np.sum(counts - 1))
+    return FindingsSummary('duplicates', duplicate_count, per_error_kind={'duplicate': duplicate_count},
+                           group_count=int(np.count_nonzero(counts > 1)))
+
+
+def log_sfdb_comparison(diverging_lines, entry_offset_new=0, entry_offset_old=0):
+    """Logs the result of a comparison of 2 sfdb files.
+    Parameters:
+        diverging_lines (list): The diverging entries, see check_sfdb_comparison. None if the comparison was skipped.
+        entry_offset_new (int): The entry_offset of the updated sfdb, see SFDBContainer.entry_offset.
+        entry_offset_old (int): The entry_offset of the previous sfdb.
+    Returns:
+        Nothing
+    """
     if diverging_lines is None:
         log_message = '    Comparison Test Skipped. Files did not have equal lengths with the given lines excluded.'
         logging.log(LOGFILE_LEVEL, log_message)
@@ -322,9 +507,9 @@ def log_sfdb_comparison(diverging_lines):
     logging.log(LOGFILE_LEVEL, f' {column1} | {column2} | {column3}')
 
     for i_new, entry_new, i_old, entry_old in diverging_lines:
-        line_index_old = f'{i_old + INDEX_SHIFT:>{len(column2)}}'
+        line_index_old = f'{_get_line_number(i_old, entry_offset_old):>{len(column2)}}'
         line_new = entry_to_line(entry_new)
-        line_index_new = f'{i_new + INDEX_SHIFT:>{len(column2)}}'
+        line_index_new = f'{_get_line_number(i_new, entry_offset_new):>{len(column2)}}'
         line_old = entry_to_line(entry_old)
 
         logging.log(LOGFILE_LEVEL, f' {f"Old":>{len(column1)}} | {line_index_old} | \'{line_old}\'\n'
@@ -352,10 +537,10 @@ def check_sfdb_comparison(sfdb_new, sfdb_old, excluded_lines_new=(), excluded_li
 
     # Change indices from (start at 6) to (start at 0)
     excluded_entries_new = [] if excluded_lines_new is None else \
-        set([line_index - INDEX_SHIFT for line_index in excluded_lines_new])
+        set([line_index - INDEX_SHIFT - sfdb_new.entry_offset for line_index in excluded_lines_new])
 
     excluded_entries_old = [] if excluded_lines_new is None else \
-        set([line_index - INDEX_SHIFT for line_index in excluded_lines_old])
+        set([line_index - INDEX_SHIFT - sfdb_old.entry_offset for line_index in excluded_lines_old])
 
     if not sfdb_new.name == sfdb_old.name:
         logging.log(LOGFILE_LEVEL, '    !WARNING! SQL Tables have different names!')
@@ -368,6 +553,17 @@ def check_sfdb_comparison(sfdb_new, sfdb_old, excluded_lines_new=(), excluded_li
     return deviating_lines
 
 
+def report_sfdb_comparison(report, diverging_lines, entry_offset_new=0, entry_offset_old=0):
+    """Writes the result of a comparison of 2 sfdb files to a FindingsReport. One record per diverging entry."""
+    if diverging_lines is None:
+        return
+
+    for i_new, entry_new, i_old, entry_old in diverging_lines:
+        line_index_old = _get_line_number(i_old, entry_offset_old)
+        report.write('comparison', _get_line_number(i_new, entry_offset_new), None, entry_to_line(entry_new),
+                     f'Differs from line {line_index_old} of the old SFDB: \'{entry_to_line(entry_old)}\'')
+
+
 def _compare_sfdb_lines(sfdb_new, sfdb_old, i_ex_entries_new, i_ex_entries_old, excluded_columns):
     """Checks whether the lines of 2 SFDB files are identical after exclusion of specific lines and columns.
 
@@ -381,7 +577,9 @@ def _compare_sfdb_lines(sfdb_new, sfdb_old, i_ex_entries_new, i_ex_entries_old,
         i_ex_entries_new (set): Set of int. Entry-indices to be excluded from sfdb_new
         i_ex_entries_old (set): Set of int. Entry-indices to be excluded from sfdb_old
         excluded_columns (list): List of strings. Names columns to be
-            excluded from both sfdb files.
+            excluded from both sfdb files. An sfdb that was loaded without
+            some of them, see SFDBContainer.from_file, is compared as if
+            they were there.
     Returns:
         list: List of tuples (i (int), new_entry(np.ndarray), j (int), old_entry(np.ndarray).
                 i: Index of deviating line in sfdb_new
@@ -392,15 +590,17 @@ def _compare_sfdb_lines(sfdb_new, sfdb_old, i_ex_entries_new, i_ex_entries_old,
     if not len(sfdb_new) - len(i_ex_entries_new) == len(sfdb_old) - len(i_ex_entries_old):
         raise ComparisonError('Can not compare SFDB files with unequal number of lines!')
 
-    i_ex_col_new = []
-    i_ex_col_old = []
-    if excluded_columns is not None:
-        i_ex_col_new = [sfdb_new.columns.index(col) for col in excluded_columns]
-        i_ex_col_old = [sfdb_old.columns.index(col) for col in excluded_columns]
+    excluded_columns = [] if excluded_columns is None else excluded_columns
+    i_ex_col_new = [sfdb_new.sfdb_header.index(col) for col in excluded_columns
+                    if col in sfdb_new.sfdb_header.column_indices]
+    i_ex_col_old = [sfdb_old.sfdb_header.index(col) for col in excluded_columns
+                    if col in sfdb_old.sfdb_header.column_indices]
 
-    deviating_lines = [(i - INDEX_SHIFT, sfdb_new.header[i], i - INDEX_SHIFT, sfdb_old.header[i])
-                       for i in range(len(sfdb_new.header))
-                       if not sfdb_new.header[i] == sfdb_old.header[i]]
+    header_new = _get_compared_header(sfdb_new.sfdb_header, excluded_columns)
+    header_old = _get_compared_header(sfdb_old.sfdb_header, excluded_columns)
+    deviating_lines = [(i - INDEX_SHIFT, header_new[i], i - INDEX_SHIFT, header_old[i])
+                       for i in range(len(header_new))
+                       if not header_new[i] == header_old[i]]
 
     i = 0
     j = 0
@@ -421,6 +621,12 @@ def _compare_sfdb_lines(sfdb_new, sfdb_old, i_ex_entries_new, i_ex_entries_old,
     return deviating_lines
 
 
+def _get_compared_header(sfdb_header, excluded_columns):
+    """Returns the fields of the header lines without the columns excluded from a comparison."""
+    column_fields = tuple(field for field in sfdb_header.fields[3] if field not in excluded_columns)
+    return sfdb_header.fields[:3] + (column_fields,) + sfdb_header.fields[4:]
+
+
 def _are_equal_entries(entry1, entry2, excluded_indices1, excluded_indices2):
     """Checks whether 2 entries are identical or not.
 
@@ -0,0 +1,230 @@
+"""This module contains compact containers for the findings of checks that concern individual cells of an SFDB.
+
+Instead of keeping a tuple with a reference to the faulty entry and pre-formatted strings for every finding, a findings
+object only stores 3 integer arrays: The entry index, the column index and an error code per finding. Everything else,
+such as the faulty value, the line of the entry or the error message, is rendered lazily from the SFDBContainer the
+findings belong to once it is actually needed for logging or reporting.
+
+Findings objects can still be iterated and indexed like the lists of tuples that the checks returned previously."""
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+# Error codes of a finding
+NULL_NOT_ALLOWED = 1
+VALUE_TOO_LONG = 2
+DATATYPE_MISMATCH = 3
+REGEX_MISMATCH = 4
+EXCEL_AUTOFORMATTING = 5
+
+ERROR_KINDS = {NULL_NOT_ALLOWED: 'null',
+               VALUE_TOO_LONG: 'too long',
+               DATATYPE_MISMATCH: 'pattern mismatch',
+               REGEX_MISMATCH: 'regex mismatch',
+               EXCEL_AUTOFORMATTING: 'excel autoformatting'}
+
+
+class CellFindings(ABC):
+    """Abstract base class for findings that concern individual cells of an SFDBContainer. Subclasses define how a
+    finding renders as tuple.
+
+    Parameters:
+        sfdb (SFDBContainer): The SFDB file the findings were found in.
+        entry_indices (array-like): Entry index of each finding.
+        column_indices (array-like): Column index of each finding.
+        error_codes (array-like): Error code of each finding.
+        patterns (dict(int: str)): Maps column indices to the pattern their values were checked against.
+    """
+    __slots__ = ('sfdb', 'entry_indices', 'column_indices', 'error_codes', 'patterns')
+
+    def __init__(self, sfdb, entry_indices=(), column_indices=(), error_codes=(), patterns=None):
+        self.sfdb = sfdb
+        self.entry_indices = np.asarray(entry_indices, dtype=np.int32)
+        self.column_indices = np.asarray(column_indices, dtype=np.int16)
+        self.error_codes = np.asarray(error_codes, dtype=np.int8)
+        self.patterns = {} if patterns is None else patterns
+
+    @classmethod
+    def from_column_codes(cls, sfdb, column_codes, patterns=None, entry_major=False):
+        """Creates a findings object out of arrays of error codes, one array per column. An error code of 0 means that
+        the value is fine. Findings are sorted by column first and entry second unless entry_major is set.
+
+        Parameters:
+            sfdb (SFDBContainer): The SFDB file the findings were found in.
+            column_codes (list(int, np.ndarray)): Pairs of column index and the error codes of every entry in it.
+            patterns (dict(int: str)): Maps column indices to the pattern their values were checked against.
+            entry_major (bool): Sorts the findings by entry first and column second.
+        """
+        entry_indices = []
+        column_indices = []
+        error_codes = []
+        for column_index, codes in column_codes:
+            i_faulty = np.flatnonzero(codes)
+            entry_indices.append(i_faulty)
+            column_indices.append(np.full(len(i_faulty), column_index))
+            error_codes.append(codes[i_faulty])
+
+        if not entry_indices:
+            return cls(sfdb, patterns=patterns)
+
+        entry_indices = np.concatenate(entry_indices)
+        column_indices = np.concatenate(column_indices)
+        error_codes = np.concatenate(error_codes)
+        if entry_major:
+            order = np.lexsort((column_indices, entry_indices))
+            entry_indices, column_indices, error_codes = entry_indices[order], column_indices[order], error_codes[order]
+
+        return cls(sfdb, entry_indices, column_indices, error_codes, patterns)
+
+    def __len__(self):
+        return len(self.entry_indices)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f'Index {index} is out of range of 0-{len(self) - 1}')
+        return self._as_tuple(index)
+
+    def __iter__(self):
+        return (self._as_tuple(i) for i in range(len(self)))
+
+    def __eq__(self, other):
+        if isinstance(other, list):
+            return len(self) == len(other) and all(_tuples_equal(a, b) for a, b in zip(self, other))
+        if isinstance(other, CellFindings):
+            return (self.sfdb is other.sfdb and
+                    np.array_equal(self.entry_indices, other.entry_indices) and
+                    np.array_equal(self.column_indices, other.column_indices) and
+                    np.array_equal(self.error_codes, other.error_codes))
+        return NotImplemented
+
+    def __repr__(self):
+        return f'{type(self).__name__}({len(self)} findings in {self.sfdb.name})'
+
+    @abstractmethod
+    def _as_tuple(self, index):
+        """Renders the finding at index as tuple."""
+
+    def get_entry_index(self, index):
+        return int(self.entry_indices[index])
+
+    def get_line_number(self, index):
+        """Returns the number of the line of a finding in the sfdb file, see SFDBContainer.get_line_number."""
+        return self.sfdb.get_line_number(self.get_entry_index(index))
+
+    def get_column_name(self, index):
+        return self.sfdb.columns[self.column_indices[index]]
+
+    def get_column_string(self, index):
+        """Returns a string representation of the column of a finding. Includes the column's index."""
+        column_index = int(self.column_indices[index])
+        return f'{column_index + 1:>2}-{self.sfdb.columns[column_index]}'
+
+    def get_value(self, index):
+        return self.sfdb.content[self.entry_indices[index], self.column_indices[index]]
+
+    def get_line(self, index):
+        """Returns the line of the SFDB file that contains the finding."""
+        return self.sfdb.get_entry_string(self.get_entry_index(index))
+
+    def get_message(self, index):
+        """Renders the error message of a finding."""
+        error_code = self.error_codes[index]
+        pattern = self.patterns.get(int(self.column_indices[index]))
+
+        if error_code == NULL_NOT_ALLOWED:
+            return "Null not allowed in column !"
+        elif error_code == VALUE_TOO_LONG:
+            length = self.sfdb.schema[self.get_column_name(index)].length
+            return f"Entry too long with {len(self.get_value(index))} chars! Allowed length is {length}!"
+        elif error_code == DATATYPE_MISMATCH:
+            return f"Mismatch to SQL datatype-pattern \'{pattern}\'!"
+        elif error_code == REGEX_MISMATCH:
+            return f"Mismatch to regular expression \'{pattern}\'!"
+        elif error_code == EXCEL_AUTOFORMATTING:
+            return 'Value displays signs of excel autoformatting!'
+        else:
+            return "Unknown Error"
+
+
+class DatatypeFindings(CellFindings):
+    """Findings of the datatype check. Renders as (entry_index, column_string, entry, cell_value, error_msg)."""
+    __slots__ = ()
+
+    def _as_tuple(self, index):
+        entry_index = self.get_entry_index(index)
+        return (entry_index, self.get_column_string(index), self.sfdb[entry_index], self.get_value(index),
+                self.get_message(index))
+
+
+class RegexFindings(CellFindings):
+    """Findings of the regular expression check. Renders as (entry_index, column_string, entry, cell_value, regex)."""
+    __slots__ = ()
+
+    def _as_tuple(self, index):
+        entry_index = self.get_entry_index(index)
+        return (entry_index, self.get_column_string(index), self.sfdb[entry_index], self.get_value(index),
+                self.patterns[int(self.column_indices[index])])
+
+
+class ExcelFindings(CellFindings):
+    """Findings of the excel autoformatting check. Renders as (entry_index, column_index, entry)."""
+    __slots__ = ()
+
+    def _as_tuple(self, index):
+        entry_index = self.get_entry_index(index)
+        return entry_index, int(self.column_indices[index]), self.sfdb[entry_index]
+
+
+class FindingsSummary:
+    """Aggregated counts of the findings of a check: In total, per column and per error kind.
+
+    Parameters:
+        check (str): The name of the check.
+        total (int): The number of findings.
+        per_column (dict(str: int)): Maps column strings, which include the column's index, to their number of findings.
+        per_error_kind (dict(str: int)): Maps error kinds to their number of findings.
+        group_count (int): The number of groups the findings form, e.g. the number of entries with duplicates. None if
+            the findings of the check form no groups.
+    """
+    __slots__ = ('check', 'total', 'per_column', 'per_error_kind', 'group_count')
+
+    def __init__(self, check, total, per_column=None, per_error_kind=None, group_count=None):
+        self.check = check
+        self.total = total
+        self.per_column = {} if per_column is None else per_column
+        self.per_error_kind = {} if per_error_kind is None else per_error_kind
+        self.group_count = group_count
+
+    @classmethod
+    def from_column_codes(cls, check, sfdb, column_codes):
+        """Aggregates arrays of error codes, one array per column, with vectorized reductions. An error code of 0 means
+        that the value is fine.
+
+        Parameters:
+            check (str): The name of the check.
+            sfdb (SFDBContainer): The SFDB file the error codes belong to.
+            column_codes (list(int, np.ndarray)): Pairs of column index and the error codes of every entry in it.
+        """
+        per_column = {}
+        code_counts = np.zeros(max(ERROR_KINDS) + 1, dtype=np.int64)
+        for column_index, codes in column_codes:
+            counts = np.bincount(codes, minlength=len(code_counts))
+            column_total = int(counts[1:].sum())
+            if column_total > 0:
+                per_column[f'{column_index + 1:>2}-{sfdb.columns[column_index]}'] = column_total
+            code_counts += counts
+
+        per_error_kind = {ERROR_KINDS[code]: int(count) for code, count in enumerate(code_counts)
+                          if code > 0 and count > 0}
+        return cls(check, int(code_counts[1:].sum()), per_column, per_error_kind)
+
+    def __repr__(self):
+        return f'FindingsSummary({self.check}: {self.total} findings)'
+
+
+def _tuples_equal(tuple1, tuple2):
+    """Compares 2 finding tuples, which may contain numpy arrays."""
+    return len(tuple1) == len(tuple2) and all(np.array_equal(a, b) if isinstance(a, np.ndarray) else a == b
+                                              for a, b in zip(tuple1, tuple2))
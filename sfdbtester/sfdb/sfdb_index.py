@@ -0,0 +1,159 @@
+"""This module contains secondary indexes on the columns of an SFDB, which answer point lookups like "which entries have
+the value K?" and range scans without a full scan over the column.
+
+An index is built on the keys of the entries, which are the values of the indexed columns. Keys of multiple columns are
+joined with tabs, as tabs can not occur within the values of an SFDB. Lookups on multiple columns take a tuple of
+values.
+
+Indexes only refer to entries by their entry index and can be saved to and loaded from .npz files, so that they can be
+kept next to the SFDB file they were built for. The digest of that SFDB is saved with them, to recognize whether the
+index still fits the file."""
+import numpy as np
+
+INDEX_KINDS = ('hash', 'sorted')
+
+
+class HashIndex:
+    """Index that maps each key to the array of indices of the entries with that key. Answers point lookups in O(1).
+
+    Parameters:
+        columns (tuple): The names of the indexed columns.
+        keys (np.ndarray): The unique keys.
+        row_ids (np.ndarray): The entry indices grouped by key in the order of keys, ascending within each group.
+        starts (np.ndarray): The position in row_ids at which the group of each key starts.
+        digest (bytes): The digest of the sfdb the index was built for, if known.
+    """
+    kind = 'hash'
+
+    def __init__(self, columns, keys, row_ids, starts, digest=b''):
+        self.columns = tuple(columns)
+        self.digest = digest
+        self.keys = keys
+        self.row_ids = row_ids
+        self.starts = starts
+        self._groups = dict(zip(keys.tolist(), np.split(row_ids, starts[1:]) if len(keys) > 0 else []))
+
+    def __len__(self):
+        return len(self.row_ids)
+
+    @classmethod
+    def from_keys(cls, columns, keys):
+        """Builds the index out of the key of every entry."""
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        row_ids = np.argsort(inverse, kind='stable')
+        starts = np.searchsorted(inverse[row_ids], np.arange(len(unique_keys)))
+        return cls(columns, unique_keys, row_ids, starts)
+
+    def lookup(self, key):
+        """Returns the ascending indices of all entries with the key."""
+        return self._groups.get(_to_key(key), np.arange(0))
+
+    def save(self, filepath):
+        """Saves the index to an .npz file."""
+        np.savez(filepath, kind=self.kind, columns=np.array(self.columns),
+                 digest=np.frombuffer(self.digest, dtype=np.uint8), keys=self.keys, row_ids=self.row_ids,
+                 starts=self.starts)
+
+
+class SortedIndex:
+    """Index of the entry indices in the order of their keys. Answers point lookups and range scans by binary search.
+
+    Parameters:
+        columns (tuple): The names of the indexed columns.
+        sorted_keys (np.ndarray): The keys of all entries in ascending order.
+        order (np.ndarray): The entry indices in the order of sorted_keys. Entries with equal keys are ascending.
+        digest (bytes): The digest of the sfdb the index was built for, if known.
+    """
+    kind = 'sorted'
+
+    def __init__(self, columns, sorted_keys, order, digest=b''):
+        self.columns = tuple(columns)
+        self.digest = digest
+        self.sorted_keys = sorted_keys
+        self.order = order
+
+    def __len__(self):
+        return len(self.order)
+
+    @classmethod
+    def from_keys(cls, columns, keys):
+        """Builds the index out of the key of every entry."""
+        order = np.argsort(keys, kind='stable')
+        return cls(columns, keys[order], order)
+
+    def lookup(self, key):
+        """Returns the ascending indices of all entries with the key."""
+        key = _to_key(key)
+        start = np.searchsorted(self.sorted_keys, key, side='left')
+        stop = np.searchsorted(self.sorted_keys, key, side='right')
+        return self.order[start:stop]
+
+    def range(self, low=None, high=None, include_high=True):
+        """Returns the indices of all entries with keys between low and high, in the order of their keys. Keys are
+        compared as strings, so e.g. ISO dates compare chronologically.
+
+        Parameters:
+            low (str / tuple): The smallest key to include. No lower bound if None.
+            high (str / tuple): The largest key. No upper bound if None.
+            include_high (bool): Whether entries with the key high are included.
+        Returns:
+            np.ndarray: Array of entry indices.
+        """
+        start = 0 if low is None else np.searchsorted(self.sorted_keys, _to_key(low), side='left')
+        stop = len(self.order) if high is None else \
+            np.searchsorted(self.sorted_keys, _to_key(high), side='right' if include_high else 'left')
+        return self.order[start:max(start, stop)]
+
+    def save(self, filepath):
+        """Saves the index to an .npz file."""
+        np.savez(filepath, kind=self.kind, columns=np.array(self.columns),
+                 digest=np.frombuffer(self.digest, dtype=np.uint8), sorted_keys=self.sorted_keys, order=self.order)
+
+
+def build_index(columns, keys, kind='hash'):
+    """Builds an index of a kind out of the key of every entry.
+
+    Parameters:
+        columns (tuple): The names of the indexed columns.
+        keys (np.ndarray): The key of every entry, see join_keys.
+        kind (str): One of INDEX_KINDS.
+    Returns:
+        HashIndex / SortedIndex: The index.
+    """
+    if kind == 'hash':
+        return HashIndex.from_keys(columns, keys)
+    elif kind == 'sorted':
+        return SortedIndex.from_keys(columns, keys)
+    else:
+        raise ValueError(f'{kind} is no index kind! Use one of {INDEX_KINDS}.')
+
+
+def join_keys(column_values):
+    """Joins the values of one or more columns into one key per entry, separated by tabs."""
+    keys = column_values[0]
+    for values in column_values[1:]:
+        keys = np.char.add(np.char.add(keys, '\t'), values)
+    return keys
+
+
+def load_index(filepath):
+    """Loads an index saved with the save method of an index."""
+    with np.load(filepath) as data:
+        kind = str(data['kind'])
+        columns = tuple(data['columns'].tolist())
+        digest = data['digest'].tobytes()
+        if kind == 'hash':
+            return HashIndex(columns, data['keys'], data['row_ids'], data['starts'], digest)
+        return SortedIndex(columns, data['sorted_keys'], data['order'], digest)
+
+
+def get_index_filepath(sfdb_filepath, columns, kind, file_selection=''):
+    """Returns the filepath under which an index of an SFDB file is kept next to it. Indexes of sfdbs that only loaded
+    some rows or columns of the file are told apart by their file_selection, see SFDBContainer.file_selection."""
+    selection = f'_{file_selection}' if file_selection else ''
+    return f'{sfdb_filepath[:-5]}{selection}_{"_".join(columns)}_{kind}_index.npz'
+
+
+def _to_key(key):
+    """Turns the lookup value of one or more columns into a key."""
+    return key if isinstance(key, str) else '\t'.join(key)
@@ -0,0 +1,239 @@
+"""This module reads SFDB files as a stream of lines instead of loading them into an SFDBContainer as a whole. Entries
+are handed out in chunks of a fixed number of lines, so that tools built on top of it work in bounded memory no matter
+how large the SFDB file is.
+
+Just like the SFDBContainer, lines handed out by this module have no line-endings.
+
+For random access to the entries of large files, the byte offsets of every Nth line can be kept in a line offset index
+next to the file. Reading a range of entries then only reads the lines of the range and less than N lines before it."""
+import os
+from itertools import islice
+from types import MappingProxyType
+
+import numpy as np
+
+SFDB_HEADER_LENGTH = 5
+DEFAULT_CHUNK_SIZE = 100000
+LINE_OFFSET_STRIDE = 1000  # Every how many entries the byte offset of the line is kept in a line offset index
+
+
+class NotSFDBFileError(Exception):
+    """This custom error is to be raised when a function/method that expects an SFDB file as parameter receives
+    something else instead."""
+    pass
+
+
+class SFDBHeader:
+    """The parsed header of an sfdb. It is immutable, so it can be shared and only needs to be parsed once.
+
+    Parameters:
+        header_lines (list): The 5 header lines without line-endings.
+    Attributes:
+        lines (tuple): The header lines.
+        fields (tuple): The tab-separated fields of each header line.
+        name (str): The name of the table.
+        columns (tuple): The names of the columns.
+        column_indices (mapping): The index of each column by its name.
+    """
+    __slots__ = ('lines', 'fields', 'name', 'columns', 'column_indices')
+
+    def __init__(self, header_lines):
+        lines = tuple(header_lines[:SFDB_HEADER_LENGTH])
+        fields = tuple(tuple(line.split('\t')) for line in lines)
+        columns = fields[3][1:]
+        object.__setattr__(self, 'lines', lines)
+        object.__setattr__(self, 'fields', fields)
+        object.__setattr__(self, 'name', fields[2][1])
+        object.__setattr__(self, 'columns', columns)
+        object.__setattr__(self, 'column_indices', MappingProxyType({column: j for j, column in
+                                                                     reversed(list(enumerate(columns)))}))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable!')
+
+    def __eq__(self, other_header):
+        return isinstance(other_header, SFDBHeader) and self.lines == other_header.lines
+
+    def __hash__(self):
+        return hash(self.lines)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.name}, {self.columns})'
+
+    def index(self, column):
+        """Returns the index of a column by its name. Raises a KeyError for unknown columns."""
+        try:
+            return self.column_indices[column]
+        except KeyError:
+            raise KeyError(f'{column} is no column of {self.name}!') from None
+
+    def get_column_indices(self, column_names):
+        """Returns the indices of the columns with the given names. Defaults to all columns. Raises a ValueError naming
+        all unknown columns."""
+        if not column_names:
+            return list(range(len(self.columns)))
+
+        invalid_columns = [column for column in column_names if column not in self.column_indices]
+        if invalid_columns:
+            raise ValueError(f'{invalid_columns} are no columns of {self.name}!')
+        return [self.column_indices[column] for column in column_names]
+
+
+def is_sfdb_header(header_lines):
+    """Checks whether each line in the header of an sfdb file follows the sfdb format specifications."""
+    if len(header_lines) < SFDB_HEADER_LENGTH:
+        return False
+
+    header = [line.split('\t') for line in header_lines[:SFDB_HEADER_LENGTH]]
+    is_correct_header = ((header[0][0] == 'ENCODING UTF8') and (len(header[0]) == 1) and
+                         (header[1][0] == 'INIT')          and (len(header[1]) == 1) and
+                         (header[2][0] == 'TABLE')         and (len(header[2]) == 2) and
+                         (header[3][0] == 'COLUMNS')       and (len(header[3]) > 1) and
+                         (header[4][0] == 'INSERT')        and (len(header[4]) == 1))
+    return is_correct_header
+
+
+def read_sfdb_header(sfdb_stream, filepath=''):
+    """Reads the header lines from the start of an sfdb stream. The stream is left at the first entry.
+
+    Parameters:
+        sfdb_stream (IOStream): An input stream of an sfdb file.
+        filepath (str): The filepath of the stream. Only used for error messages.
+    Returns:
+        list: The 5 header lines.
+    """
+    header_lines = [line.rstrip('\n') for line in islice(sfdb_stream, SFDB_HEADER_LENGTH)]
+    if not is_sfdb_header(header_lines):
+        raise NotSFDBFileError(f'{filepath} is not an SFDB! It does not have a correct sfdb header!')
+    return header_lines
+
+
+def iter_line_chunks(sfdb_stream, chunk_size=DEFAULT_CHUNK_SIZE, chunk_bytes=None):
+    """Yields the remaining lines of an sfdb stream in lists of at most chunk_size lines. An empty last line is dropped,
+    like SFDBContainer.read_sfdb_from_file does.
+
+    Parameters:
+        sfdb_stream (IOStream): An input stream of an sfdb file, usually positioned after the header.
+        chunk_size (int): The maximum number of lines per chunk.
+        chunk_bytes (int): If given, chunks are instead limited to about chunk_bytes, measured by the length of their
+            lines. A single line longer than that is still handed out as a chunk of its own.
+    Yields:
+        list: List of strings without line-endings.
+    """
+    chunk = _read_line_chunk(sfdb_stream, chunk_size, chunk_bytes)
+    while chunk:
+        next_chunk = _read_line_chunk(sfdb_stream, chunk_size, chunk_bytes)
+        if not next_chunk and chunk[-1] == '':
+            del chunk[-1]
+
+        if chunk:
+            yield chunk
+        chunk = next_chunk
+
+
+def _read_line_chunk(sfdb_stream, chunk_size, chunk_bytes):
+    """Reads the next chunk of lines of a stream, limited either by chunk_size lines or by chunk_bytes."""
+    if chunk_bytes is None:
+        return [line.rstrip('\n') for line in islice(sfdb_stream, chunk_size)]
+
+    chunk = []
+    size = 0
+    while size < chunk_bytes:
+        line = sfdb_stream.readline()
+        if not line:
+            break
+        chunk.append(line.rstrip('\n'))
+        size += len(line)
+    return chunk
+
+
+def get_header_columns(header_lines):
+    """Returns the table name and the column names of an sfdb header."""
+    header = SFDBHeader(header_lines)
+    return header.name, list(header.columns)
+
+
+def build_line_offsets(sfdb_filepath, stride=LINE_OFFSET_STRIDE):
+    """Reads an sfdb file once and returns the byte offsets of the lines of every stride-th entry, starting with the
+    first entry.
+
+    Parameters:
+        sfdb_filepath (str): Path of the sfdb file.
+        stride (int): Every how many entries the offset is kept.
+    Returns:
+        np.ndarray: Array of int64 byte offsets.
+    """
+    offsets = []
+    with open(sfdb_filepath, mode='rb') as sfdb_stream:
+        for _ in range(SFDB_HEADER_LENGTH):
+            sfdb_stream.readline()
+
+        offset = sfdb_stream.tell()
+        for entry_index, line in enumerate(sfdb_stream):
+            if entry_index % stride == 0:
+                offsets.append(offset)
+            offset += len(line)
+    return np.array(offsets, dtype=np.int64)
+
+
+def get_line_offsets(sfdb_filepath, stride=LINE_OFFSET_STRIDE):
+    """Returns the line offset index of an sfdb file. The index is persisted next to the file if that is possible and
+    only built again if the file's size or modification time changed or the stride differs.
+
+    Parameters:
+        sfdb_filepath (str): Path of the sfdb file.
+        stride (int): Every how many entries the offset is kept.
+    Returns:
+        np.ndarray: Array of int64 byte offsets, see build_line_offsets.
+    """
+    file_stat = os.stat(sfdb_filepath)
+    file_signature = np.array([file_stat.st_size, file_stat.st_mtime_ns, stride], dtype=np.int64)
+    offsets_filepath = get_line_offsets_filepath(sfdb_filepath)
+    if os.path.exists(offsets_filepath):
+        with np.load(offsets_filepath) as data:
+            if np.array_equal(data['signature'], file_signature):
+                return data['offsets']
+
+    offsets = build_line_offsets(sfdb_filepath, stride)
+    try:
+        np.savez(offsets_filepath, signature=file_signature, offsets=offsets)
+    except OSError:  # E.g. a read-only directory, the index is then only kept in memory
+        pass
+    return offsets
+
+
+def get_line_offsets_filepath(sfdb_filepath):
+    """Returns the filepath under which the line offset index of an SFDB file is kept next to it."""
+    return f'{sfdb_filepath[:-5]}_line_offsets.npz'
+
+
+def read_entry_lines(sfdb_filepath, start, stop, line_offsets, stride=LINE_OFFSET_STRIDE):
+    """Reads the lines of the entries from start to stop (exclusive) of an sfdb file. Only the lines from the closest
+    offset in the line offset index on are read. An empty last line is dropped, like SFDBContainer.read_sfdb_from_file
+    does.
+
+    Parameters:
+        sfdb_filepath (str): Path of the sfdb file.
+        start (int): Entry index of the first line to read.
+        stop (int): Entry index after the last line to read. Stops early at the end of the file.
+        line_offsets (np.ndarray): The line offset index of the file, see get_line_offsets.
+        stride (int): The stride of the line offset index.
+    Returns:
+        list: List of strings without line-endings.
+    """
+    if start < 0 or stop < start:
+        raise ValueError(f'Can not read the entries from {start} to {stop}!')
+
+    offset_index = start // stride
+    if offset_index >= len(line_offsets):
+        return []
+
+    with open(sfdb_filepath, mode='rb') as sfdb_stream:
+        sfdb_stream.seek(int(line_offsets[offset_index]))
+        for _ in range(start - offset_index * stride):
+            sfdb_stream.readline()
+
+        lines = [line.decode('utf-8').rstrip('\r\n') for line in islice(sfdb_stream, stop - start)]
+        if lines and lines[-1] == '' and not sfdb_stream.readline():
+            del lines[-1]
+    return lines
@@ -0,0 +1,464 @@
+"""This module contains tools that create new SFDB files out of existing ones, such as sorted, merged, deduplicated,
+repaired or split copies. The tools stream through the SFDB files with the help of sfdb_stream, so they also work on
+files that do not fit into memory. Only files smaller than a memory budget are loaded into an SFDBContainer."""
+import heapq
+import os
+import tempfile
+import zlib
+from collections import Counter, namedtuple
+from contextlib import ExitStack
+
+import numpy as np
+
+from sfdbtester.common.utilities import vectorized_search
+from sfdbtester.sfdb.sfdb import SFDBContainer, get_sort_order
+from sfdbtester.sfdb.sfdb_cache import get_line_fingerprint
+from sfdbtester.sfdb.sfdb_checks import INDEX_SHIFT, get_datatype_error_codes
+from sfdbtester.sfdb.sfdb_stream import DEFAULT_CHUNK_SIZE, SFDBHeader, get_header_columns, iter_line_chunks, \
+    read_sfdb_header
+from sfdbtester.sfdb.sql_table_schema import SQLTableSchema
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024**2
+PARSED_SIZE_FACTOR = 16  # Estimated bytes of memory per byte of sfdb text, once it is split into values and sorted
+
+# Reasons for rejecting an entry during a repair
+REJECT_WRONG_VALUE_COUNT = 'wrong value count'
+REJECT_DATATYPE_MISMATCH = 'datatype mismatch'
+REJECT_REGEX_MISMATCH = 'regex mismatch'
+REJECT_DUPLICATE = 'duplicate'
+
+# An entry that occurs more than once among the shards of a merge. occurrences are pairs of shard filepath and (human)
+# line index in that shard, output_line is the line index of the one kept occurrence in the merged file.
+# across_shards is False for entries that are only duplicated within a single shard.
+ShardDuplicate = namedtuple('ShardDuplicate', ['entry', 'occurrences', 'output_line', 'across_shards'])
+
+
+def dedup_sfdb_file(sfdb_filepath, output_filepath, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Writes a copy of an SFDB file in which only the first occurrence of every entry is kept. The file is streamed
+    through once without building the table of entries; only a fingerprint of every distinct line is remembered and
+    the kept lines are written in batches of chunk_size lines.
+
+    Parameters:
+        sfdb_filepath (str): Path of the sfdb file to deduplicate.
+        output_filepath (str): Path of the deduplicated sfdb file. Must differ from sfdb_filepath.
+        chunk_size (int): The number of lines that are read and written at once.
+    Returns:
+        int: The number of dropped duplicate entries.
+    """
+    fingerprints = set()
+    duplicate_count = 0
+    with open(sfdb_filepath, encoding='utf8') as sfdb_stream, \
+            open(output_filepath, mode='w', encoding='utf-8') as output_stream:
+        header_lines = read_sfdb_header(sfdb_stream, sfdb_filepath)
+        output_stream.writelines(f'{line}\n' for line in header_lines)
+
+        for lines in iter_line_chunks(sfdb_stream, chunk_size):
+            unique_lines = []
+            for line in lines:
+                fingerprint = get_line_fingerprint(line)
+                if fingerprint in fingerprints:
+                    duplicate_count += 1
+                    continue
+
+                fingerprints.add(fingerprint)
+                unique_lines.append(f'{line}\n')
+            output_stream.writelines(unique_lines)
+
+    return duplicate_count
+
+
+def repair_sfdb_file(sfdb_filepath, output_filepath, rejects_filepath=None, remove_duplicates=True,
+                     reject_invalid=False, column_patterns=None, schema=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Writes a cleaned copy of an SFDB file in a single streaming pass, no matter how many rules are applied. Entries
+    with a wrong number of values are always rejected, duplicates of earlier entries if remove_duplicates is set and
+    entries that fail the datatype check or a regular expression if reject_invalid is set. Rejected entries are
+    written to the rejects file, one line per entry with its line index, the reason and the original line separated
+    by tabs. Without a rejects file they are dropped.
+
+    Parameters:
+        sfdb_filepath (str): Path of the sfdb file to repair.
+        output_filepath (str): Path of the repaired sfdb file. Must differ from sfdb_filepath.
+        rejects_filepath (str): Path of the file for rejected entries.
+        remove_duplicates (bool): Whether to reject all but the first occurrence of entries.
+        reject_invalid (bool): Whether to reject entries that fail the datatype check or the column_patterns.
+        column_patterns (dict(str: Pattern)): Maps column names to regular expressions their values must match.
+        schema (SQLTableSchema): The schema for the datatype check. Defaults to the shared schema of the table.
+        chunk_size (int): The number of lines that are read and written at once.
+    Returns:
+        Counter: The number of rejected entries per reason.
+    """
+    reject_counts = Counter()
+    fingerprints = set()
+    with ExitStack() as stack:
+        sfdb_stream = stack.enter_context(open(sfdb_filepath, encoding='utf8'))
+        output_stream = stack.enter_context(open(output_filepath, mode='w', encoding='utf-8'))
+        rejects_stream = None
+        if rejects_filepath is not None:
+            rejects_stream = stack.enter_context(open(rejects_filepath, mode='w', encoding='utf-8'))
+
+        header_lines = read_sfdb_header(sfdb_stream, sfdb_filepath)
+        output_stream.writelines(f'{line}\n' for line in header_lines)
+        table_name, column_names = get_header_columns(header_lines)
+        datatype_rules, regex_rules = [], []
+        if reject_invalid:
+            schema = SQLTableSchema.get_shared(table_name) if schema is None else schema
+            datatype_rules = _get_datatype_rules(column_names, schema)
+            regex_rules = _get_regex_rules(column_names, column_patterns)
+
+        line_index = INDEX_SHIFT
+        for lines in iter_line_chunks(sfdb_stream, chunk_size):
+            reasons = _get_reject_reasons(lines, len(column_names), datatype_rules, regex_rules)
+            kept_lines = []
+            rejected_lines = []
+            for i, (line, reason) in enumerate(zip(lines, reasons)):
+                if reason is None and remove_duplicates:
+                    fingerprint = get_line_fingerprint(line)
+                    if fingerprint in fingerprints:
+                        reason = REJECT_DUPLICATE
+                    else:
+                        fingerprints.add(fingerprint)
+
+                if reason is None:
+                    kept_lines.append(f'{line}\n')
+                else:
+                    reject_counts[reason] += 1
+                    rejected_lines.append(f'{line_index + i}\t{reason}\t{line}\n')
+
+            output_stream.writelines(kept_lines)
+            if rejects_stream is not None:
+                rejects_stream.writelines(rejected_lines)
+            line_index += len(lines)
+
+    return reject_counts
+
+
+def _get_datatype_rules(column_names, schema):
+    """Returns triples of column index, schema column and datatype validator for all columns with a known datatype."""
+    if not schema.is_full_schema():
+        return []
+
+    datatype_rules = []
+    for j, column_name in enumerate(column_names):
+        validator = schema.get_datatype_validator(column_name) if column_name in schema.columns else None
+        if validator is not None:
+            datatype_rules.append((j, schema[column_name], validator))
+    return datatype_rules
+
+
+def _get_regex_rules(column_names, column_patterns):
+    """Returns pairs of column index and the regular expression the column's values must match."""
+    if not column_patterns:
+        return []
+
+    invalid_columns = [column for column in column_patterns if column not in column_names]
+    if invalid_columns:
+        raise ValueError(f'Can not check {invalid_columns} against regular expressions, as they are no columns!')
+    return [(column_names.index(column), pattern) for column, pattern in column_patterns.items()]
+
+
+def _get_reject_reasons(lines, column_count, datatype_rules, regex_rules):
+    """Determines for a chunk of lines why each of them has to be rejected. Returns a list with the reason or None for
+    every line. The rules are applied to whole columns of the chunk at once."""
+    entries = [line.split('\t') for line in lines]
+    reasons = [None if len(entry) == column_count else REJECT_WRONG_VALUE_COUNT for entry in entries]
+    if not datatype_rules and not regex_rules:
+        return reasons
+
+    i_well_formed = [i for i, reason in enumerate(reasons) if reason is None]
+    if not i_well_formed:
+        return reasons
+
+    table = np.array([entries[i] for i in i_well_formed])
+    is_datatype_mismatch = np.zeros(len(table), dtype=bool)
+    for j, column, validator in datatype_rules:
+        is_datatype_mismatch |= get_datatype_error_codes(table[:, j], column, validator) > 0
+
+    is_regex_mismatch = np.zeros(len(table), dtype=bool)
+    for j, pattern in regex_rules:
+        is_regex_mismatch |= ~vectorized_search(pattern, table[:, j])
+
+    for i, datatype_mismatch, regex_mismatch in zip(i_well_formed, is_datatype_mismatch, is_regex_mismatch):
+        if datatype_mismatch:
+            reasons[i] = REJECT_DATATYPE_MISMATCH
+        elif regex_mismatch:
+            reasons[i] = REJECT_REGEX_MISMATCH
+    return reasons
+
+
+def sort_sfdb_file(sfdb_filepath, output_filepath, sort_columns=None, remove_duplicates=False,
+                   memory_budget=DEFAULT_MEMORY_BUDGET):
+    """Writes a copy of an SFDB file with its entries sorted row-wise lexicographically by the values of sort_columns.
+    Split into values and parsed, the text of an sfdb takes about PARSED_SIZE_FACTOR times its size in memory. Files
+    whose parsed size exceeds memory_budget are sorted with an external merge sort: Chunks of the file whose parsed size
+    fits into the memory budget are sorted individually and spilled into temporary files, which are merged afterwards.
+
+    Parameters:
+        sfdb_filepath (str): Path of the sfdb file to sort.
+        output_filepath (str): Path of the sorted sfdb file. Must differ from sfdb_filepath.
+        sort_columns (list): Names of the columns to sort by, the most significant first. Defaults to all columns.
+        remove_duplicates (bool): Whether to only write the first occurrence of entries that occur multiple times.
+        memory_budget (int): The number of bytes of memory that the entries sorted at once may roughly take.
+    """
+    chunk_bytes = max(1, memory_budget // PARSED_SIZE_FACTOR)
+    if os.path.getsize(sfdb_filepath) <= chunk_bytes:
+        sfdb = SFDBContainer.from_file(sfdb_filepath, keep_lines=False)
+        sfdb.write_to_file(output_filepath, remove_duplicates=remove_duplicates, sort=True, sort_columns=sort_columns)
+        return
+
+    with ExitStack() as stack:
+        sfdb_stream = stack.enter_context(open(sfdb_filepath, encoding='utf8'))
+        spill_dir = stack.enter_context(tempfile.TemporaryDirectory())
+
+        header_lines = read_sfdb_header(sfdb_stream, sfdb_filepath)
+        column_indices = _get_column_indices(header_lines, sort_columns)
+
+        run_streams = []
+        for i, lines in enumerate(iter_line_chunks(sfdb_stream, chunk_bytes=chunk_bytes)):
+            run_filepath = _write_sorted_run(lines, column_indices, os.path.join(spill_dir, f'run_{i}.sfdb'))
+            run_streams.append(stack.enter_context(open(run_filepath, encoding='utf8')))
+
+        def sort_key(line):
+            return _get_sort_key(line, column_indices)
+
+        runs = [(line.rstrip('\n') for line in run_stream) for run_stream in run_streams]
+        sorted_lines = heapq.merge(*runs, key=sort_key)
+        if remove_duplicates:
+            sorted_lines = _unique_sorted_lines(sorted_lines, sort_key)
+
+        with open(output_filepath, mode='w', encoding='utf-8') as output_stream:
+            output_stream.writelines(f'{line}\n' for line in header_lines)
+            output_stream.writelines(f'{line}\n' for line in sorted_lines)
+
+
+def merge_sorted_sfdb_files(shard_filepaths, output_filepath, sort_columns=None, remove_duplicates=True,
+                            chunk_size=DEFAULT_CHUNK_SIZE):
+    """Merges SFDB files with identical headers, whose entries are each sorted by sort_columns, e.g. by
+    sort_sfdb_file, into a single sorted SFDB file. The shards are merged with a heap-based k-way merge, so only the
+    current entry of every shard is held in memory. To recognize duplicates, the distinct entries of the current group
+    of equal sort keys are remembered as well. Sorted by all columns a group holds one distinct entry, sorted by fewer
+    columns memory also grows with the number of distinct entries that share one sort key. The occurrences of the
+    dropped duplicates are collected for the returned ShardDuplicates, which can be logged with
+    sfdb_checks.log_shard_duplicates_check.
+
+    Parameters:
+        shard_filepaths (list): Paths of the sorted sfdb files.
+        output_filepath (str): Path of the merged sfdb file. Must differ from the shard filepaths.
+        sort_columns (list): Names of the columns the shards are sorted by, the most significant first. Defaults to all
+            columns.
+        remove_duplicates (bool): Whether to only write the first occurrence of entries that occur multiple times.
+        chunk_size (int): The number of lines that are read and written at once.
+    Returns:
+        list(ShardDuplicate): The entries of which duplicates were dropped, with the shard and line of every
+            occurrence, the kept one first. Entries that only occur multiple times within one shard are included, but
+            not flagged as across_shards.
+    """
+    with ExitStack() as stack:
+        shard_streams = [stack.enter_context(open(filepath, encoding='utf8')) for filepath in shard_filepaths]
+        shard_headers = [read_sfdb_header(stream, filepath) for stream, filepath in zip(shard_streams, shard_filepaths)]
+        if not shard_headers:
+            raise ValueError('You can not merge an empty sequence of sfdb files!')
+        if any(header_lines != shard_headers[0] for header_lines in shard_headers):
+            raise ValueError('You can not merge sfdb files with different headers!')
+
+        column_indices = _get_column_indices(shard_headers[0], sort_columns)
+
+        def sort_key(line):
+            return _get_sort_key(line, column_indices)
+
+        shards = [_iter_sorted_lines(stream, filepath, sort_key, chunk_size)
+                  for stream, filepath in zip(shard_streams, shard_filepaths)]
+        merged_lines = heapq.merge(*shards, key=lambda shard_line: sort_key(shard_line[0]))
+
+        duplicates = []
+        with open(output_filepath, mode='w', encoding='utf-8') as output_stream:
+            output_stream.writelines(f'{line}\n' for line in shard_headers[0])
+
+            kept_lines = []
+            output_line_index = INDEX_SHIFT
+            group_key = None
+            # Maps each line of the current group of equal sort keys to its output line index and its occurrences
+            group_occurrences = {}
+            for line, filepath, line_index in merged_lines:
+                if remove_duplicates:
+                    key = sort_key(line)
+                    if key != group_key:
+                        duplicates.extend(_get_group_duplicates(group_occurrences))
+                        group_key = key
+                        group_occurrences = {}
+
+                    if line in group_occurrences:
+                        group_occurrences[line][1].append((filepath, line_index))
+                        continue
+                    group_occurrences[line] = (output_line_index, [(filepath, line_index)])
+
+                kept_lines.append(f'{line}\n')
+                output_line_index += 1
+                if len(kept_lines) >= chunk_size:
+                    output_stream.writelines(kept_lines)
+                    kept_lines = []
+
+            output_stream.writelines(kept_lines)
+            duplicates.extend(_get_group_duplicates(group_occurrences))
+
+    return duplicates
+
+
+def _iter_sorted_lines(sfdb_stream, filepath, sort_key, chunk_size):
+    """Yields the lines of an sfdb stream together with the filepath and their (human) line index, while making sure
+    that they are sorted."""
+    previous_key = None
+    line_index = INDEX_SHIFT
+    for lines in iter_line_chunks(sfdb_stream, chunk_size):
+        for line in lines:
+            key = sort_key(line)
+            if previous_key is not None and key < previous_key:
+                raise ValueError(f'{filepath} is not sorted! \'{line}\' follows an entry with a larger sort key.')
+            previous_key = key
+            yield line, filepath, line_index
+            line_index += 1
+
+
+def _get_group_duplicates(group_occurrences):
+    """Returns the duplicates among the lines of a group as ShardDuplicates."""
+    return [ShardDuplicate(np.array(line.split('\t')), occurrences, output_line_index,
+                           len({filepath for filepath, _ in occurrences}) > 1)
+            for line, (output_line_index, occurrences) in group_occurrences.items() if len(occurrences) > 1]
+
+
+def split_sfdb_file(sfdb_filepath, rows_per_file=None, bytes_per_file=None, key_columns=None, file_count=None,
+                    output_prefix=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Splits an SFDB file in a single streaming pass into several SFDB files, each with a copy of the header. Exactly
+    one way of partitioning must be chosen: Consecutive entries are filled into files of at most rows_per_file entries
+    or of at most bytes_per_file bytes of entries, or entries are distributed over file_count files by a hash of the
+    values in key_columns, so that entries with the same key always end up in the same file.
+
+    Parameters:
+        sfdb_filepath (str): Path of the sfdb file to split.
+        rows_per_file (int): The maximum number of entries per file.
+        bytes_per_file (int): The maximum number of bytes of entries per file. Single larger entries get a file of their
+            own.
+        key_columns (list): Names of the columns whose values determine the file of an entry.
+        file_count (int): The number of files to distribute the entries over by key.
+        output_prefix (str): The output files are named <output_prefix>_<number>.sfdb. Defaults to the sfdb filepath
+            without extension followed by '_part'.
+        chunk_size (int): The number of lines that are read at once.
+    Returns:
+        list: The filepaths of the written sfdb files.
+    """
+    if sum(argument is not None for argument in (rows_per_file, bytes_per_file, key_columns)) != 1:
+        raise ValueError('An sfdb file must be split either by rows_per_file, bytes_per_file or key_columns!')
+    if any(limit is not None and limit < 1 for limit in (rows_per_file, bytes_per_file)):
+        raise ValueError('An sfdb file can only be split by a rows_per_file or bytes_per_file of at least 1!')
+    if key_columns is not None and (file_count is None or file_count < 1):
+        raise ValueError('Splitting an sfdb file by key_columns requires a file_count of at least 1!')
+
+    output_prefix = f'{sfdb_filepath[:-5]}_part' if output_prefix is None else output_prefix
+    with open(sfdb_filepath, encoding='utf8') as sfdb_stream:
+        header_lines = read_sfdb_header(sfdb_stream, sfdb_filepath)
+        lines = (line for chunk in iter_line_chunks(sfdb_stream, chunk_size) for line in chunk)
+        if key_columns is not None:
+            column_indices = _get_column_indices(header_lines, key_columns)
+            return _split_by_key(lines, header_lines, output_prefix, column_indices, file_count, chunk_size)
+        return _split_consecutively(lines, header_lines, output_prefix, rows_per_file, bytes_per_file)
+
+
+def _split_consecutively(lines, header_lines, output_prefix, rows_per_file, bytes_per_file):
+    """Writes consecutive lines into a new file whenever the current file reached its maximum number of rows or bytes.
+    Only one output file is open at a time."""
+    output_filepaths = []
+    output_stream = None
+    row_count = 0
+    byte_count = 0
+    try:
+        for line in lines:
+            line = f'{line}\n'
+            line_size = len(line.encode('utf-8')) if bytes_per_file is not None else 0
+            is_file_full = (row_count >= rows_per_file if rows_per_file is not None else
+                            byte_count > 0 and byte_count + line_size > bytes_per_file)
+            if output_stream is None or is_file_full:
+                if output_stream is not None:
+                    output_stream.close()
+                output_stream = _open_split_file(output_prefix, len(output_filepaths), header_lines)
+                output_filepaths.append(output_stream.name)
+                row_count = 0
+                byte_count = 0
+
+            output_stream.write(line)
+            row_count += 1
+            byte_count += line_size
+
+        if output_stream is None:  # An sfdb without entries still results in a file
+            output_stream = _open_split_file(output_prefix, 0, header_lines)
+            output_filepaths.append(output_stream.name)
+    finally:
+        if output_stream is not None:
+            output_stream.close()
+
+    return output_filepaths
+
+
+def _split_by_key(lines, header_lines, output_prefix, column_indices, file_count, chunk_size):
+    """Distributes lines over file_count files by the crc32 hash of their key values, which unlike hash() is the same
+    in every run. All output files are open at the same time."""
+    with ExitStack() as stack:
+        output_streams = [stack.enter_context(_open_split_file(output_prefix, i, header_lines))
+                          for i in range(file_count)]
+        buckets = [[] for _ in range(file_count)]
+        for i, line in enumerate(lines, 1):
+            key = '\t'.join(_get_sort_key(line, column_indices))
+            buckets[zlib.crc32(key.encode('utf-8')) % file_count].append(f'{line}\n')
+
+            if i % chunk_size == 0:
+                _flush_buckets(buckets, output_streams)
+        _flush_buckets(buckets, output_streams)
+
+        return [output_stream.name for output_stream in output_streams]
+
+
+def _open_split_file(output_prefix, file_index, header_lines):
+    """Opens the output file with the given index of a split and writes the sfdb header to it."""
+    output_stream = open(f'{output_prefix}_{file_index + 1}.sfdb', mode='w', encoding='utf-8')
+    output_stream.writelines(f'{line}\n' for line in header_lines)
+    return output_stream
+
+
+def _flush_buckets(buckets, output_streams):
+    """Writes the buffered lines of each bucket to its output stream and empties the buckets."""
+    for bucket, output_stream in zip(buckets, output_streams):
+        output_stream.writelines(bucket)
+        bucket.clear()
+
+
+def _get_column_indices(header_lines, column_names_to_find):
+    """Returns the indices of the columns with the given names in an sfdb header. Defaults to all columns."""
+    return SFDBHeader(header_lines).get_column_indices(column_names_to_find)
+
+
+def _get_sort_key(line, column_indices):
+    """Returns the values of a line that it is sorted by. Missing values count as empty, like in get_sort_order."""
+    values = line.split('\t')
+    return tuple(values[j] if j < len(values) else '' for j in column_indices)
+
+
+def _write_sorted_run(lines, column_indices, run_filepath):
+    """Sorts a chunk of lines with np.lexsort and writes them to a spill file."""
+    entries = [line.split('\t') for line in lines]
+    with open(run_filepath, mode='w', encoding='utf-8') as run_stream:
+        run_stream.writelines(f'{lines[i]}\n' for i in get_sort_order(entries, column_indices))
+    return run_filepath
+
+
+def _unique_sorted_lines(sorted_lines, sort_key):
+    """Skips lines that already occurred. As identical lines have the same sort key, only the lines of the current
+    group of equal sort keys have to be remembered."""
+    group_key = None
+    group_lines = set()
+    for line in sorted_lines:
+        key = sort_key(line)
+        if key != group_key:
+            group_key = key
+            group_lines = set()
+
+        if line not in group_lines:
+            group_lines.add(line)
+            yield line
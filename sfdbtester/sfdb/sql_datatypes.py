@@ -0,0 +1,310 @@
+"""This module contains validators that check whole columns of SFDB values against an SQL datatype at once. Each
+validator works on a numpy array of strings and returns a boolean array that is True for every value that an SQL table
+with that datatype would accept. Where possible the values are inspected as a grid of unicode code points with numpy
+operations instead of matching a regular expression against each value individually.
+
+Empty values represent NULL in an SFDB. Whether NULL is allowed is not a property of the datatype, thus validators
+consider empty values invalid and leave it to the caller to decide about them."""
+import re
+
+import numpy as np
+
+from sfdbtester.common.utilities import vectorized_search
+
+INTEGER_RANGES = {'tinyint': (0, 255),
+                  'smallint': (-2**15, 2**15 - 1),
+                  'bigint': (-2**63, 2**63 - 1)}
+INTEGER_DATATYPES = ('bit', 'bool', 'tinyint', 'smallint', 'int', 'bigint')
+CHARACTER_TYPES = ('char', 'varchar', 'nchar', 'nvarchar')
+DATETIME_RANGES = {'date': ('0001-01-01', '9999-12-31'),
+                   'datetime': ('1753-01-01', '9999-12-31'),
+                   'datetime2': ('0001-01-01', '9999-12-31'),
+                   'smalldatetime': ('1900-01-01', '2079-06-06')}
+
+DATATYPE_PATTERN = re.compile(r'^\s*(\w+)\s*(?:\(\s*(\w+)\s*(?:,\s*(\d+)\s*)?\))?\s*$')
+FLOAT_PATTERN = re.compile(r'^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$')
+TIME_PATTERN = re.compile(r'^([01]\d|2[0-3]):[0-5]\d(:[0-5]\d(\.\d{1,7})?)?$')
+
+_ZERO, _NINE, _MINUS, _DOT = ord('0'), ord('9'), ord('-'), ord('.')
+_GUID_DASH_POSITIONS = (8, 13, 18, 23)
+_DATE_DIGIT_POSITIONS = (0, 1, 2, 3, 5, 6, 8, 9)
+_DATE_DASH_POSITIONS = (4, 7)
+_DATE_LENGTH = 10
+
+
+class DatatypeValidator:
+    """Checks arrays of values against an SQL datatype.
+
+    Parameters:
+        pattern (str): A human-readable description of the values the validator accepts. Used in error messages.
+        is_valid (function): Takes a numpy array of strings and returns a boolean array.
+        uses_length (bool): Whether the length of the schema's column limits the number of characters of a value.
+        value_range (tuple): The (min_value, max_value) of an integer datatype, see validate_numbers.
+        max_digits (int): If set, only unsigned integers with at most this many digits are valid.
+    """
+    __slots__ = ('pattern', '_is_valid', 'uses_length', 'value_range', 'max_digits')
+
+    def __init__(self, pattern, is_valid, uses_length=False, value_range=None, max_digits=None):
+        self.pattern = pattern
+        self._is_valid = is_valid
+        self.uses_length = uses_length
+        self.value_range = value_range
+        self.max_digits = max_digits
+
+    def __call__(self, values):
+        """Returns a boolean array that is True wherever a value is valid for the datatype."""
+        values = np.asarray(values, dtype=str)
+        if len(values) == 0:
+            return np.zeros(0, dtype=bool)
+        return self._is_valid(values)
+
+    def validate_numbers(self, numbers, is_integer, values=None):
+        """Checks already converted integers, e.g. a cached typed column of an SFDBContainer, against the value range of
+        an integer datatype. Returns a boolean array that is True wherever a value is valid for the datatype. If the
+        validator limits the digits, the original values are required, as the conversion drops signs and leading
+        zeros."""
+        if self.value_range is None:
+            raise ValueError(f'{self} does not validate numbers!')
+        if self.max_digits is not None and values is None:
+            raise ValueError(f'{self} requires the values to validate numbers!')
+
+        min_value, max_value = self.value_range
+        is_valid = is_integer & (numbers >= min_value) & (numbers <= max_value)
+        if self.max_digits is not None:
+            values = np.asarray(values, dtype=str)
+            is_valid &= (np.char.str_len(values) <= self.max_digits) & ~np.char.startswith(values, '-')
+        return is_valid
+
+    def __repr__(self):
+        return f'DatatypeValidator(\'{self.pattern}\')'
+
+    @classmethod
+    def from_regex(cls, regex_pattern, uses_length=True, value_range=None, max_digits=None):
+        """Creates a validator that accepts all values in which the regular expression can be found. If the regular
+        expression describes unsigned integers, their value_range and max_digits allow to validate already converted
+        integers instead."""
+        return cls(regex_pattern.pattern, lambda values: vectorized_search(regex_pattern, values), uses_length,
+                   value_range, max_digits)
+
+
+def get_datatype_validator(datatype, length, min_value=None, max_value=None):
+    """Creates a validator for an SQL datatype. Covers bigint, smallint, tinyint, decimal/numeric(p,s), float, real,
+    char, varchar, nchar, date, datetime, datetime2, smalldatetime, time and uniqueidentifier. Precision and scale of
+    decimals can be given in the datatype, e.g. 'decimal(10,2)', and default to (18,0). Dates must lie within
+    [min_value, max_value], which default to the range the SQL datatype supports.
+
+    Parameters:
+        datatype (str): The SQL datatype, optionally with parameters.
+        length (int): The length of the column as defined in the schema.
+        min_value (str): The earliest allowed date in the form yyyy-mm-dd. Only used by date datatypes.
+        max_value (str): The latest allowed date in the form yyyy-mm-dd. Only used by date datatypes.
+    Returns:
+        DatatypeValidator: The validator of the datatype.
+        None: If the datatype is not covered by this function.
+    """
+    match = DATATYPE_PATTERN.match(datatype.lower())
+    if match is None:
+        return None
+
+    base_type, parameter1, parameter2 = match.groups()
+    if base_type in INTEGER_RANGES:
+        min_value, max_value = INTEGER_RANGES[base_type]
+        return DatatypeValidator(f'{base_type} [{min_value}, {max_value}]', _integer_validation(min_value, max_value),
+                                 value_range=(min_value, max_value))
+
+    elif base_type in ('decimal', 'numeric'):
+        precision = 18 if parameter1 is None else int(parameter1)
+        scale = 0 if parameter2 is None else int(parameter2)
+        return DatatypeValidator(f'{base_type}({precision},{scale})', _decimal_validation(precision, scale))
+
+    elif base_type in ('float', 'real'):
+        return DatatypeValidator.from_regex(FLOAT_PATTERN, uses_length=False)
+
+    elif base_type in CHARACTER_TYPES:
+        max_length = length if parameter1 is None or not parameter1.isdigit() else int(parameter1)
+        return DatatypeValidator(r'^.{0,' + str(max_length) + '}$',
+                                 lambda values: np.char.str_len(values) <= max_length, uses_length=True)
+
+    elif base_type in DATETIME_RANGES:
+        default_min_value, default_max_value = DATETIME_RANGES[base_type]
+        min_date = np.datetime64(min_value or default_min_value, 'D')
+        max_date = np.datetime64(max_value or default_max_value, 'D')
+        return DatatypeValidator(f'{base_type} [{min_date}, {max_date}]', _date_validation(min_date, max_date))
+
+    elif base_type == 'time':
+        return DatatypeValidator.from_regex(TIME_PATTERN, uses_length=False)
+
+    elif base_type == 'uniqueidentifier':
+        return DatatypeValidator('xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx', _is_uniqueidentifier)
+
+    return None
+
+
+def _code_point_grid(values):
+    """Returns the unicode code points of an array of strings as 2 dimensional array with one row per value and the
+    number of characters of each value. Shorter values are padded with 0."""
+    values = np.ascontiguousarray(values)
+    grid = values.view(np.uint32).reshape(len(values), values.dtype.itemsize // 4)
+    return grid, np.char.str_len(values)
+
+
+def to_int64(values):
+    """Converts an array of strings into integers. The conversion is masked: Values that are no integers or do not fit
+    into an int64 are set to 0 and marked as invalid instead of failing the whole conversion.
+
+    Parameters:
+        values (np.ndarray): Array of strings.
+    Returns:
+        np.ndarray: Array of int64, the integer of each value or 0.
+        np.ndarray: Boolean array that is True wherever a value is a valid integer.
+    """
+    values = np.asarray(values, dtype=str)
+    numbers = np.zeros(len(values), dtype=np.int64)
+    if len(values) == 0:
+        return numbers, np.zeros(0, dtype=bool)
+
+    grid, lengths = _code_point_grid(values)
+    has_sign = grid[:, 0] == _MINUS
+    is_digit = (grid >= _ZERO) & (grid <= _NINE)
+    is_padding = np.arange(grid.shape[1]) >= lengths[:, np.newaxis]
+    is_sign = np.zeros_like(is_digit)
+    is_sign[:, 0] = has_sign
+    digit_count = lengths - has_sign
+    is_integer = np.all(is_digit | is_padding | is_sign, axis=1) & (digit_count > 0)
+
+    is_short = is_integer & (digit_count <= 18)  # Can safely be converted to int64
+    numbers[is_short] = values[is_short].astype(np.int64)
+
+    for i in np.flatnonzero(is_integer & (digit_count > 18)):
+        number = int(values[i])
+        is_integer[i] = -2**63 <= number <= 2**63 - 1
+        numbers[i] = number if is_integer[i] else 0
+    return numbers, is_integer
+
+
+def _integer_validation(min_value, max_value):
+    """Creates a function that checks whether values are integers within [min_value, max_value]."""
+    def is_valid(values):
+        numbers, is_integer = to_int64(values)
+        return is_integer & (numbers >= min_value) & (numbers <= max_value)
+
+    return is_valid
+
+
+def to_decimal_digits(values):
+    """Determines for an array of strings whether each value is a decimal number and how many digits it has before
+    and after the decimal point.
+
+    Parameters:
+        values (np.ndarray): Array of strings.
+    Returns:
+        np.ndarray: Number of digits before the decimal point of each value.
+        np.ndarray: Number of digits after the decimal point of each value.
+        np.ndarray: Boolean array that is True wherever a value is a decimal number.
+    """
+    values = np.asarray(values, dtype=str)
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+
+    grid, lengths = _code_point_grid(values)
+    has_sign = grid[:, 0] == _MINUS
+    is_digit = (grid >= _ZERO) & (grid <= _NINE)
+    is_dot = grid == _DOT
+    is_padding = np.arange(grid.shape[1]) >= lengths[:, np.newaxis]
+    is_sign = np.zeros_like(is_digit)
+    is_sign[:, 0] = has_sign
+
+    dot_count = np.count_nonzero(is_dot, axis=1)
+    dot_position = np.where(dot_count > 0, np.argmax(is_dot, axis=1), lengths)
+    integer_digits = dot_position - has_sign
+    fraction_digits = np.where(dot_count > 0, lengths - dot_position - 1, 0)
+
+    is_decimal = (np.all(is_digit | is_dot | is_padding | is_sign, axis=1) &
+                  (dot_count <= 1) &
+                  (integer_digits + fraction_digits > 0))
+    return integer_digits, fraction_digits, is_decimal
+
+
+def _decimal_validation(precision, scale):
+    """Creates a function that checks whether values are decimal numbers with at most precision - scale digits before
+    and scale digits after the decimal point."""
+    def is_valid(values):
+        integer_digits, fraction_digits, is_decimal = to_decimal_digits(values)
+        return is_decimal & (integer_digits <= precision - scale) & (fraction_digits <= scale)
+
+    return is_valid
+
+
+def to_datetime64(values):
+    """Converts an array of strings in the form yyyy-mm-dd, optionally followed by a time separated by ' ' or 'T', into
+    an array of dates. The conversion is masked: Values that are no valid dates of the gregorian calendar, such as
+    2019-02-29, or that have an invalid time become NaT instead of failing the whole conversion.
+
+    Parameters:
+        values (np.ndarray): Array of strings.
+    Returns:
+        np.ndarray: Array of datetime64[D], the date of each value or NaT.
+    """
+    values = np.asarray(values, dtype=str)
+    dates = np.full(len(values), np.datetime64('NaT'), dtype='datetime64[D]')
+    if len(values) == 0 or values.dtype.itemsize // 4 < _DATE_LENGTH:
+        return dates
+
+    grid, lengths = _code_point_grid(values)
+    digits = grid[:, _DATE_DIGIT_POSITIONS].astype(np.int64) - _ZERO
+    is_well_formed = (np.all((digits >= 0) & (digits <= 9), axis=1) &
+                      np.all(grid[:, _DATE_DASH_POSITIONS] == _MINUS, axis=1) &
+                      (lengths >= _DATE_LENGTH))
+    is_well_formed[is_well_formed] = _has_valid_time(values[is_well_formed])
+
+    digits = digits[is_well_formed]
+    year = digits[:, :4] @ np.array([1000, 100, 10, 1])
+    month = digits[:, 4:6] @ np.array([10, 1])
+    day = digits[:, 6:] @ np.array([10, 1])
+
+    month_start = ((year - 1970) * 12 + np.clip(month, 1, 12) - 1).astype('datetime64[M]')
+    day_of_month = month_start.astype('datetime64[D]') + (np.clip(day, 1, 31) - 1)
+    is_in_calendar = ((month >= 1) & (month <= 12) & (day >= 1) &
+                      (day_of_month.astype('datetime64[M]') == month_start))  # Day does not overflow into next month
+
+    i_dates = np.flatnonzero(is_well_formed)[is_in_calendar]
+    dates[i_dates] = day_of_month[is_in_calendar]
+    return dates
+
+
+def _has_valid_time(values):
+    """Checks for values that start with a date whether they either end after it or continue with a valid time."""
+    grid, lengths = _code_point_grid(values)
+    has_time = lengths > _DATE_LENGTH
+    is_valid = ~has_time
+    if not np.any(has_time) or grid.shape[1] <= _DATE_LENGTH + 1:
+        return is_valid
+
+    time_grid = np.ascontiguousarray(grid[has_time, _DATE_LENGTH + 1:])
+    times = time_grid.view(f'<U{time_grid.shape[1]}').ravel()
+    is_separator = np.isin(grid[has_time, _DATE_LENGTH], (ord(' '), ord('T')))
+    is_valid[has_time] = is_separator & vectorized_search(TIME_PATTERN, times)
+    return is_valid
+
+
+def _date_validation(min_date, max_date):
+    """Creates a function that checks whether values are valid dates within [min_date, max_date]."""
+    def is_valid(values):
+        dates = to_datetime64(values)
+        return ~np.isnat(dates) & (dates >= min_date) & (dates <= max_date)
+
+    return is_valid
+
+
+def _is_uniqueidentifier(values):
+    """Checks whether values are GUIDs in the form xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx with hexadecimal digits x."""
+    grid, lengths = _code_point_grid(values)
+    if grid.shape[1] < 36:
+        return np.zeros(len(values), dtype=bool)
+
+    grid = grid[:, :36]
+    lower_grid = grid | 0x20  # Maps upper case letters onto lower case ones
+    is_hex = ((grid >= _ZERO) & (grid <= _NINE)) | ((lower_grid >= ord('a')) & (lower_grid <= ord('f')))
+    is_dash_position = np.isin(np.arange(36), _GUID_DASH_POSITIONS)
+    is_correct_char = np.where(is_dash_position, grid == _MINUS, is_hex)
+    return (lengths == 36) & np.all(is_correct_char, axis=1)
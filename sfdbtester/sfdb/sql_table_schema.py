@@ -1,10 +1,20 @@
 """This module defines the requirements an SQL Table, that already exists, has of the SFDB. The already existing tables
 need to be manually recorded in the sfdb_schemas.json resource. If there is no existing SQL table, then the
-SQLTableSchema is mostly pointless."""
+SQLTableSchema is mostly pointless.
+
+Large catalogs of table schemas can be converted into a schema store with convert_schema_file_to_store, so that looking
+up a table only reads the schema of that one table."""
+import os
 import re
 import json
+import threading
 from collections import namedtuple
+from types import MappingProxyType
 from sfdbtester.common.utilities import get_resource_filepath
+from sfdbtester.sfdb.sql_datatypes import DATETIME_RANGES, DatatypeValidator, get_datatype_validator
+
+
+SCHEMA_STORE_MANIFEST = 'manifest.json'
 
 
 class ColumnError(Exception):
@@ -15,13 +25,38 @@ class SQLTableSchema:
     """Part of an SFDB object. Defines the datatypes of the individual columns of an sfdb and the associated conditions
     entries need to fulfill. Datatypes are SQL datatypes. All already known/defined Tables are written in the
     sfdb_schemas.json resource. These defined requirements can then be used by checks to see whether all entries in
-    the SFDB fulfill them."""
+    the SFDB fulfill them.
+
+    The schemas of the sfdb_schemas.json resource are held by the process-wide schema_registry. SQLTableSchema(name)
+    creates a new, modifiable schema object, while SQLTableSchema.get_shared(name) hands out the immutable instance of
+    the registry that all SFDBContainers share."""
     sfdb_schema_file = get_resource_filepath('sfdb_schemas.json')
 
     def __init__(self, sql_table_name):
+        self._frozen = False
         self.table_name = sql_table_name
         self.column_properties = self._get_column_properties()
 
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f'The shared SQLTableSchema of {self.table_name} is immutable!')
+        super().__setattr__(name, value)
+
+    @classmethod
+    def _from_column_properties(cls, sql_table_name, column_properties, frozen=False):
+        """Creates a schema with the given column properties without looking them up in the schema_registry"""
+        schema = cls.__new__(cls)
+        schema._frozen = False
+        schema.table_name = sql_table_name
+        schema.column_properties = column_properties
+        schema._frozen = frozen
+        return schema
+
+    @classmethod
+    def get_shared(cls, sql_table_name):
+        """Returns the immutable, shared schema of a table from the schema_registry"""
+        return schema_registry.get_schema(sql_table_name)
+
     @property
     def columns(self):
         """Returns a list of all columns in this sql_table_scheme"""
@@ -47,40 +82,12 @@ class SQLTableSchema:
         input if available.
 
         Returns:
-            list: A list of tuples (ColumnName (string), Datatype (string),
-                    Length (int), IsNullAllowed (bool))
+            dict: A copy of the registry's mapping of column names to Column tuples (ColumnName (string), Datatype
+                    (string), Length (int), IsNullAllowed (bool)), which the schema may modify.
             None: When users SQL column definitions are not already known to the
                     program (Other)"""
-        known_sfdb_schemas = SQLTableSchema._get_known_sfdb_schemas()
-        if self.table_name in known_sfdb_schemas:
-            this_schema = known_sfdb_schemas[self.table_name]
-
-            for column_name, column in this_schema.items():
-                if column.datatype == 'datetime' or column.datatype == 'datetime2':
-                    this_schema[column_name] = Column(column.name, column.datatype, 10, column.with_null)
-
-            return this_schema
-
-        return None
-
-    @classmethod
-    def _get_known_sfdb_schemas(cls):
-
-        """Reads in the SFDB schemas of all known tables provided by the sfdb_schemas.json resource and returns them as
-        dictionary"""
-        with open(cls.sfdb_schema_file, mode='r') as schema_file:
-            sfdb_schemas_json = json.load(schema_file)
-
-        schemas_dict = {}
-        for table_name, table_columns in sfdb_schemas_json.items():
-            column_properties = {}
-
-            for col in table_columns:
-                column = Column(col['column_name'], col['datatype'], col['length'], col['with_null'])
-                column_properties[col['column_name']] = column
-
-            schemas_dict[table_name] = column_properties
-        return schemas_dict
+        column_properties = schema_registry.get_column_properties(self.table_name)
+        return None if column_properties is None else dict(column_properties)
 
     def is_full_schema(self):
         """Checks whether the schema actually defines any columns"""
@@ -117,5 +124,188 @@ class SQLTableSchema:
 
         return re.compile(regex_string, re.IGNORECASE) if regex_string else regex_string
 
+    def get_datatype_validator(self, column_name):
+        """Generates a DatatypeValidator that checks whole arrays of column entries against the column's SQL datatype.
+        Datatypes covered by get_datatype_regex_pattern are validated with their regular expression, all others by the
+        validators of the sql_datatypes module. Validators of int, bit and bool columns also have the value range and
+        the number of digits their regular expression allows, so that typed columns can be validated without it. Date
+        datatypes are always validated against the calendar and the column's min_value and max_value.
+
+        Parameters:
+            column_name (string): The name of the sfdb column for which the validator is generated
+
+        Returns:
+            DatatypeValidator: Validator of the column's datatype.
+            None: When the SQL datatype is not known.
+        """
+        regex_pattern = self.get_datatype_regex_pattern(column_name)
+        column = self.column_properties[column_name]
+        if regex_pattern is not None and column.datatype.lower() not in DATETIME_RANGES:
+            value_range, max_digits = _get_integer_limits(column.datatype.lower(), column.length)
+            return DatatypeValidator.from_regex(regex_pattern, value_range=value_range, max_digits=max_digits)
+
+        return get_datatype_validator(column.datatype, column.length, column.min_value, column.max_value)
+
+
+def _get_integer_limits(datatype, length):
+    """Returns the value range and the maximum number of digits of the unsigned integers the regular expression of an
+    integer datatype allows, see SQLTableSchema.get_datatype_regex_pattern. (None, None) for all other datatypes and for
+    int columns whose values may not fit into an int64."""
+    if datatype == 'int' and length <= 18:
+        return (0, 10 ** length - 1), length
+    elif datatype in ('bit', 'bool'):
+        return (0, 1), 1
+    return None, None
+
+
+# min_value and max_value optionally restrict the range of values of a column
+Column = namedtuple('Column', ['name', 'datatype', 'length', 'with_null', 'min_value', 'max_value'],
+                    defaults=(None, None))
+
+
+class SchemaRegistry:
+    """Process-wide store of the SQL table schemas of a schema file. The file is only parsed once and reloaded when its
+    modification time changes. The column properties of every table are handed out as read-only mappings and the
+    SQLTableSchema objects it creates are immutable, so they can be shared by any number of SFDBContainers.
+
+    Instead of a single schema file, the registry can also be given the directory of a schema store (see
+    convert_schema_file_to_store). Then only the store's manifest is parsed upfront and the schema of a table is read
+    from its own file the first time it is requested. Changes are detected via the modification time of the manifest."""
+    def __init__(self, schema_file):
+        self.schema_file = schema_file
+        self._mtime = None
+        self._manifest = None
+        self._column_properties = {}
+        self._schemas = {}
+        self._lock = threading.Lock()
+
+    def open(self, schema_file):
+        """Switches the registry to another schema file or schema store directory"""
+        with self._lock:
+            self.schema_file = schema_file
+            self._mtime = None
+
+    def get_column_properties(self, table_name):
+        """Returns a read-only mapping of column names to Column tuples of a table or None if the table is unknown."""
+        self._refresh()
+        with self._lock:
+            return self._get_column_properties(table_name)
+
+    def get_schema(self, table_name):
+        """Returns the immutable, shared SQLTableSchema of a table. Unknown tables receive a schema without columns."""
+        self._refresh()
+        with self._lock:
+            schema = self._schemas.get(table_name)
+            if schema is None:
+                column_properties = self._get_column_properties(table_name)
+                schema = SQLTableSchema._from_column_properties(table_name, column_properties, frozen=True)
+                self._schemas[table_name] = schema
+        return schema
+
+    def _get_column_properties(self, table_name):
+        """Returns the column properties of a table. Reads them from the schema store if they are not loaded yet. Must
+        only be called while holding the lock."""
+        if table_name in self._column_properties or self._manifest is None:
+            return self._column_properties.get(table_name)
+
+        table_filename = self._manifest.get(table_name)
+        if table_filename is None:
+            return None
+
+        with open(os.path.join(self.schema_file, table_filename), mode='r') as table_stream:
+            table_columns = json.load(table_stream)
+
+        column_properties = MappingProxyType(_parse_table_columns(table_columns))
+        self._column_properties[table_name] = column_properties
+        return column_properties
+
+    def _refresh(self):
+        """Parses the schema file or the manifest of the schema store if it has not been parsed yet or was modified
+        since then."""
+        is_schema_store = os.path.isdir(self.schema_file)
+        changed_file = os.path.join(self.schema_file, SCHEMA_STORE_MANIFEST) if is_schema_store else self.schema_file
+        mtime = os.stat(changed_file).st_mtime_ns
+        if mtime == self._mtime:
+            return
+
+        with self._lock:
+            if mtime == self._mtime:
+                return
+
+            if is_schema_store:
+                with open(changed_file, mode='r') as manifest_stream:
+                    self._manifest = json.load(manifest_stream)['tables']
+                self._column_properties = {}
+            else:
+                sfdb_schemas = _read_sfdb_schemas(self.schema_file)
+                self._manifest = None
+                self._column_properties = {table_name: MappingProxyType(column_properties)
+                                           for table_name, column_properties in sfdb_schemas.items()}
+            self._schemas = {}
+            self._mtime = mtime
+
+
+def convert_schema_file_to_store(schema_file, store_dir):
+    """Converts a schema file in the format of sfdb_schemas.json into a schema store. The store is a directory with one
+    JSON file per table, which contains the list of that table's column definitions, and a manifest that maps the
+    table names to their files. The manifest is written last, so a registry never sees a half-written store.
+
+    Parameters:
+        schema_file (str): Path to the schema file.
+        store_dir (str): Path to the directory of the schema store. Is created if it does not exist.
+    Returns:
+        str: The path of the store's manifest.
+    """
+    with open(schema_file, mode='r') as schema_stream:
+        sfdb_schemas_json = json.load(schema_stream)
+
+    os.makedirs(store_dir, exist_ok=True)
+    manifest = {}
+    for table_name, table_columns in sfdb_schemas_json.items():
+        table_filename = _get_table_filename(table_name, manifest.values())
+        with open(os.path.join(store_dir, table_filename), mode='w') as table_stream:
+            json.dump(table_columns, table_stream, indent=4)
+        manifest[table_name] = table_filename
+
+    manifest_path = os.path.join(store_dir, SCHEMA_STORE_MANIFEST)
+    temp_manifest_path = f'{manifest_path}.tmp'
+    with open(temp_manifest_path, mode='w') as manifest_stream:
+        json.dump({'tables': manifest}, manifest_stream, indent=4)
+    os.replace(temp_manifest_path, manifest_path)
+
+    return manifest_path
+
+
+def _get_table_filename(table_name, used_filenames):
+    """Returns a filename for the schema of a table that is safe to use on any filesystem and not used yet."""
+    used_filenames = set(used_filenames)
+    base_name = re.sub(r'[^\w.-]', '_', table_name)
+    table_filename = f'{base_name}.json'
+    i = 1
+    while table_filename.lower() in {filename.lower() for filename in used_filenames}:
+        table_filename = f'{base_name}_{i}.json'
+        i += 1
+    return table_filename
+
+
+def _read_sfdb_schemas(schema_file):
+    """Reads in the SFDB schemas of all tables provided by a schema file and returns them as dictionary."""
+    with open(schema_file, mode='r') as schema_stream:
+        sfdb_schemas_json = json.load(schema_stream)
+
+    return {table_name: _parse_table_columns(table_columns) for table_name, table_columns in sfdb_schemas_json.items()}
+
+
+def _parse_table_columns(table_columns):
+    """Turns the list of column definitions of a table into a dictionary mapping column names to Column tuples.
+    Datetime columns always have a length of 10 (yyyy-mm-dd). The range rules min_value and max_value are optional."""
+    column_properties = {}
+    for col in table_columns:
+        length = 10 if col['datatype'] in ('datetime', 'datetime2') else col['length']
+        column = Column(col['column_name'], col['datatype'], length, col['with_null'],
+                        col.get('min_value'), col.get('max_value'))
+        column_properties[col['column_name']] = column
+    return column_properties
+
 
-Column = namedtuple('Column', ['name', 'datatype', 'length', 'with_null'])
+schema_registry = SchemaRegistry(SQLTableSchema.sfdb_schema_file)
@@ -4,7 +4,11 @@ import os
 
 from sfdbtester.common import argparser as ap
 from sfdbtester.sfdb import sfdb_checks as sc
+from sfdbtester.sfdb.sfdb_tools import dedup_sfdb_file, repair_sfdb_file, sort_sfdb_file
+from sfdbtester.sfdb.schema_inference import infer_schema, write_schema_snippet, create_schema_snippet_filepath
+from sfdbtester.sfdb.sql_table_schema import schema_registry
 from sfdbtester.common.sfdb_logging import LOGFILE_LEVEL, create_log_filepath, configurate_logger
+from sfdbtester.common.sfdb_report import FindingsReport, create_report_filepath
 
 # TODO: For GUI - make a button that opens a window that allows adding, editing and deleting of SFDB schemas
 
@@ -29,37 +33,98 @@ def run():
     if args.request:
         args = ap.request_missing_args(args)
 
+    if args.schema_source:
+        schema_registry.open(args.schema_source)
+
+    if args.report_format:
+        report_filepath = create_report_filepath(log_filepath, args.report_format)
+        with FindingsReport(report_filepath, args.report_format) as report:
+            warning_counter += _run_checks(args, log_filepath, report)
+        logging.info(f'Report with {report.record_count} records written to {report.filepath}.')
+    else:
+        warning_counter += _run_checks(args, log_filepath)
+
+    # Finish logging
+    logging.log(LOGFILE_LEVEL, 'Done')
+    logging.info(f'The file caused {warning_counter} warning-messages.')
+    logging.info(f'Logfile written to {log_filepath}.\nDone')
+
+
+def _run_checks(args, log_filepath, report=None):
+    """Runs the checks selected by the arguments on the new sfdb and logs their results. If a FindingsReport is given,
+    the findings of every check are written to it right after that check. Returns the number of warnings."""
+    warning_counter = 0
+
     # Perform Tests on SFDB file
     logging.log(LOGFILE_LEVEL, 'STARTING CONTENT FORMAT TEST')
     wrong_format_entries = sc.check_content_format(args.sfdb_new)
-    sc.log_sfdb_content_format_check(len(args.sfdb_new.columns), wrong_format_entries)
+    sc.log_sfdb_content_format_check(len(args.sfdb_new.columns), wrong_format_entries, args.sfdb_new.entry_offset)
+    if report:
+        sc.report_content_format_check(report, len(args.sfdb_new.columns), wrong_format_entries,
+                                       args.sfdb_new.entry_offset)
     logging.log(LOGFILE_LEVEL, 'FINISHED CONTENT FORMAT TEST\n')
 
     # Run tests that crash if SFDB file has format issues
     if not wrong_format_entries:
         logging.log(LOGFILE_LEVEL, 'STARTING EXCEL AUTOFORMATTING TEST')
-        formatted_cells_list = sc.check_excel_autoformatting(args.sfdb_new)
-        sc.log_excel_autoformatting_check(formatted_cells_list)
-        warning_counter += len(formatted_cells_list)
+        if args.summary:
+            summary = sc.summarize_excel_autoformatting(args.sfdb_new)
+            sc.log_summary(summary)
+            warning_counter += summary.total
+        else:
+            formatted_cells_list = sc.check_excel_autoformatting(args.sfdb_new)
+            sc.log_excel_autoformatting_check(formatted_cells_list)
+            if report:
+                sc.report_excel_autoformatting_check(report, formatted_cells_list)
+            warning_counter += len(formatted_cells_list)
         logging.log(LOGFILE_LEVEL, 'FINISHED EXCEL AUTOFORMATTING TEST\n')
 
         logging.log(LOGFILE_LEVEL, 'STARTING DUPLICATE TEST')
-        duplicates = args.sfdb_new.get_duplicates()
-        sc.log_duplicates_check(duplicates)
-        warning_counter += len(args.sfdb_new._get_duplicate_index_list())
+        if args.summary:
+            summary = sc.summarize_duplicates(args.sfdb_new)
+            sc.log_summary(summary)
+            warning_counter += summary.total
+        else:
+            duplicates = args.sfdb_new.get_duplicates()
+            sc.log_duplicates_check(duplicates, args.sfdb_new.entry_offset)
+            if report:
+                sc.report_duplicates_check(report, duplicates, args.sfdb_new.entry_offset)
+            warning_counter += sum(len(entry_indices) - 1 for entry_indices, _ in duplicates)
         logging.log(LOGFILE_LEVEL, 'FINISHED DUPLICATE TEST\n')
 
         logging.log(LOGFILE_LEVEL, 'STARTING DATATYPE TEST')
-        non_conform_entries = sc.check_datatype_conformity(args.sfdb_new)
-        sc.log_datatype_check(non_conform_entries)
-        warning_counter += 0 if non_conform_entries is None else len(non_conform_entries)
+        if args.summary:
+            summary = sc.summarize_datatype_conformity(args.sfdb_new)
+            sc.log_summary(summary)
+            warning_counter += 0 if summary is None else summary.total
+        else:
+            non_conform_entries = sc.check_datatype_conformity(args.sfdb_new)
+            sc.log_datatype_check(non_conform_entries)
+            if report:
+                sc.report_datatype_check(report, non_conform_entries)
+            warning_counter += 0 if non_conform_entries is None else len(non_conform_entries)
         logging.log(LOGFILE_LEVEL, 'FINISHED  DATATYPE TEST\n')
 
+        if args.infer_schema:
+            logging.log(LOGFILE_LEVEL, 'STARTING SCHEMA INFERENCE')
+            table_name, columns = infer_schema(args.sfdb_new.filepath)
+            snippet_filepath = create_schema_snippet_filepath(log_filepath)
+            write_schema_snippet(snippet_filepath, table_name, columns)
+            logging.log(LOGFILE_LEVEL, f'    Proposed schema of {table_name} written to {snippet_filepath}')
+            logging.log(LOGFILE_LEVEL, 'FINISHED SCHEMA INFERENCE\n')
+
         if args.column_patterns:
             logging.log(LOGFILE_LEVEL, 'STARTING REGEX TEST')
-            non_compliant_entries = sc.check_content_against_regex(args.sfdb_new, args.column_patterns)
-            sc.log_regex_check(non_compliant_entries)
-            warning_counter += len(non_compliant_entries)
+            if args.summary:
+                summary = sc.summarize_content_against_regex(args.sfdb_new, args.column_patterns)
+                sc.log_summary(summary)
+                warning_counter += summary.total
+            else:
+                non_compliant_entries = sc.check_content_against_regex(args.sfdb_new, args.column_patterns)
+                sc.log_regex_check(non_compliant_entries)
+                if report:
+                    sc.report_regex_check(report, non_compliant_entries)
+                warning_counter += len(non_compliant_entries)
             logging.log(LOGFILE_LEVEL, 'FINISHED REGEX TEST\n')
 
         if args.sfdb_old:
@@ -69,23 +134,36 @@ def run():
                                                          args.excluded_lines1,
                                                          args.excluded_lines2,
                                                          args.excluded_columns)
-            sc.log_sfdb_comparison(diverging_entries)
+            entry_offsets = (args.sfdb_new.entry_offset, args.sfdb_old.entry_offset)
+            sc.log_sfdb_comparison(diverging_entries, *entry_offsets)
+            if report:
+                sc.report_sfdb_comparison(report, diverging_entries, *entry_offsets)
             warning_counter += len(diverging_entries)
             logging.log(LOGFILE_LEVEL, 'FINISHED COMPARISON TEST\n')
 
         if args.write:
-            no_dupl_sfdb_file = args.SFDBFile[:-5] + '_no_duplicates.sfdb'
-            logging.log(LOGFILE_LEVEL, 'Writing SFDB file without duplicates to {no_dupl_sfdb_file}')
-            args.sfdb_new.write(no_dupl_sfdb_file, sort=args.sorted, remove_duplicates=True)
+            no_dupl_sfdb_file = args.sfdb_new.filepath[:-5] + '_no_duplicates.sfdb'
+            logging.log(LOGFILE_LEVEL, f'Writing SFDB file without duplicates to {no_dupl_sfdb_file}')
+            if args.sorted:
+                sort_sfdb_file(args.sfdb_new.filepath, no_dupl_sfdb_file, remove_duplicates=True)
+            else:
+                dedup_sfdb_file(args.sfdb_new.filepath, no_dupl_sfdb_file)
 
     else:
         logging.info('Only format tests were carried out due to the format issues.\n'
                      'Please run this software again after fixing them.')
 
-    # Finish logging
-    logging.log(LOGFILE_LEVEL, 'Done')
-    logging.info(f'The file caused {warning_counter} warning-messages.')
-    logging.info(f'Logfile written to {log_filepath}.\nDone')
+    if args.repair:
+        repaired_sfdb_file = args.sfdb_new.filepath[:-5] + '_repaired.sfdb'
+        rejects_file = args.sfdb_new.filepath[:-5] + '_rejected.tsv'
+        logging.log(LOGFILE_LEVEL, f'Writing repaired SFDB file to {repaired_sfdb_file}')
+        reject_counts = repair_sfdb_file(args.sfdb_new.filepath, repaired_sfdb_file, rejects_file,
+                                         reject_invalid=args.reject_invalid, column_patterns=args.column_patterns)
+        for reason, count in reject_counts.items():
+            logging.log(LOGFILE_LEVEL, f'    Rejected {count} entries: {reason}')
+        logging.log(LOGFILE_LEVEL, f'Rejected entries written to {rejects_file}\n')
+
+    return warning_counter
 
 # TODO: Adjust request mode for regex
 
@@ -284,6 +284,15 @@ class TestArgParser(ut.TestCase):
         expected_output = test_excluded_columns
         self.assertEqual(expected_output, args.excluded_columns)
 
+    def test_parse_args_excluded_columns_not_loaded(self):
+        comp_sfdb = get_resource_filepath('test_duplicates.sfdb')
+        test_args = [self.test_sfdb_filepath, '-c', comp_sfdb, '-xc', 'COLUMN2']
+
+        args = ap.parse_args(test_args)
+
+        self.assertEqual(('COLUMN1', 'COLUMN2', 'COLUMN3'), args.sfdb_new.columns)
+        self.assertEqual(('COLUMN1', 'COLUMN3'), args.sfdb_old.columns)
+
     def test_parse_args_excluded_columns_invalid_columns(self):
         comp_sfdb = get_resource_filepath('test_duplicates.sfdb')
         test_excluded_columns = ['COLUMN1', 'NonExistantColumn']
@@ -360,6 +369,58 @@ class TestArgParser(ut.TestCase):
         self.assertTrue(args.write)
         self.assertFalse(args.sorted)
 
+    def test_parse_args_report_format_valid(self):
+        test_filepath = get_resource_filepath('test_duplicates.sfdb')
+        test_args = [test_filepath, '-rf', 'jsonl']
+
+        args = ap.parse_args(test_args)
+
+        self.assertEqual('jsonl', args.report_format)
+
+    def test_parse_args_report_format_invalid(self):
+        test_filepath = get_resource_filepath('test_duplicates.sfdb')
+        test_args = [test_filepath, '-rf', 'xml']
+
+        with self.assertRaises(ap.WrongArgumentError):
+            ap.parse_args(test_args)
+
+    def test_parse_args_summary_with_report_format(self):
+        test_filepath = get_resource_filepath('test_duplicates.sfdb')
+        test_args = [test_filepath, '-su', '-rf', 'csv']
+
+        with self.assertRaises(ap.WrongArgumentError) as cm:
+            ap.parse_args(test_args)
+
+        expected_partial_error_message = 'argument -su/--summary: Can not use argument -su together with argument -rf'
+        self.assertIn(expected_partial_error_message, str(cm.exception))
+
+    def test_parse_args_reject_invalid_without_repair(self):
+        test_filepath = get_resource_filepath('test_duplicates.sfdb')
+        test_args = [test_filepath, '-ri']
+
+        with self.assertRaises(ap.WrongArgumentError) as cm:
+            ap.parse_args(test_args)
+
+        expected_partial_error_message = 'argument -ri/--reject_invalid: Can not use argument -ri without argument -rp'
+        self.assertIn(expected_partial_error_message, str(cm.exception))
+
+    def test_parse_args_schema_source_file(self):
+        schema_file = get_resource_filepath('sfdb_schemas.json')
+        test_args = [self.test_sfdb_filepath, '-ss', schema_file]
+
+        args = ap.parse_args(test_args)
+
+        self.assertEqual(schema_file, args.schema_source)
+
+    def test_parse_args_schema_source_directory_without_manifest(self):
+        test_dir = get_resource_filepath('test_dir')
+        test_args = [self.test_sfdb_filepath, '-ss', test_dir]
+
+        with self.assertRaises(ap.WrongArgumentError) as cm:
+            ap.parse_args(test_args)
+
+        self.assertIn('is not a schema store!', str(cm.exception))
+
 
 if __name__ == '__main__':
     ut.main()
@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest as ut
+
+from sfdbtester.sfdb.schema_inference import infer_schema, create_schema_snippet
+from sfdbtester.sfdb.sql_table_schema import Column, SchemaRegistry
+
+SFDB_HEADER = ['ENCODING UTF8', 'INIT', 'TABLE\tTEST_TABLE', 'COLUMNS\tBIT\tINT\tBIGINT\tDECIMAL\tDATE\tOLD_DATE\tTEXT',
+               'INSERT']
+
+
+class TestSchemaInference(ut.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sfdb_filepath = os.path.join(self.temp_dir.name, 'test.sfdb')
+        entries = ['1\t12\t-5\t1.25\t2019-01-31\t1600-01-01\tabc',
+                   '0\t123\t99999999999\t-10.5\t2019-02-28\t2000-01-01\tabcdef',
+                   '\t4\t7\t3\t2019-12-31 10:00\t2000-01-01\t',
+                   'wrong\tnumber\tof\tvalues']
+        with open(self.sfdb_filepath, mode='w', encoding='utf8') as sfdb_stream:
+            sfdb_stream.write('\n'.join(SFDB_HEADER + entries) + '\n')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_infer_schema(self):
+        table_name, columns = infer_schema(self.sfdb_filepath, chunk_size=2)
+
+        expected_columns = [Column('BIT', 'bit', 1, True),
+                            Column('INT', 'int', 3, False),
+                            Column('BIGINT', 'bigint', 8, False),
+                            Column('DECIMAL', 'decimal(4,2)', 5, False),
+                            Column('DATE', 'datetime', 10, False),
+                            Column('OLD_DATE', 'datetime2', 10, False),
+                            Column('TEXT', 'nvarchar', 6, True)]
+        self.assertEqual('TEST_TABLE', table_name)
+        self.assertEqual(expected_columns, columns)
+
+    def test_create_schema_snippet_readable_by_schema_registry(self):
+        table_name, columns = infer_schema(self.sfdb_filepath)
+        schema_file = os.path.join(self.temp_dir.name, 'schemas.json')
+        with open(schema_file, mode='w') as schema_stream:
+            schema_stream.write(create_schema_snippet(table_name, columns))
+
+        column_properties = SchemaRegistry(schema_file).get_column_properties('TEST_TABLE')
+
+        self.assertEqual(columns, list(column_properties.values()))
+
+    def test_create_schema_snippet(self):
+        snippet = create_schema_snippet('TABLE', [Column('C1', 'int', 4, False)])
+
+        expected_schema = {'TABLE': [{'column_name': 'C1', 'datatype': 'int', 'length': 4, 'with_null': False}]}
+        self.assertEqual(expected_schema, json.loads(snippet))
+
+
+if __name__ == '__main__':
+    ut.main()
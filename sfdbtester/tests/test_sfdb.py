@@ -1,4 +1,7 @@
+import os
+import tempfile
 import unittest as ut
+from unittest import mock
 
 import numpy as np
 
@@ -62,11 +65,34 @@ class TestSFDBContainer(ut.TestCase):
 
     def test___get_item__invalid_key(self):
         test_sfdb = create_test_sfdbcontainer()
-        i_test = 'IAmAnInvalidKey'
+        i_test = 1.5
 
         with self.assertRaises(TypeError):
             test_sfdb[i_test]
 
+    def test___get_item__column_name(self):
+        test_entries = [['1', '2'], ['3', '4'], ['5', '6']]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries)
+
+        column = test_sfdb['COLUMN2']
+
+        np.testing.assert_array_equal(np.array(['2', '4', '6']), column)
+        self.assertTrue(np.shares_memory(test_sfdb.content, column))
+
+    def test___get_item__unknown_column_name(self):
+        test_sfdb = create_test_sfdbcontainer()
+
+        with self.assertRaises(KeyError):
+            test_sfdb['IAmAnInvalidKey']
+
+    def test___get_item__rows_and_columns(self):
+        test_entries = [['1', '2'], ['3', '4'], ['5', '6']]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries)
+
+        np.testing.assert_array_equal(np.array(['3', '5']), test_sfdb[1:, 'COLUMN1'])
+        np.testing.assert_array_equal(np.array(['4', '3']), test_sfdb[1, ['COLUMN2', 0]])
+        np.testing.assert_array_equal(np.array([['2'], ['6']]), test_sfdb[[True, False, True], 1:])
+
     def test___get_item__slice(self):
         test_entries = [['1', '2'], ['3', '4'], ['5', '6']]
         test_sfdb = create_test_sfdbcontainer(entries=test_entries)
@@ -103,6 +129,52 @@ class TestSFDBContainer(ut.TestCase):
         with self.assertRaises(ValueError):
             test_sfdb1 + test_sfdb2
 
+    def test_concat(self):
+        test_sfdb1 = create_test_sfdbcontainer(entries=[['1', '2'], ['3', '4']])
+        test_sfdb2 = create_test_sfdbcontainer(entries=[['long value', '6'], ['1', '2']])
+
+        concatenated_sfdb = SFDBContainer.concat([test_sfdb1, test_sfdb2])
+
+        expected_content = np.array([['1', '2'], ['3', '4'], ['long value', '6'], ['1', '2']])
+        np.testing.assert_array_equal(expected_content, concatenated_sfdb.content)
+        self.assertEqual(test_sfdb1.sfdb_lines + test_sfdb2.sfdb_lines[5:], concatenated_sfdb.sfdb_lines)
+
+    def test_concat_remove_duplicates(self):
+        test_sfdb1 = create_test_sfdbcontainer(entries=[['1', '2'], ['3', '4'], ['1', '2']])
+        test_sfdb2 = create_test_sfdbcontainer(entries=[['5', '6'], ['3', '4']])
+
+        concatenated_sfdb = SFDBContainer.concat(iter([test_sfdb1, test_sfdb2]), remove_duplicates=True)
+
+        np.testing.assert_array_equal(np.array([['1', '2'], ['3', '4'], ['5', '6']]), concatenated_sfdb.content)
+        self.assertEqual(['1\t2', '3\t4', '5\t6'], concatenated_sfdb.sfdb_lines[5:])
+
+    def test_concat_entries_with_differing_number_of_values(self):
+        test_sfdb1 = create_test_sfdbcontainer(entries=[['1', '2'], ['3']])
+        test_sfdb2 = create_test_sfdbcontainer(entries=[['5', '6'], ['7', '8']])
+
+        concatenated_sfdb = SFDBContainer.concat([test_sfdb1, test_sfdb2])
+
+        self.assertEqual([['1', '2'], ['3'], ['5', '6'], ['7', '8']], [list(entry) for entry in concatenated_sfdb])
+
+    def test_concat_keeps_schema(self):
+        test_schema = SQLTableSchema('INT_4_CHARACTERS')
+        test_sfdb = create_test_sfdbcontainer(schema=test_schema)
+
+        concatenated_sfdb = SFDBContainer.concat([test_sfdb, test_sfdb])
+
+        self.assertIs(test_schema, concatenated_sfdb.schema)
+
+    def test_concat_wrong_header(self):
+        test_sfdb1 = create_test_sfdbcontainer()
+        test_sfdb2 = create_test_sfdbcontainer(name='SFI_DIFFERENT')
+
+        with self.assertRaises(ValueError):
+            SFDBContainer.concat([test_sfdb1, test_sfdb2])
+
+    def test_concat_empty_sequence(self):
+        with self.assertRaises(ValueError):
+            SFDBContainer.concat([])
+
     def test_header(self):
         test_sfdb = create_test_sfdbcontainer()
 
@@ -122,7 +194,23 @@ class TestSFDBContainer(ut.TestCase):
         test_columns = ['C', 'D']
         test_sfdb = create_test_sfdbcontainer(columns=test_columns)
 
-        self.assertEqual(test_columns, test_sfdb.columns)
+        self.assertEqual(tuple(test_columns), test_sfdb.columns)
+
+    def test_sfdb_header_parsed_once(self):
+        test_sfdb = create_test_sfdbcontainer()
+        sfdb_header = test_sfdb.sfdb_header
+        self.assertIs(sfdb_header, test_sfdb.sfdb_header)
+
+        test_sfdb.sfdb_lines = create_test_sfdbcontainer(name='OTHER_TABLE').sfdb_lines
+
+        self.assertEqual('OTHER_TABLE', test_sfdb.name)
+
+    def test_schema_shared_between_containers(self):
+        test_sfdb1 = create_test_sfdbcontainer()
+        test_sfdb2 = create_test_sfdbcontainer()
+
+        self.assertIs(test_sfdb1.schema, test_sfdb2.schema)
+        self.assertIs(SQLTableSchema.get_shared('SMALL_TEST'), test_sfdb1.schema)
 
     def test_get_entry_string_index_in_bounds(self):
         test_entries = [['1', '2'], ['3', '4']]
@@ -302,6 +390,36 @@ class TestSFDBContainer(ut.TestCase):
 
         self.assertEqual(expected_output, output)
 
+    def test_write_with_sorting_keeps_rows_together(self):
+        test_output_filepath = get_resource_filepath('tempfile.sfdb')
+        test_entries = [['3', '1'], ['1', '4'], ['2', '2']]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries)
+
+        test_sfdb.write_to_file(test_output_filepath, sort=True)
+
+        with open(test_output_filepath) as f:
+            output = f.readlines()
+        self.assertEqual(['1\t4\n', '2\t2\n', '3\t1\n'], output[5:])
+
+    def test_get_sort_order_sort_columns(self):
+        test_entries = [['b', '2'], ['a', '2'], ['c', '1']]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries)
+
+        order = test_sfdb.get_sort_order(['COLUMN2', 'COLUMN1'])
+
+        np.testing.assert_array_equal(np.array([2, 1, 0]), order)
+
+    def test_get_sort_order_invalid_sort_column(self):
+        test_sfdb = create_test_sfdbcontainer()
+
+        with self.assertRaises(ValueError):
+            test_sfdb.get_sort_order(['COLUMN3'])
+
+    def test_get_sort_order_entries_with_too_few_values(self):
+        order = sfdb.get_sort_order([['b', '1'], ['b'], ['a', '2']], [0, 1])
+
+        np.testing.assert_array_equal(np.array([2, 1, 0]), order)
+
     def test_get_duplicates(self):
         test_entries = [('1', '2'), ('3', '4'), ('1', '2'), ('5', '6'), ('1', '2'), ('5', '6')]
         test_sfdb = create_test_sfdbcontainer(entries=test_entries)
@@ -372,6 +490,382 @@ class TestSFDBContainer(ut.TestCase):
         test_sfdb2.filepath = 'B'
         self.assertNotEqual(test_sfdb1.__hash__(), test_sfdb2.__hash__())
 
+    def test___eq__view_and_container(self):
+        test_entries = [['1', '2'], ['3', '4'], ['5', '6'], ['7', '8']]
+        test_sfdb1 = create_test_sfdbcontainer(entries=test_entries)
+        test_sfdb2 = create_test_sfdbcontainer(entries=test_entries[1:])
+        self.assertTrue(test_sfdb1[[1, 2, 3]].__eq__(test_sfdb2))
+
+    def test_digest_reset_by_new_lines(self):
+        test_sfdb = create_test_sfdbcontainer()
+        digest = test_sfdb.digest
+        self.assertIs(digest, test_sfdb.digest)
+
+        test_sfdb.sfdb_lines = test_sfdb.sfdb_lines[:-1]
+
+        self.assertNotEqual(digest, test_sfdb.digest)
+
+    def test_get_lines_digest_chunks(self):
+        test_lines = [f'line{i}' for i in range(5)]
+        expected_digest = sfdb.get_lines_digest(test_lines)
+
+        original_chunk_size = sfdb.DIGEST_CHUNK_SIZE
+        sfdb.DIGEST_CHUNK_SIZE = 2
+        try:
+            self.assertEqual(expected_digest, sfdb.get_lines_digest(test_lines))
+        finally:
+            sfdb.DIGEST_CHUNK_SIZE = original_chunk_size
+
+    def test_get_typed_column_integer_column(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['12', '1'], ['-3', 'x']],
+                                              schema=SQLTableSchema('INT_4_CHARACTERS'))
+
+        typed_column = test_sfdb.get_typed_column('COLUMN2')
+
+        np.testing.assert_array_equal(np.array([1, 0]), typed_column.values)
+        np.testing.assert_array_equal(np.array([True, False]), typed_column.is_valid)
+        self.assertEqual(np.int64, typed_column.values.dtype)
+
+    def test_get_typed_column_cached(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['12', '1'], ['-3', 'x']],
+                                              schema=SQLTableSchema('INT_4_CHARACTERS'))
+
+        self.assertIs(test_sfdb.get_typed_column('COLUMN1'), test_sfdb.get_typed_column(0))
+
+    def test_get_typed_column_invalidated_by_new_content(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['12', '1'], ['-3', 'x']],
+                                              schema=SQLTableSchema('INT_4_CHARACTERS'))
+        test_sfdb.get_typed_column('COLUMN1')
+
+        test_sfdb.content = np.array([['7', '8']])
+
+        np.testing.assert_array_equal(np.array([7]), test_sfdb.get_typed_column('COLUMN1').values)
+
+    def test_get_typed_column_no_integer_column(self):
+        test_sfdb = create_test_sfdbcontainer()
+
+        self.assertIsNone(test_sfdb.get_typed_column('COLUMN1'))
+
+
+class TestDroppedLines(ut.TestCase):
+    def setUp(self):
+        self.test_entries = [['1', '2'], ['3', '4'], ['1', '2']]
+        self.test_sfdb = create_test_sfdbcontainer(entries=self.test_entries)
+        self.expected_lines = list(self.test_sfdb.sfdb_lines)
+        self.test_sfdb.drop_lines()
+
+    def test_lines_generated_from_content(self):
+        self.assertFalse(self.test_sfdb.has_lines)
+        self.assertEqual(self.expected_lines, self.test_sfdb.sfdb_lines)
+        self.assertEqual('3\t4', self.test_sfdb.get_entry_string(1))
+        self.assertTrue(repr(self.test_sfdb).endswith('1\t2\n3\t4\n1\t2'))
+
+    def test___eq__sfdb_with_lines(self):
+        self.assertTrue(self.test_sfdb.__eq__(create_test_sfdbcontainer(entries=self.test_entries)))
+
+    def test_new_content_changes_digest(self):
+        digest = self.test_sfdb.digest
+
+        self.test_sfdb.content = self.test_sfdb.content[:2]
+
+        self.assertNotEqual(digest, self.test_sfdb.digest)
+        self.assertEqual(self.expected_lines[:-1], self.test_sfdb.sfdb_lines)
+
+    def test___eq__after_content_modified_in_place(self):
+        other_sfdb = create_test_sfdbcontainer(entries=self.test_entries)
+        self.assertTrue(self.test_sfdb.__eq__(other_sfdb))
+
+        self.test_sfdb.content[0, 0] = '5'
+        self.test_sfdb.clear_cache()
+
+        self.assertFalse(self.test_sfdb.__eq__(other_sfdb))
+        self.assertTrue(self.test_sfdb.__eq__(create_test_sfdbcontainer(entries=[['5', '2'], ['3', '4'], ['1', '2']])))
+
+    def test___add__(self):
+        added_sfdb = self.test_sfdb + create_test_sfdbcontainer(entries=self.test_entries)
+
+        self.assertFalse(added_sfdb.has_lines)
+        self.assertEqual(6, len(added_sfdb))
+        self.assertEqual(self.expected_lines + self.expected_lines[5:], added_sfdb.sfdb_lines)
+
+    def test_concat_remove_duplicates(self):
+        concatenated_sfdb = SFDBContainer.concat([self.test_sfdb, self.test_sfdb], remove_duplicates=True)
+
+        self.assertEqual(self.expected_lines[:-1], concatenated_sfdb.sfdb_lines)
+
+    def test_from_file(self):
+        test_filepath = get_resource_filepath('test_duplicates.sfdb')
+
+        test_sfdb = SFDBContainer.from_file(test_filepath, keep_lines=False)
+
+        self.assertFalse(test_sfdb.has_lines)
+        self.assertEqual(SFDBContainer.from_file(test_filepath), test_sfdb)
+
+
+class TestFromFileColumns(ut.TestCase):
+    def test_from_file_columns(self):
+        test_filepath = get_resource_filepath('test_duplicates.sfdb')
+
+        test_sfdb = SFDBContainer.from_file(test_filepath, columns=['COLUMN3', 'COLUMN1'])
+
+        self.assertEqual(('COLUMN3', 'COLUMN1'), test_sfdb.columns)
+        np.testing.assert_array_equal(np.array(['val3', 'val6', 'val6', 'val4']), test_sfdb['COLUMN3'])
+        self.assertEqual('val4\tval1', test_sfdb.get_entry_string(3))
+        self.assertEqual('COLUMNS\tCOLUMN3\tCOLUMN1', test_sfdb.sfdb_lines[3])
+
+    def test_from_file_unknown_column(self):
+        with self.assertRaises(ValueError):
+            SFDBContainer.from_file(get_resource_filepath('test_duplicates.sfdb'), columns=['COLUMN4'])
+
+    def test_from_file_columns_wrong_value_count(self):
+        with self.assertRaises(ValueError) as cm:
+            SFDBContainer.from_file(get_resource_filepath('wrong_content_format.sfdb'), columns=['COLUMN1'])
+
+        self.assertIn('line 7 has 2 instead of 3 values', str(cm.exception))
+
+
+class TestFromFileRows(ut.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sfdb_filepath = os.path.join(self.temp_dir.name, 'test.sfdb')
+        with open(self.sfdb_filepath, mode='w', encoding='utf8') as sfdb_stream:
+            header = 'ENCODING UTF8\nINIT\nTABLE\tTEST_TABLE\nCOLUMNS\tCOLUMN1\tCOLUMN2\nINSERT\n'
+            sfdb_stream.write(header + ''.join(f'{i}\tval{i % 3}\n' for i in range(2500)))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_from_file_rows(self):
+        test_sfdb = SFDBContainer.from_file(self.sfdb_filepath, rows=range(1998, 2003))
+
+        self.assertEqual(5, len(test_sfdb))
+        self.assertEqual(1998, test_sfdb.entry_offset)
+        self.assertEqual(('COLUMN1', 'COLUMN2'), test_sfdb.columns)
+        np.testing.assert_array_equal(np.array(['1998', '1999', '2000', '2001', '2002']), test_sfdb['COLUMN1'])
+        self.assertEqual('2002\tval1', test_sfdb.get_entry_string(4))
+
+    def test_from_file_rows_equals_slice_of_full_file(self):
+        full_sfdb = SFDBContainer.from_file(self.sfdb_filepath)
+
+        test_sfdb = SFDBContainer.from_file(self.sfdb_filepath, rows=range(2490, 2600))
+
+        np.testing.assert_array_equal(full_sfdb[2490:], test_sfdb.content)
+        self.assertEqual(0, full_sfdb.entry_offset)
+
+    def test_from_file_rows_and_columns(self):
+        test_sfdb = SFDBContainer.from_file(self.sfdb_filepath, columns=['COLUMN2'], rows=range(10, 12))
+
+        self.assertEqual(('COLUMN2',), test_sfdb.columns)
+        np.testing.assert_array_equal(np.array(['val1', 'val2']), test_sfdb['COLUMN2'])
+
+    def test_from_file_rows_no_range(self):
+        with self.assertRaises(TypeError):
+            SFDBContainer.from_file(self.sfdb_filepath, rows=[1, 2])
+
+    def test_from_file_rows_line_offsets_not_writable(self):
+        with mock.patch('numpy.savez', side_effect=PermissionError):
+            test_sfdb = SFDBContainer.from_file(self.sfdb_filepath, rows=range(1000, 1002))
+
+        np.testing.assert_array_equal(np.array(['1000', '1001']), test_sfdb['COLUMN1'])
+        self.assertEqual(1006, test_sfdb.get_line_number(0))
+
+    def test_from_file_rows_with_step(self):
+        with self.assertRaises(ValueError):
+            SFDBContainer.from_file(self.sfdb_filepath, rows=range(0, 10, 2))
+
+
+class TestAppend(ut.TestCase):
+    def test_append(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['1', '2'], ['3', '4'], ['5', '6']])
+
+        test_sfdb.append(['7', '8'])
+
+        self.assertEqual(4, len(test_sfdb))
+        self.assertEqual('7\t8', test_sfdb.get_entry_string(3))
+        self.assertEqual('7\t8', test_sfdb.sfdb_lines[-1])
+        np.testing.assert_array_equal(np.array(['1', '3', '5', '7']), test_sfdb['COLUMN1'])
+
+    def test_append_shared_lines(self):
+        sfdb_lines = create_test_sfdbcontainer(entries=[['1', '2'], ['3', '4'], ['5', '6']]).sfdb_lines
+        test_sfdb = SFDBContainer(sfdb_lines)
+        other_sfdb = SFDBContainer(sfdb_lines)
+
+        test_sfdb.append(['7', '8'])
+
+        self.assertEqual(8, len(sfdb_lines))
+        self.assertEqual(8, len(other_sfdb.sfdb_lines))
+        self.assertEqual(3, len(other_sfdb))
+        self.assertEqual(9, len(test_sfdb.sfdb_lines))
+        self.assertNotEqual(test_sfdb, other_sfdb)
+
+    def test_extend_equals_concat(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['1', '2'], ['3', '4'], ['5', '6']])
+        other_sfdb = create_test_sfdbcontainer(entries=[['11', '2'], ['3', '4'], ['5', '66']])
+        concatenated_sfdb = test_sfdb + other_sfdb
+
+        test_sfdb.extend(other_sfdb)
+
+        np.testing.assert_array_equal(concatenated_sfdb.content, test_sfdb.content)
+        self.assertEqual(concatenated_sfdb, test_sfdb)
+
+    def test_extend_grows_buffer_amortized(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['1', '2'], ['3', '4'], ['5', '6']])
+        buffers = set()
+
+        for i in range(100):
+            test_sfdb.append([str(i), 'a'])
+            buffers.add(id(test_sfdb._buffer))
+
+        self.assertEqual(103, len(test_sfdb))
+        self.assertLessEqual(len(buffers), 8)
+        self.assertEqual('99\ta', test_sfdb.get_entry_string(102))
+
+    def test_extend_dropped_lines(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['1', '2'], ['3', '4'], ['5', '6']])
+        test_sfdb.drop_lines()
+        digest = test_sfdb.digest
+
+        test_sfdb.extend([['7', '8'], ['9', '10']])
+
+        self.assertFalse(test_sfdb.has_lines)
+        self.assertNotEqual(digest, test_sfdb.digest)
+        self.assertEqual('9\t10', test_sfdb.sfdb_lines[-1])
+
+    def test_extend_duplicates_updated(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['5', '6'], ['1', '2'], ['5', '6']])
+
+        test_sfdb.extend([['1', '2'], ['3', '4']])
+        test_sfdb.extend([['5', '6'], ['3', '4']])
+
+        duplicates = test_sfdb.get_duplicates()
+        self.assertIs(duplicates, test_sfdb.get_duplicates())
+        expected_duplicates = test_sfdb._find_duplicates()
+        self.assertEqual(len(expected_duplicates), len(duplicates))
+        for (expected_indices, expected_entry), (indices, entry) in zip(expected_duplicates, duplicates):
+            np.testing.assert_array_equal(expected_indices, indices)
+            np.testing.assert_array_equal(expected_entry, entry)
+
+    def test_extend_discards_derived_results(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['1', '2'], ['3', '4'], ['5', '6']])
+        test_sfdb.create_index('COLUMN1')
+
+        test_sfdb.append(['1', '8'])
+
+        np.testing.assert_array_equal(np.array([0, 3]), test_sfdb.create_index('COLUMN1').lookup('1'))
+
+    def test_extend_wrong_value_count(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['1', '2'], ['3', '4'], ['5', '6']])
+
+        for entries in ([['1']], [['1', '2', '3']], [['1', '2'], ['1']]):
+            with self.assertRaises(ValueError):
+                test_sfdb.extend(entries)
+        self.assertEqual(3, len(test_sfdb))
+
+    def test_extend_different_header(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['1', '2'], ['3', '4'], ['5', '6']])
+
+        with self.assertRaises(ValueError):
+            test_sfdb.extend(create_test_sfdbcontainer(name='OTHER_TABLE'))
+
+    def test_extend_view(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['1', '2'], ['3', '4'], ['5', '6']])
+
+        with self.assertRaises(TypeError):
+            test_sfdb[[0, 1]].append(['7', '8'])
+
+
+class TestSFDBView(ut.TestCase):
+    def test___get_item__boolean_mask(self):
+        test_entries = [['1', '2'], ['3', '4'], ['5', '6']]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries)
+
+        test_view = test_sfdb[test_sfdb['COLUMN1'] != '3']
+
+        self.assertIsInstance(test_view, sfdb.SFDBView)
+        self.assertEqual(2, len(test_view))
+        np.testing.assert_array_equal(np.array(['2', '6']), test_view['COLUMN2'])
+        self.assertEqual(test_sfdb.header, test_view.header)
+
+    def test___get_item__boolean_mask_wrong_length(self):
+        test_sfdb = create_test_sfdbcontainer()
+
+        with self.assertRaises(IndexError):
+            test_sfdb[np.array([True])]
+
+    def test___get_item__index_array(self):
+        test_entries = [['1', '2'], ['3', '4'], ['5', '6']]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries)
+
+        test_view = test_sfdb[[2, 0]]
+
+        np.testing.assert_array_equal(np.array([['5', '6'], ['1', '2']]), test_view.content)
+        self.assertEqual('5\t6', test_view.get_entry_string(0))
+
+    def test_view_of_view_refers_to_source(self):
+        test_entries = [['1', '2'], ['3', '4'], ['5', '6']]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries)
+
+        test_view = test_sfdb[[1, 2]][[False, True]]
+
+        self.assertIs(test_sfdb, test_view._source)
+        np.testing.assert_array_equal(np.array([2]), test_view.row_ids)
+        np.testing.assert_array_equal(np.array(['6']), test_view[:, 'COLUMN2'])
+
+    def test_write_to_file(self):
+        test_output_filepath = get_resource_filepath('tempfile.sfdb')
+        test_entries = [['1', '2'], ['3', '4'], ['1', '2']]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries)
+
+        test_sfdb[test_sfdb['COLUMN1'] == '1'].write_to_file(test_output_filepath, remove_duplicates=True)
+
+        with open(test_output_filepath) as f:
+            output = f.readlines()
+        self.assertEqual(['ENCODING UTF8\n', 'INIT\n', 'TABLE\tSMALL_TEST\n', 'COLUMNS\tCOLUMN1\tCOLUMN2\n',
+                          'INSERT\n', '1\t2\n'], output)
+
+    def test_get_typed_column(self):
+        test_entries = [['7', 'x'], ['8', 'y']]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries, schema=SQLTableSchema('INT_4_CHARACTERS'))
+
+        test_view = test_sfdb[[1]]
+
+        np.testing.assert_array_equal(np.array([8]), test_view.get_typed_column('COLUMN1').values)
+
+
+class TestWhere(ut.TestCase):
+    def setUp(self):
+        test_entries = [['1', 'EUR'], ['2', 'USD'], ['3', 'EUR'], ['4', 'CHF']]
+        self.test_sfdb = create_test_sfdbcontainer(columns=('ID', 'CURRENCY'), entries=test_entries)
+
+    def test_where_equal(self):
+        test_view = self.test_sfdb.where(CURRENCY='EUR')
+
+        np.testing.assert_array_equal(np.array(['1', '3']), test_view['ID'])
+
+    def test_where_in_and_not_equal(self):
+        test_view = self.test_sfdb.where(CURRENCY__in=['EUR', 'CHF'], ID__ne=1)
+
+        np.testing.assert_array_equal(np.array([2, 3]), test_view.row_ids)
+
+    def test_where_regex(self):
+        test_view = self.test_sfdb.where(CURRENCY__regex='^[CU]')
+
+        np.testing.assert_array_equal(np.array(['USD', 'CHF']), test_view['CURRENCY'])
+
+    def test_where_on_view(self):
+        test_view = self.test_sfdb.where(CURRENCY='EUR').where(ID='3')
+
+        self.assertEqual(['ENCODING UTF8', 'INIT', 'TABLE\tSMALL_TEST', 'COLUMNS\tID\tCURRENCY', 'INSERT', '3\tEUR'],
+                         test_view.sfdb_lines)
+
+    def test_where_unknown_column(self):
+        with self.assertRaises(KeyError):
+            self.test_sfdb.where(CURRENCY__like='EUR')
+
+    def test_get_predicate_mask_unknown_operator(self):
+        with self.assertRaises(ValueError):
+            sfdb.get_predicate_mask(np.array(['a']), 'like', 'a')
+
 
 if __name__ == '__main__':
     ut.main()
@@ -0,0 +1,102 @@
+import gc
+import unittest as ut
+import weakref
+
+import numpy as np
+
+from sfdbtester.sfdb.sfdb_cache import DerivedCache, DuplicateTracker, get_nbytes
+from sfdbtester.tests.test_sfdb import create_test_sfdbcontainer
+
+
+class TestDerivedCache(ut.TestCase):
+    def test_get_hit_and_miss(self):
+        cache = DerivedCache()
+        derived_results = []
+
+        for _ in range(3):
+            cache.get('key', lambda: derived_results.append(None))
+
+        self.assertEqual(1, len(derived_results))
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(2, cache.hits)
+
+    def test_least_recently_used_evicted(self):
+        cache = DerivedCache(budget=200)
+        cache.put('a', np.zeros(10))
+        cache.put('b', np.zeros(10))
+        cache.get('a', None)
+
+        cache.put('c', np.zeros(10))
+
+        self.assertEqual(['a', 'c'], [key for key in ('a', 'b', 'c') if key in cache])
+        self.assertEqual(160, cache.nbytes)
+        self.assertEqual(1, cache.evictions)
+
+    def test_result_larger_than_budget_not_cached(self):
+        cache = DerivedCache(budget=8)
+
+        result = cache.get('a', lambda: np.zeros(2))
+
+        np.testing.assert_array_equal(np.zeros(2), result)
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.nbytes)
+
+    def test_clear(self):
+        cache = DerivedCache()
+        cache.put('a', np.zeros(10))
+
+        cache.clear()
+
+        self.assertNotIn('a', cache)
+        self.assertEqual(0, cache.nbytes)
+
+    def test_get_nbytes_nested(self):
+        self.assertEqual(24, get_nbytes([(np.zeros(1), np.zeros(2))]))
+
+
+class TestDuplicateTracker(ut.TestCase):
+    def test_add(self):
+        content = np.array([['b', '1'], ['a', '2'], ['b', '1'], ['a', '2'], ['b', '1']])
+        lines = ['\t'.join(entry) for entry in content]
+        tracker = DuplicateTracker()
+
+        tracker.add(lines[:3], content[:3])
+        self.assertEqual(1, len(tracker.duplicates))
+        tracker.add(lines[3:], content)
+
+        self.assertEqual(5, tracker.entry_count)
+        np.testing.assert_array_equal(np.array([1, 3]), tracker.duplicates[0][0])
+        np.testing.assert_array_equal(np.array(['a', '2']), tracker.duplicates[0][1])
+        np.testing.assert_array_equal(np.array([0, 2, 4]), tracker.duplicates[1][0])
+
+
+class TestSFDBContainerCache(ut.TestCase):
+    def test_get_duplicates_cached(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['1', '2'], ['1', '2'], ['3', '4']])
+
+        duplicates = test_sfdb.get_duplicates()
+
+        self.assertIs(duplicates, test_sfdb.get_duplicates())
+        self.assertEqual(1, test_sfdb._cache.hits)
+
+    def test_get_duplicates_released_with_container(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['1', '2'], ['1', '2'], ['3', '4']])
+        test_sfdb.get_duplicates()
+        sfdb_reference = weakref.ref(test_sfdb)
+
+        del test_sfdb
+        gc.collect()
+
+        self.assertIsNone(sfdb_reference())
+
+    def test_new_content_clears_cache(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['1', '2'], ['1', '2'], ['3', '4']])
+        test_sfdb.get_duplicates()
+
+        test_sfdb.content = test_sfdb.content[1:]
+
+        self.assertEqual([], test_sfdb.get_duplicates())
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -1,12 +1,17 @@
 """"""
+import os
 import re
+import shutil
+import tempfile
 import unittest as ut
 import numpy as np
+from sfdbtester.common.sfdb_logging import LOGFILE_LEVEL
 from sfdbtester.common.utilities import get_resource_filepath
 from sfdbtester.sfdb import sfdb
 from sfdbtester.sfdb import sfdb_checks as sc
-from sfdbtester.sfdb.sql_table_schema import SQLTableSchema
+from sfdbtester.sfdb.sql_table_schema import Column, SQLTableSchema
 from sfdbtester.tests.test_sfdb import create_test_sfdbcontainer
+from sfdbtester.tests.test_sql_table_schema import create_test_sqltableschema
 
 
 class TestSFDBTests(ut.TestCase):
@@ -75,6 +80,15 @@ class TestSFDBTests(ut.TestCase):
         np.testing.assert_array_equal(expected_output[0][0], faulty_lines[0][0])
         np.testing.assert_array_equal(expected_output[0][1], faulty_lines[0][1])
 
+    def test_check_for_duplicates_where_view(self):
+        test_entries = [['1', 'a'], ['2', 'b'], ['1', 'a'], ['2', 'b']]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries)
+
+        faulty_lines = sc.check_for_duplicates(test_sfdb.where(COLUMN1='2'))
+
+        np.testing.assert_array_equal(np.array([0, 1]), faulty_lines[0][0])
+        np.testing.assert_array_equal(np.array(['2', 'b']), faulty_lines[0][1])
+
     def test_check_datatype_conformity_with_datatype_conformity(self):
         test_sfdb = create_test_sfdbcontainer()
 
@@ -102,6 +116,34 @@ class TestSFDBTests(ut.TestCase):
             self.assertEqual(expected_entry[3], entry[3])
             self.assertEqual(expected_entry[4], entry[4])
 
+    def test_check_datatype_conformity_int_typed_column(self):
+        test_entries = [['1234', '-1'], ['007', '12a'], ['', '0']]
+        test_schema = SQLTableSchema('INT_4_CHARACTERS')
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries, schema=test_schema)
+
+        faulty_entries = sc.check_datatype_conformity(test_sfdb)
+
+        self.assertIn(('typed_column', 'COLUMN1'), test_sfdb._cache)
+        self.assertEqual([(2, 'Null not allowed in column !'),
+                          (0, 'Mismatch to SQL datatype-pattern \'^\\d{1,4}$\'!'),
+                          (1, 'Mismatch to SQL datatype-pattern \'^\\d{1,4}$\'!')],
+                         [(entry[0], entry[4]) for entry in faulty_entries])
+
+    def test_check_datatype_conformity_signed_or_padded_typed_column(self):
+        test_entries = [['-0', '-0'], ['-00', '00'], ['0012', '1']]
+        test_schema = create_test_sqltableschema(column_names=('COLUMN1', 'COLUMN2'),
+                                                 column_properties=(Column('COLUMN1', 'int', 4, False),
+                                                                    Column('COLUMN2', 'bit', 4, False)))
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries, schema=test_schema)
+
+        faulty_entries = sc.check_datatype_conformity(test_sfdb)
+
+        self.assertEqual([(0, ' 1-COLUMN1', '-0', 'Mismatch to SQL datatype-pattern \'^\\d{1,4}$\'!'),
+                          (1, ' 1-COLUMN1', '-00', 'Mismatch to SQL datatype-pattern \'^\\d{1,4}$\'!'),
+                          (0, ' 2-COLUMN2', '-0', 'Mismatch to SQL datatype-pattern \'^[01]$\'!'),
+                          (1, ' 2-COLUMN2', '00', 'Mismatch to SQL datatype-pattern \'^[01]$\'!')],
+                         [(entry[0], entry[1], entry[3], entry[4]) for entry in faulty_entries])
+
     def test_check_datatype_conformity_without_datatype_conformity_string_for_int(self):
         test_entries = [['abcd', 'efgh'], ['ijkl', 'mnop']]
         test_schema = SQLTableSchema('INT_4_CHARACTERS')
@@ -152,6 +194,17 @@ class TestSFDBTests(ut.TestCase):
         self.assertEqual(expected_value, matching_lines[0][3])
         self.assertEqual(exected_regex, matching_lines[0][4])
 
+    def test_check_content_against_regex_view(self):
+        test_entries = [['val1', '1'], ['val2', 'val2'], ['val3', '3']]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries)
+        test_column_patterns = {'COLUMN2': re.compile(r'val\d')}
+
+        matching_lines = sc.check_content_against_regex(test_sfdb[[1, 2]], test_column_patterns)
+
+        self.assertEqual(1, len(matching_lines))
+        self.assertEqual(1, matching_lines[0][0])
+        self.assertEqual('3', matching_lines[0][3])
+
     def test_check_content_against_regex_2_value_mismatch(self):
         test_entries = [['nopat1', 'nopat2'], ['val1', 'val2']]
         test_sfdb = create_test_sfdbcontainer(entries=test_entries)
@@ -313,6 +366,103 @@ class TestSFDBTests(ut.TestCase):
         expected_output = []
         self.assertEqual(expected_output, diverging_lines)
 
+    def test_check_sfdb_comparison_excluded_column_not_loaded(self):
+        test_filepath = get_resource_filepath('test_duplicates.sfdb')
+        sfdb_new = sfdb.SFDBContainer.from_file(test_filepath)
+        sfdb_new.content[1, 1] = 'changed'
+        sfdb_old = sfdb.SFDBContainer.from_file(test_filepath, columns=['COLUMN1', 'COLUMN3'])
+
+        diverging_lines = sc.check_sfdb_comparison(sfdb_new, sfdb_old, excluded_columns=['COLUMN2'])
+
+        self.assertEqual([], diverging_lines)
+
+    def test_summarize_datatype_conformity(self):
+        test_entries = [['12345', ''], ['1', 'a']]
+        test_schema = SQLTableSchema('INT_4_CHARACTERS')
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries, schema=test_schema)
+
+        summary = sc.summarize_datatype_conformity(test_sfdb)
+
+        self.assertEqual(3, summary.total)
+        self.assertEqual({' 1-COLUMN1': 1, ' 2-COLUMN2': 2}, summary.per_column)
+        self.assertEqual({'null': 1, 'too long': 1, 'pattern mismatch': 1}, summary.per_error_kind)
+
+    def test_summarize_datatype_conformity_no_schema(self):
+        test_sfdb = create_test_sfdbcontainer(name='UNKNOWN_TABLE')
+
+        summary = sc.summarize_datatype_conformity(test_sfdb)
+
+        self.assertIsNone(summary)
+
+    def test_summarize_content_against_regex(self):
+        test_entries = [['nopat1', 'nopat2'], ['val1', 'val2']]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries)
+        test_column_patterns = {'COLUMN1': re.compile(r'val\d'),
+                                'COLUMN2': re.compile(r'val\d')}
+
+        summary = sc.summarize_content_against_regex(test_sfdb, test_column_patterns)
+
+        self.assertEqual(2, summary.total)
+        self.assertEqual({'regex mismatch': 2}, summary.per_error_kind)
+
+    def test_summarize_excel_autoformatting(self):
+        excel_formatted_sfdb_filepath = get_resource_filepath('excel_formatting.sfdb')
+        test_sfdb = sfdb.SFDBContainer.from_file(excel_formatted_sfdb_filepath)
+
+        summary = sc.summarize_excel_autoformatting(test_sfdb)
+
+        self.assertEqual(2, summary.total)
+        self.assertEqual({' 1-COLUMN1': 1, ' 2-COLUMN2': 1}, summary.per_column)
+
+    def test_summarize_duplicates(self):
+        test_entries = [('1', '2'), ('3', '4'), ('1', '2'), ('5', '6'), ('1', '2'), ('5', '6')]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries)
+
+        summary = sc.summarize_duplicates(test_sfdb)
+
+        self.assertEqual(3, summary.total)
+        self.assertEqual({'duplicate': 3}, summary.per_error_kind)
+        self.assertEqual(2, summary.group_count)
+
+
+class TestEntryOffset(ut.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sfdb_filepath = os.path.join(self.temp_dir.name, 'log_test.sfdb')
+        shutil.copy(get_resource_filepath('log_test.sfdb'), self.sfdb_filepath)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_check_datatype_conformity_line_numbers(self):
+        test_sfdb = sfdb.SFDBContainer.from_file(self.sfdb_filepath, rows=range(2, 4))
+
+        non_conform_values = sc.check_datatype_conformity(test_sfdb)
+
+        self.assertEqual([8, 9], [non_conform_values.get_line_number(k) for k in range(len(non_conform_values))])
+        with self.assertLogs(level=LOGFILE_LEVEL) as cm:
+            sc.log_datatype_check(non_conform_values)
+        self.assertRegex(cm.output[1], r'root:\s+8 \|')
+
+    def test_log_duplicates_check_line_numbers(self):
+        test_sfdb = sfdb.SFDBContainer.from_file(self.sfdb_filepath, rows=range(0, 2))
+
+        with self.assertLogs(level=LOGFILE_LEVEL) as cm:
+            sc.log_duplicates_check(test_sfdb.get_duplicates(), entry_offset=test_sfdb.entry_offset)
+        with self.assertLogs(level=LOGFILE_LEVEL) as offset_cm:
+            sc.log_duplicates_check(test_sfdb.get_duplicates(), entry_offset=10)
+
+        self.assertRegex(cm.output[1], r'root:\s+6 \| 7 ')
+        self.assertRegex(offset_cm.output[1], r'root:\s+16 \| 17 ')
+
+    def test_check_sfdb_comparison_excluded_lines(self):
+        sfdb_new = sfdb.SFDBContainer.from_file(self.sfdb_filepath, rows=range(2, 5))
+        sfdb_old = sfdb.SFDBContainer.from_file(self.sfdb_filepath, rows=range(3, 5))
+
+        diverging_lines = sc.check_sfdb_comparison(sfdb_new, sfdb_old, excluded_lines_new=[8])
+
+        self.assertEqual([], diverging_lines)
+
 
 if __name__ == '__main__':
     ut.main()
@@ -0,0 +1,78 @@
+import re
+import unittest as ut
+
+import numpy as np
+
+from sfdbtester.sfdb import sfdb_checks as sc
+from sfdbtester.sfdb import sfdb_findings as sf
+from sfdbtester.tests.test_sfdb import create_test_sfdbcontainer
+
+
+class TestCellFindings(ut.TestCase):
+    def test_from_column_codes_column_major(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['1', '2'], ['3', '4']])
+        column_codes = [(0, np.array([0, 2], dtype=np.int8)), (1, np.array([1, 3], dtype=np.int8))]
+
+        findings = sf.DatatypeFindings.from_column_codes(test_sfdb, column_codes)
+
+        np.testing.assert_array_equal([1, 0, 1], findings.entry_indices)
+        np.testing.assert_array_equal([0, 1, 1], findings.column_indices)
+        np.testing.assert_array_equal([2, 1, 3], findings.error_codes)
+
+    def test_subclass_without_as_tuple(self):
+        class IncompleteFindings(sf.CellFindings):
+            __slots__ = ()
+
+        with self.assertRaises(TypeError):
+            IncompleteFindings(create_test_sfdbcontainer())
+
+    def test_from_column_codes_entry_major(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['1', '2'], ['3', '4']])
+        column_codes = [(0, np.array([0, 4], dtype=np.int8)), (1, np.array([4, 4], dtype=np.int8))]
+
+        findings = sf.RegexFindings.from_column_codes(test_sfdb, column_codes, entry_major=True)
+
+        np.testing.assert_array_equal([0, 1, 1], findings.entry_indices)
+        np.testing.assert_array_equal([1, 0, 1], findings.column_indices)
+
+    def test_compact_storage(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['12345', '2'], ['3', '4']])
+
+        findings = sc.check_datatype_conformity(test_sfdb)
+
+        bytes_per_finding = (findings.entry_indices.itemsize + findings.column_indices.itemsize +
+                             findings.error_codes.itemsize)
+        self.assertEqual(7, bytes_per_finding)
+
+    def test_lazy_rendering(self):
+        test_sfdb = create_test_sfdbcontainer(entries=[['val1', 'val2'], ['val1', '2']])
+        test_column_patterns = {'COLUMN2': re.compile(r'val\d')}
+
+        findings = sc.check_content_against_regex(test_sfdb, test_column_patterns)
+
+        self.assertEqual(1, findings.get_entry_index(0))
+        self.assertEqual('COLUMN2', findings.get_column_name(0))
+        self.assertEqual(' 2-COLUMN2', findings.get_column_string(0))
+        self.assertEqual('2', findings.get_value(0))
+        self.assertEqual('val1\t2', findings.get_line(0))
+        self.assertEqual('Mismatch to regular expression \'val\\d\'!', findings.get_message(0))
+
+    def test_empty_findings_equal_empty_list(self):
+        test_sfdb = create_test_sfdbcontainer()
+
+        findings = sc.check_excel_autoformatting(test_sfdb)
+
+        self.assertEqual([], findings)
+        self.assertEqual(0, len(findings))
+
+    def test_getitem_out_of_bounds(self):
+        test_sfdb = create_test_sfdbcontainer()
+
+        findings = sc.check_excel_autoformatting(test_sfdb)
+
+        with self.assertRaises(IndexError):
+            findings[0]
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest as ut
+
+import numpy as np
+
+from sfdbtester.sfdb.sfdb import SFDBContainer
+from sfdbtester.sfdb.sfdb_index import HashIndex, SortedIndex, build_index, get_index_filepath, join_keys, \
+    load_index
+from sfdbtester.tests.test_sfdb import create_test_sfdbcontainer
+from sfdbtester.tests.test_sfdb_tools import SFDB_HEADER
+
+TEST_ENTRIES = [['b', '2019-03-01'], ['a', '2019-01-15'], ['b', '2019-02-01'], ['c', '2019-01-15']]
+
+
+class TestHashIndex(ut.TestCase):
+    def setUp(self):
+        self.test_sfdb = create_test_sfdbcontainer(entries=TEST_ENTRIES)
+
+    def test_lookup(self):
+        index = self.test_sfdb.create_index('COLUMN1')
+
+        self.assertIsInstance(index, HashIndex)
+        np.testing.assert_array_equal(np.array([0, 2]), index.lookup('b'))
+        np.testing.assert_array_equal(np.array([], dtype=int), index.lookup('x'))
+
+    def test_lookup_multiple_columns(self):
+        index = self.test_sfdb.create_index(['COLUMN2', 'COLUMN1'])
+
+        np.testing.assert_array_equal(np.array([3]), index.lookup(('2019-01-15', 'c')))
+
+    def test_create_index_cached_until_content_changes(self):
+        index = self.test_sfdb.create_index('COLUMN1')
+        self.assertIs(index, self.test_sfdb.create_index('COLUMN1'))
+
+        self.test_sfdb.content = self.test_sfdb.content[:1]
+
+        np.testing.assert_array_equal(np.array([]), self.test_sfdb.create_index('COLUMN1').lookup('a'))
+
+    def test_create_index_invalid_kind(self):
+        with self.assertRaises(ValueError):
+            self.test_sfdb.create_index('COLUMN1', kind='btree')
+
+
+class TestSortedIndex(ut.TestCase):
+    def setUp(self):
+        self.index = create_test_sfdbcontainer(entries=TEST_ENTRIES).create_index('COLUMN2', kind='sorted')
+
+    def test_lookup(self):
+        self.assertIsInstance(self.index, SortedIndex)
+        np.testing.assert_array_equal(np.array([1, 3]), self.index.lookup('2019-01-15'))
+
+    def test_range(self):
+        np.testing.assert_array_equal(np.array([1, 3, 2]), self.index.range('2019-01-01', '2019-02-01'))
+        np.testing.assert_array_equal(np.array([1, 3]), self.index.range('2019-01-01', '2019-02-01',
+                                                                          include_high=False))
+        np.testing.assert_array_equal(np.array([2, 0]), self.index.range(low='2019-01-16'))
+
+    def test_range_empty(self):
+        np.testing.assert_array_equal(np.array([], dtype=int), self.index.range('2019-03-02', '2019-01-01'))
+
+
+class TestPersistIndex(ut.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sfdb_filepath = os.path.join(self.temp_dir.name, 'test.sfdb')
+        with open(self.sfdb_filepath, mode='w', encoding='utf8') as sfdb_stream:
+            sfdb_stream.write('\n'.join(SFDB_HEADER + ['\t'.join(entry) for entry in TEST_ENTRIES]) + '\n')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_and_load(self):
+        keys = join_keys([np.array(['b', 'a', 'b'])])
+        index_filepath = os.path.join(self.temp_dir.name, 'index.npz')
+
+        for kind in ('hash', 'sorted'):
+            build_index(('COLUMN1',), keys, kind).save(index_filepath)
+            index = load_index(index_filepath)
+
+            self.assertEqual(kind, index.kind)
+            self.assertEqual(('COLUMN1',), index.columns)
+            np.testing.assert_array_equal(np.array([0, 2]), index.lookup('b'))
+
+    def test_create_index_persist(self):
+        SFDBContainer.from_file(self.sfdb_filepath).create_index('COLUMN1', persist=True)
+        index_filepath = get_index_filepath(self.sfdb_filepath, ('COLUMN1',), 'hash')
+        self.assertTrue(os.path.exists(index_filepath))
+
+        index = SFDBContainer.from_file(self.sfdb_filepath).create_index('COLUMN1', persist=True)
+
+        np.testing.assert_array_equal(np.array([1]), index.lookup('a'))
+
+    def test_create_index_persist_rebuilt_for_changed_file(self):
+        SFDBContainer.from_file(self.sfdb_filepath).create_index('COLUMN1', persist=True)
+        with open(self.sfdb_filepath, mode='a', encoding='utf8') as sfdb_stream:
+            sfdb_stream.write('a\t2019-04-01\n')
+
+        index = SFDBContainer.from_file(self.sfdb_filepath).create_index('COLUMN1', persist=True)
+
+        np.testing.assert_array_equal(np.array([1, 4]), index.lookup('a'))
+
+    def test_create_index_persist_partial_sfdbs(self):
+        SFDBContainer.from_file(self.sfdb_filepath).create_index('COLUMN1', persist=True)
+
+        window_sfdb = SFDBContainer.from_file(self.sfdb_filepath, rows=range(2, 4))
+        window_index = window_sfdb.create_index('COLUMN1', persist=True)
+        projected_sfdb = SFDBContainer.from_file(self.sfdb_filepath, columns=['COLUMN1'])
+        projected_index = projected_sfdb.create_index('COLUMN1', persist=True)
+        full_index = SFDBContainer.from_file(self.sfdb_filepath).create_index('COLUMN1', persist=True)
+
+        np.testing.assert_array_equal(np.array([0]), window_index.lookup('b'))
+        np.testing.assert_array_equal(np.array([0, 2]), projected_index.lookup('b'))
+        np.testing.assert_array_equal(np.array([0, 2]), full_index.lookup('b'))
+        self.assertTrue(os.path.exists(get_index_filepath(self.sfdb_filepath, ('COLUMN1',), 'hash', 'rows_2-4')))
+        self.assertTrue(os.path.exists(get_index_filepath(self.sfdb_filepath, ('COLUMN1',), 'hash',
+                                                          'columns_COLUMN1')))
+
+
+if __name__ == '__main__':
+    ut.main()
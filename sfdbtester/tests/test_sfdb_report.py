@@ -0,0 +1,91 @@
+import csv
+import json
+import os
+import tempfile
+import unittest as ut
+
+from sfdbtester.common.sfdb_report import FindingsReport, create_report_filepath
+from sfdbtester.sfdb import sfdb_checks as sc
+from sfdbtester.tests.test_sfdb import create_test_sfdbcontainer
+
+
+class TestFindingsReport(ut.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_write_jsonl(self):
+        report_filepath = os.path.join(self.temp_dir.name, 'report.jsonl')
+
+        with FindingsReport(report_filepath, 'jsonl') as report:
+            report.write('regex', 6, 'COLUMN1', 'val1', 'Mismatch')
+            report.write('duplicates', 7, None, 'val1\tval2', 'Duplicate of line 6!')
+
+        with open(report_filepath, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+
+        expected_output = [{'check': 'regex', 'line': 6, 'column': 'COLUMN1', 'value': 'val1', 'message': 'Mismatch'},
+                           {'check': 'duplicates', 'line': 7, 'column': None, 'value': 'val1\tval2',
+                            'message': 'Duplicate of line 6!'}]
+        self.assertEqual(expected_output, records)
+        self.assertEqual(2, report.record_count)
+
+    def test_write_csv(self):
+        report_filepath = os.path.join(self.temp_dir.name, 'report.csv')
+
+        with FindingsReport(report_filepath, 'csv') as report:
+            report.write('regex', 6, 'COLUMN1', 'val1', 'Mismatch')
+
+        with open(report_filepath, encoding='utf-8', newline='') as f:
+            rows = list(csv.reader(f))
+
+        expected_output = [['check', 'line', 'column', 'value', 'message'],
+                           ['regex', '6', 'COLUMN1', 'val1', 'Mismatch']]
+        self.assertEqual(expected_output, rows)
+
+    def test_invalid_report_format(self):
+        report_filepath = os.path.join(self.temp_dir.name, 'report.xml')
+
+        with self.assertRaises(ValueError):
+            FindingsReport(report_filepath, 'xml')
+
+    def test_create_report_filepath(self):
+        report_filepath = create_report_filepath('/dir/table_20-05-14_120000.log', 'csv')
+
+        self.assertEqual('/dir/table_20-05-14_120000.csv', report_filepath)
+
+    def test_report_datatype_check(self):
+        report_filepath = os.path.join(self.temp_dir.name, 'report.jsonl')
+        test_entries = [['12345', 'val2'], ['val3', 'val4']]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries)
+        non_conform_entries = sc.check_datatype_conformity(test_sfdb)
+
+        with FindingsReport(report_filepath) as report:
+            sc.report_datatype_check(report, non_conform_entries)
+
+        with open(report_filepath, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+
+        expected_output = [{'check': 'datatype', 'line': 6, 'column': 'COLUMN1', 'value': '12345',
+                            'message': 'Entry too long with 5 chars! Allowed length is 4!'}]
+        self.assertEqual(expected_output, records)
+
+    def test_report_duplicates_check(self):
+        report_filepath = os.path.join(self.temp_dir.name, 'report.jsonl')
+        test_entries = [['1', '2'], ['3', '4'], ['1', '2'], ['1', '2']]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries)
+
+        with FindingsReport(report_filepath) as report:
+            sc.report_duplicates_check(report, sc.check_for_duplicates(test_sfdb))
+
+        with open(report_filepath, encoding='utf-8') as f:
+            lines = [json.loads(line)['line'] for line in f]
+
+        expected_output = [8, 9]
+        self.assertEqual(expected_output, lines)
+
+
+if __name__ == '__main__':
+    ut.main()
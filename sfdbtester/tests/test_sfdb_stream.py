@@ -0,0 +1,136 @@
+import io
+import os
+import tempfile
+import unittest as ut
+
+import numpy as np
+
+from sfdbtester.sfdb.sfdb_stream import NotSFDBFileError, SFDBHeader, iter_line_chunks, read_sfdb_header, \
+    get_header_columns, build_line_offsets, get_line_offsets, get_line_offsets_filepath, read_entry_lines
+
+SFDB_HEADER = 'ENCODING UTF8\nINIT\nTABLE\tTEST_TABLE\nCOLUMNS\tCOLUMN1\tCOLUMN2\nINSERT\n'
+
+
+class TestSFDBStream(ut.TestCase):
+    def test_read_sfdb_header(self):
+        sfdb_stream = io.StringIO(SFDB_HEADER + 'val1\tval2\n')
+
+        header_lines = read_sfdb_header(sfdb_stream)
+
+        self.assertEqual('INSERT', header_lines[-1])
+        self.assertEqual('val1\tval2\n', sfdb_stream.readline())
+
+    def test_read_sfdb_header_wrong_header(self):
+        sfdb_stream = io.StringIO('ENCODING UTF8\nINIT\nCOLUMNS\tCOLUMN1\n')
+
+        with self.assertRaises(NotSFDBFileError):
+            read_sfdb_header(sfdb_stream, 'wrong.sfdb')
+
+    def test_get_header_columns(self):
+        header_lines = read_sfdb_header(io.StringIO(SFDB_HEADER))
+
+        self.assertEqual(('TEST_TABLE', ['COLUMN1', 'COLUMN2']), get_header_columns(header_lines))
+
+    def test_iter_line_chunks(self):
+        sfdb_stream = io.StringIO('a\nb\nc\n')
+
+        chunks = list(iter_line_chunks(sfdb_stream, chunk_size=2))
+
+        self.assertEqual([['a', 'b'], ['c']], chunks)
+
+    def test_iter_line_chunks_drops_empty_last_line(self):
+        sfdb_stream = io.StringIO('a\nb\n\n')
+
+        chunks = list(iter_line_chunks(sfdb_stream, chunk_size=2))
+
+        self.assertEqual([['a', 'b']], chunks)
+
+    def test_iter_line_chunks_keeps_empty_inner_line(self):
+        sfdb_stream = io.StringIO('a\n\nb\n')
+
+        chunks = list(iter_line_chunks(sfdb_stream, chunk_size=1))
+
+        self.assertEqual([['a'], [''], ['b']], chunks)
+
+
+class TestSFDBHeader(ut.TestCase):
+    def setUp(self):
+        self.header = SFDBHeader(SFDB_HEADER.splitlines())
+
+    def test_attributes(self):
+        self.assertEqual('TEST_TABLE', self.header.name)
+        self.assertEqual(('COLUMN1', 'COLUMN2'), self.header.columns)
+        self.assertEqual(('TABLE', 'TEST_TABLE'), self.header.fields[2])
+
+    def test_index(self):
+        self.assertEqual(1, self.header.index('COLUMN2'))
+        with self.assertRaises(KeyError):
+            self.header.index('COLUMN3')
+
+    def test_get_column_indices(self):
+        self.assertEqual([1, 0], self.header.get_column_indices(['COLUMN2', 'COLUMN1']))
+        self.assertEqual([0, 1], self.header.get_column_indices(None))
+        with self.assertRaises(ValueError):
+            self.header.get_column_indices(['COLUMN3'])
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.header.name = 'OTHER_TABLE'
+        with self.assertRaises(TypeError):
+            self.header.column_indices['COLUMN3'] = 2
+
+    def test_equality(self):
+        self.assertEqual(self.header, SFDBHeader(SFDB_HEADER.splitlines()))
+        self.assertEqual(hash(self.header), hash(SFDBHeader(SFDB_HEADER.splitlines())))
+
+
+class TestLineOffsets(ut.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sfdb_filepath = os.path.join(self.temp_dir.name, 'test.sfdb')
+        with open(self.sfdb_filepath, mode='w', encoding='utf8', newline='') as sfdb_stream:
+            sfdb_stream.write(SFDB_HEADER + ''.join(f'val{i}\tä{i}\n' for i in range(10)) + '\n')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_build_line_offsets(self):
+        offsets = build_line_offsets(self.sfdb_filepath, stride=4)
+
+        self.assertEqual(3, len(offsets))
+        with open(self.sfdb_filepath, mode='rb') as sfdb_stream:
+            sfdb_stream.seek(offsets[1])
+            self.assertEqual('val4\tä4\n', sfdb_stream.readline().decode('utf-8'))
+
+    def test_read_entry_lines(self):
+        offsets = build_line_offsets(self.sfdb_filepath, stride=4)
+
+        lines = read_entry_lines(self.sfdb_filepath, 5, 9, offsets, stride=4)
+
+        self.assertEqual([f'val{i}\tä{i}' for i in range(5, 9)], lines)
+
+    def test_read_entry_lines_end_of_file(self):
+        offsets = build_line_offsets(self.sfdb_filepath, stride=4)
+
+        self.assertEqual(['val9\tä9'], read_entry_lines(self.sfdb_filepath, 9, 20, offsets, stride=4))
+        self.assertEqual([], read_entry_lines(self.sfdb_filepath, 20, 30, offsets, stride=4))
+
+    def test_read_entry_lines_invalid_range(self):
+        with self.assertRaises(ValueError):
+            read_entry_lines(self.sfdb_filepath, -1, 2, np.array([0]))
+
+    def test_get_line_offsets_persisted(self):
+        offsets = get_line_offsets(self.sfdb_filepath, stride=4)
+        offsets_filepath = get_line_offsets_filepath(self.sfdb_filepath)
+        self.assertTrue(os.path.exists(offsets_filepath))
+        with np.load(offsets_filepath) as data:
+            np.testing.assert_array_equal(offsets, data['offsets'])
+
+        with open(self.sfdb_filepath, mode='a', encoding='utf8') as sfdb_stream:
+            sfdb_stream.write('val10\tä10\n' * 8)
+
+        self.assertEqual(5, len(get_line_offsets(self.sfdb_filepath, stride=4)))
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,305 @@
+import json
+import os
+import re
+import tempfile
+import unittest as ut
+from unittest import mock
+
+import numpy as np
+
+from sfdbtester.common.sfdb_logging import LOGFILE_LEVEL
+from sfdbtester.common.sfdb_report import FindingsReport
+from sfdbtester.sfdb import sfdb_checks as sc
+from sfdbtester.sfdb.sfdb import SFDBContainer
+from sfdbtester.sfdb.sfdb_tools import PARSED_SIZE_FACTOR, dedup_sfdb_file, merge_sorted_sfdb_files, repair_sfdb_file, \
+    sort_sfdb_file, split_sfdb_file
+from sfdbtester.sfdb.sql_table_schema import Column
+from sfdbtester.tests.test_sql_table_schema import create_test_sqltableschema
+
+SFDB_HEADER = ['ENCODING UTF8', 'INIT', 'TABLE\tTEST_TABLE', 'COLUMNS\tCOLUMN1\tCOLUMN2', 'INSERT']
+
+
+class TestSortSFDBFile(ut.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sfdb_filepath = os.path.join(self.temp_dir.name, 'test.sfdb')
+        self.output_filepath = os.path.join(self.temp_dir.name, 'sorted.sfdb')
+        self.entries = ['d\t1', 'b\t3', 'a\t2', 'b\t3', 'c\t1', 'a\t1', 'b\t3', 'e\t0']
+        self._write_sfdb(self.entries)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_sfdb(self, entries):
+        with open(self.sfdb_filepath, mode='w', encoding='utf8') as sfdb_stream:
+            sfdb_stream.write('\n'.join(SFDB_HEADER + entries) + '\n')
+
+    def _read_output(self):
+        with open(self.output_filepath, encoding='utf8') as output_stream:
+            return output_stream.read().splitlines()
+
+    def test_sort_sfdb_file_in_memory(self):
+        sort_sfdb_file(self.sfdb_filepath, self.output_filepath)
+
+        self.assertEqual(SFDB_HEADER + sorted(self.entries), self._read_output())
+
+    def test_sort_sfdb_file_external(self):
+        sort_sfdb_file(self.sfdb_filepath, self.output_filepath, memory_budget=10)
+
+        self.assertEqual(SFDB_HEADER + sorted(self.entries), self._read_output())
+
+    def test_sort_sfdb_file_external_remove_duplicates(self):
+        sort_sfdb_file(self.sfdb_filepath, self.output_filepath, remove_duplicates=True, memory_budget=10)
+
+        self.assertEqual(SFDB_HEADER + sorted(set(self.entries)), self._read_output())
+
+    def test_sort_sfdb_file_external_sort_columns_is_stable(self):
+        sort_sfdb_file(self.sfdb_filepath, self.output_filepath, sort_columns=['COLUMN2'], memory_budget=10)
+
+        expected_entries = sorted(self.entries, key=lambda line: line.split('\t')[1])
+        self.assertEqual(SFDB_HEADER + expected_entries, self._read_output())
+
+    def test_sort_sfdb_file_external_equals_in_memory(self):
+        self._write_sfdb([f'{(i * 7919) % 101}\t{i % 3}' for i in range(300)])
+
+        sort_sfdb_file(self.sfdb_filepath, self.output_filepath, sort_columns=['COLUMN2'], remove_duplicates=True)
+        in_memory_output = self._read_output()
+        sort_sfdb_file(self.sfdb_filepath, self.output_filepath, sort_columns=['COLUMN2'], remove_duplicates=True,
+                       memory_budget=100 * PARSED_SIZE_FACTOR)
+
+        self.assertEqual(in_memory_output, self._read_output())
+
+    def test_sort_sfdb_file_budget_includes_parsed_size(self):
+        file_size = os.path.getsize(self.sfdb_filepath)
+
+        with mock.patch.object(SFDBContainer, 'from_file') as from_file:
+            sort_sfdb_file(self.sfdb_filepath, self.output_filepath, memory_budget=file_size)
+
+        from_file.assert_not_called()
+        self.assertEqual(SFDB_HEADER + sorted(self.entries), self._read_output())
+
+    def test_sort_sfdb_file_invalid_sort_column(self):
+        with self.assertRaises(ValueError):
+            sort_sfdb_file(self.sfdb_filepath, self.output_filepath, sort_columns=['COLUMN3'], memory_budget=10)
+
+
+class TestDedupSFDBFile(ut.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sfdb_filepath = os.path.join(self.temp_dir.name, 'test.sfdb')
+        self.output_filepath = os.path.join(self.temp_dir.name, 'deduplicated.sfdb')
+        entries = ['b\t3', 'a\t2', 'b\t3', 'a\t2\t', 'b\t3', 'a\t2']
+        with open(self.sfdb_filepath, mode='w', encoding='utf8') as sfdb_stream:
+            sfdb_stream.write('\n'.join(SFDB_HEADER + entries) + '\n')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_dedup_sfdb_file_keeps_first_occurrence(self):
+        duplicate_count = dedup_sfdb_file(self.sfdb_filepath, self.output_filepath, chunk_size=2)
+
+        with open(self.output_filepath, encoding='utf8') as output_stream:
+            output = output_stream.read().splitlines()
+        self.assertEqual(SFDB_HEADER + ['b\t3', 'a\t2', 'a\t2\t'], output)
+        self.assertEqual(3, duplicate_count)
+
+
+class TestRepairSFDBFile(ut.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sfdb_filepath = os.path.join(self.temp_dir.name, 'test.sfdb')
+        self.output_filepath = os.path.join(self.temp_dir.name, 'repaired.sfdb')
+        self.rejects_filepath = os.path.join(self.temp_dir.name, 'rejected.tsv')
+        entries = ['a\t1', 'b', 'a\t1', 'c\tx', 'toolong\t2', 'd\t3\t4', 'b\t5']
+        with open(self.sfdb_filepath, mode='w', encoding='utf8') as sfdb_stream:
+            sfdb_stream.write('\n'.join(SFDB_HEADER + entries) + '\n')
+        self.schema = create_test_sqltableschema(column_names=('COLUMN1', 'COLUMN2'),
+                                                 column_properties=(Column('COLUMN1', 'nvarchar', 4, False),
+                                                                    Column('COLUMN2', 'int', 4, False)))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _read_lines(self, filepath):
+        with open(filepath, encoding='utf8') as stream:
+            return stream.read().splitlines()
+
+    def test_repair_sfdb_file(self):
+        reject_counts = repair_sfdb_file(self.sfdb_filepath, self.output_filepath, self.rejects_filepath, chunk_size=3)
+
+        self.assertEqual(SFDB_HEADER + ['a\t1', 'c\tx', 'toolong\t2', 'b\t5'], self._read_lines(self.output_filepath))
+        self.assertEqual(['7\twrong value count\tb', '8\tduplicate\ta\t1', '11\twrong value count\td\t3\t4'],
+                         self._read_lines(self.rejects_filepath))
+        self.assertEqual({'wrong value count': 2, 'duplicate': 1}, reject_counts)
+
+    def test_repair_sfdb_file_reject_invalid(self):
+        column_patterns = {'COLUMN1': re.compile('^a')}
+
+        reject_counts = repair_sfdb_file(self.sfdb_filepath, self.output_filepath, self.rejects_filepath,
+                                         reject_invalid=True, column_patterns=column_patterns, schema=self.schema)
+
+        self.assertEqual(SFDB_HEADER + ['a\t1'], self._read_lines(self.output_filepath))
+        self.assertEqual({'wrong value count': 2, 'duplicate': 1, 'datatype mismatch': 2, 'regex mismatch': 1},
+                         reject_counts)
+
+    def test_repair_sfdb_file_without_rejects_file(self):
+        repair_sfdb_file(self.sfdb_filepath, self.output_filepath, remove_duplicates=False)
+
+        self.assertEqual(SFDB_HEADER + ['a\t1', 'a\t1', 'c\tx', 'toolong\t2', 'b\t5'],
+                         self._read_lines(self.output_filepath))
+        self.assertFalse(os.path.exists(self.rejects_filepath))
+
+
+class TestMergeSortedSFDBFiles(ut.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_filepath = os.path.join(self.temp_dir.name, 'merged.sfdb')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_shard(self, name, entries, header=SFDB_HEADER):
+        shard_filepath = os.path.join(self.temp_dir.name, name)
+        with open(shard_filepath, mode='w', encoding='utf8') as shard_stream:
+            shard_stream.write('\n'.join(header + entries) + '\n')
+        return shard_filepath
+
+    def _read_output(self):
+        with open(self.output_filepath, encoding='utf8') as output_stream:
+            return output_stream.read().splitlines()
+
+    def test_merge_sorted_sfdb_files(self):
+        shard_filepaths = [self._write_shard('1.sfdb', ['a\t1', 'b\t2', 'c\t3']),
+                           self._write_shard('2.sfdb', ['a\t1', 'b\t5', 'd\t0']),
+                           self._write_shard('3.sfdb', ['b\t2'])]
+
+        duplicates = merge_sorted_sfdb_files(shard_filepaths, self.output_filepath, chunk_size=2)
+
+        self.assertEqual(SFDB_HEADER + ['a\t1', 'b\t2', 'b\t5', 'c\t3', 'd\t0'], self._read_output())
+        self.assertEqual(2, len(duplicates))
+        np.testing.assert_array_equal(np.array(['a', '1']), duplicates[0].entry)
+        self.assertEqual([(shard_filepaths[0], 6), (shard_filepaths[1], 6)], duplicates[0].occurrences)
+        self.assertEqual(6, duplicates[0].output_line)
+        np.testing.assert_array_equal(np.array(['b', '2']), duplicates[1].entry)
+        self.assertEqual([(shard_filepaths[0], 7), (shard_filepaths[2], 6)], duplicates[1].occurrences)
+        self.assertEqual(7, duplicates[1].output_line)
+        self.assertTrue(all(duplicate.across_shards for duplicate in duplicates))
+
+    def test_merge_sorted_sfdb_files_duplicates_within_shard(self):
+        shard_filepaths = [self._write_shard('1.sfdb', ['a\t1', 'b\t2', 'b\t2']),
+                           self._write_shard('2.sfdb', ['a\t1'])]
+
+        duplicates = merge_sorted_sfdb_files(shard_filepaths, self.output_filepath)
+
+        self.assertEqual(SFDB_HEADER + ['a\t1', 'b\t2'], self._read_output())
+        self.assertEqual([True, False], [duplicate.across_shards for duplicate in duplicates])
+        self.assertEqual([(shard_filepaths[0], 7), (shard_filepaths[0], 8)], duplicates[1].occurrences)
+
+    def test_merge_sorted_sfdb_files_log_and_report_duplicates(self):
+        shard_filepaths = [self._write_shard('1.sfdb', ['a\t1', 'b\t2']),
+                           self._write_shard('2.sfdb', ['a\t1', 'a\t1'])]
+        report_filepath = os.path.join(self.temp_dir.name, 'report.jsonl')
+
+        duplicates = merge_sorted_sfdb_files(shard_filepaths, self.output_filepath)
+        with self.assertLogs(level=LOGFILE_LEVEL) as cm:
+            sc.log_shard_duplicates_check(duplicates)
+        with FindingsReport(report_filepath) as report:
+            sc.report_shard_duplicates_check(report, duplicates)
+
+        self.assertIn(f'{shard_filepaths[1]}:6, {shard_filepaths[1]}:7', cm.output[1])
+        self.assertIn("'a\t1'", cm.output[1])
+        with open(report_filepath, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([6, 7], [record['line'] for record in records])
+        self.assertEqual(f'Duplicate in {shard_filepaths[1]} of line 6 of the merged file!', records[0]['message'])
+
+    def test_merge_sorted_sfdb_files_sort_columns(self):
+        shard_filepaths = [self._write_shard('1.sfdb', ['b\t1', 'a\t3']),
+                           self._write_shard('2.sfdb', ['c\t1', 'b\t1', 'c\t2'])]
+
+        duplicates = merge_sorted_sfdb_files(shard_filepaths, self.output_filepath, sort_columns=['COLUMN2'])
+
+        self.assertEqual(SFDB_HEADER + ['b\t1', 'c\t1', 'c\t2', 'a\t3'], self._read_output())
+        self.assertEqual([(shard_filepaths[0], 6), (shard_filepaths[1], 7)], duplicates[0].occurrences)
+
+    def test_merge_sorted_sfdb_files_keep_duplicates(self):
+        shard_filepaths = [self._write_shard('1.sfdb', ['a\t1']), self._write_shard('2.sfdb', ['a\t1'])]
+
+        duplicates = merge_sorted_sfdb_files(shard_filepaths, self.output_filepath, remove_duplicates=False)
+
+        self.assertEqual(SFDB_HEADER + ['a\t1', 'a\t1'], self._read_output())
+        self.assertEqual([], duplicates)
+
+    def test_merge_sorted_sfdb_files_unsorted_shard(self):
+        shard_filepaths = [self._write_shard('1.sfdb', ['b\t1', 'a\t1'])]
+
+        with self.assertRaises(ValueError):
+            merge_sorted_sfdb_files(shard_filepaths, self.output_filepath)
+
+    def test_merge_sorted_sfdb_files_different_headers(self):
+        other_header = SFDB_HEADER[:2] + ['TABLE\tOTHER_TABLE'] + SFDB_HEADER[3:]
+        shard_filepaths = [self._write_shard('1.sfdb', ['a\t1']),
+                           self._write_shard('2.sfdb', ['a\t1'], header=other_header)]
+
+        with self.assertRaises(ValueError):
+            merge_sorted_sfdb_files(shard_filepaths, self.output_filepath)
+
+
+class TestSplitSFDBFile(ut.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sfdb_filepath = os.path.join(self.temp_dir.name, 'test.sfdb')
+        self.entries = ['a\t1', 'b\t2', 'c\t3', 'a\t4', 'b\t5', 'c\t6', 'a\t7']
+        with open(self.sfdb_filepath, mode='w', encoding='utf8') as sfdb_stream:
+            sfdb_stream.write('\n'.join(SFDB_HEADER + self.entries) + '\n')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _read_entries(self, filepaths):
+        return [SFDBContainer.from_file(filepath).sfdb_lines[5:] for filepath in filepaths]
+
+    def test_split_sfdb_file_by_rows(self):
+        output_filepaths = split_sfdb_file(self.sfdb_filepath, rows_per_file=3, chunk_size=2)
+
+        expected_filepaths = [os.path.join(self.temp_dir.name, f'test_part_{i}.sfdb') for i in (1, 2, 3)]
+        self.assertEqual(expected_filepaths, output_filepaths)
+        self.assertEqual([self.entries[:3], self.entries[3:6], self.entries[6:]], self._read_entries(output_filepaths))
+
+    def test_split_sfdb_file_by_bytes(self):
+        output_filepaths = split_sfdb_file(self.sfdb_filepath, bytes_per_file=8)
+
+        self.assertEqual([self.entries[:2], self.entries[2:4], self.entries[4:6], self.entries[6:]],
+                         self._read_entries(output_filepaths))
+
+    def test_split_sfdb_file_by_key(self):
+        output_prefix = os.path.join(self.temp_dir.name, 'shard')
+
+        output_filepaths = split_sfdb_file(self.sfdb_filepath, key_columns=['COLUMN1'], file_count=2,
+                                           output_prefix=output_prefix, chunk_size=2)
+
+        shard_entries = self._read_entries(output_filepaths)
+        self.assertEqual(2, len(output_filepaths))
+        self.assertEqual(sorted(self.entries), sorted(sum(shard_entries, [])))
+        for key in 'abc':
+            self.assertEqual(1, sum(any(line.startswith(key) for line in entries) for entries in shard_entries))
+
+    def test_split_sfdb_file_without_partitioning(self):
+        with self.assertRaises(ValueError):
+            split_sfdb_file(self.sfdb_filepath)
+
+    def test_split_sfdb_file_by_key_without_file_count(self):
+        with self.assertRaises(ValueError):
+            split_sfdb_file(self.sfdb_filepath, key_columns=['COLUMN1'])
+
+    def test_split_sfdb_file_by_rows_not_positive(self):
+        with self.assertRaises(ValueError):
+            split_sfdb_file(self.sfdb_filepath, rows_per_file=0)
+
+    def test_split_sfdb_file_by_bytes_not_positive(self):
+        with self.assertRaises(ValueError):
+            split_sfdb_file(self.sfdb_filepath, bytes_per_file=-1)
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,118 @@
+import unittest as ut
+
+import numpy as np
+
+from sfdbtester.sfdb import sfdb_checks as sc
+from sfdbtester.sfdb.sql_datatypes import get_datatype_validator, to_datetime64
+from sfdbtester.sfdb.sql_table_schema import Column
+from sfdbtester.tests.test_sfdb import create_test_sfdbcontainer
+from sfdbtester.tests.test_sql_table_schema import create_test_sqltableschema
+
+
+class TestGetDatatypeValidator(ut.TestCase):
+    def assertValidity(self, datatype, length, values, expected_validity):
+        validator = get_datatype_validator(datatype, length)
+        np.testing.assert_array_equal(np.array(expected_validity), validator(np.array(values)))
+
+    def test_get_datatype_validator_unknown_datatype(self):
+        self.assertIsNone(get_datatype_validator('geography', 8))
+
+    def test_tinyint(self):
+        self.assertValidity('tinyint', 1, ['0', '255', '256', '-1', '12a', ''],
+                            [True, True, False, False, False, False])
+
+    def test_smallint(self):
+        self.assertValidity('smallint', 2, ['-32768', '32767', '32768', '-32769', '-'],
+                            [True, True, False, False, False])
+
+    def test_bigint_boundaries(self):
+        self.assertValidity('bigint', 8, ['9223372036854775807', '-9223372036854775808',
+                                          '9223372036854775808', '-9223372036854775809', '00000000000000000000001'],
+                            [True, True, False, False, True])
+
+    def test_decimal(self):
+        self.assertValidity('decimal(5,2)', 5, ['123.45', '-1.5', '.5', '1234.5', '1.234', '1.2.3', '.', 'abc'],
+                            [True, True, True, False, False, False, False, False])
+
+    def test_decimal_default_precision_and_scale(self):
+        self.assertValidity('numeric', 9, ['123456789012345678', '1234567890123456789', '1.5'],
+                            [True, False, False])
+
+    def test_float(self):
+        self.assertValidity('float', 8, ['1', '-1.5', '1.5e10', '.5E-3', '1e', 'abc'],
+                            [True, True, True, True, False, False])
+
+    def test_char(self):
+        self.assertValidity('char', 4, ['abcd', 'abcde', 'äöüß'], [True, False, True])
+
+    def test_varchar_length_from_datatype(self):
+        self.assertValidity('varchar(2)', 10, ['ab', 'abc'], [True, False])
+
+    def test_date(self):
+        self.assertValidity('date', 3, ['2019-01-31', '2020-02-29', '2019-02-29', '2020-13-45', '2019-1-31',
+                                        '31.01.2019'],
+                            [True, True, False, False, False, False])
+
+    def test_datetime_default_range(self):
+        self.assertValidity('datetime', 10, ['1753-01-01', '1752-12-31', '9999-12-31'], [True, False, True])
+
+    def test_datetime_custom_range(self):
+        validator = get_datatype_validator('datetime', 10, min_value='2000-01-01', max_value='2000-12-31')
+
+        validity = validator(np.array(['1999-12-31', '2000-06-15', '2001-01-01']))
+
+        np.testing.assert_array_equal(np.array([False, True, False]), validity)
+        self.assertEqual('datetime [2000-01-01, 2000-12-31]', validator.pattern)
+
+    def test_datetime2_with_time(self):
+        self.assertValidity('datetime2', 10, ['2019-01-31 23:59:59.1234567', '2019-01-31T12:00', '2019-01-31 24:00',
+                                              '2019-01-31_12:00', '2019-01-31 '],
+                            [True, True, False, False, False])
+
+    def test_to_datetime64(self):
+        dates = to_datetime64(np.array(['2019-12-31', '2019-02-30', '']))
+
+        np.testing.assert_array_equal(np.array(['2019-12-31', 'NaT', 'NaT'], dtype='datetime64[D]'), dates)
+
+    def test_time(self):
+        self.assertValidity('time', 5, ['23:59', '23:59:59.1234567', '24:00', '12:60'], [True, True, False, False])
+
+    def test_uniqueidentifier(self):
+        self.assertValidity('uniqueidentifier', 16, ['6F9619FF-8B86-D011-B42D-00C04FC964FF',
+                                                     '6f9619ff-8b86-d011-b42d-00c04fc964ff',
+                                                     '6F9619FF8B86-D011-B42D-00C04FC964FF0',
+                                                     '6G9619FF-8B86-D011-B42D-00C04FC964FF',
+                                                     '6F9619FF-8B86-D011-B42D-00C04FC964F'],
+                            [True, True, False, False, False])
+
+
+class TestDatatypeCheckWithValidators(ut.TestCase):
+    def test_check_datatype_conformity_tinyint_and_guid(self):
+        test_schema = create_test_sqltableschema(column_names=('COLUMN1', 'COLUMN2'),
+                                                 column_properties=(Column('COLUMN1', 'tinyint', 1, True),
+                                                                    Column('COLUMN2', 'uniqueidentifier', 16, False)))
+        test_entries = [['12', '6F9619FF-8B86-D011-B42D-00C04FC964FF'], ['300', 'no guid'], ['', '']]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries, schema=test_schema)
+
+        faulty_entries = sc.check_datatype_conformity(test_sfdb)
+
+        self.assertEqual([(1, ' 1-COLUMN1', "Mismatch to SQL datatype-pattern 'tinyint [0, 255]'!"),
+                          (1, ' 2-COLUMN2', "Mismatch to SQL datatype-pattern 'xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx'!"),
+                          (2, ' 2-COLUMN2', 'Null not allowed in column !')],
+                         [(entry[0], entry[1], entry[4]) for entry in faulty_entries])
+
+    def test_check_datatype_conformity_datetime_range(self):
+        test_schema = create_test_sqltableschema(column_names=('COLUMN1', 'COLUMN2'),
+                                                 column_properties=(Column('COLUMN1', 'datetime', 10, True,
+                                                                           min_value='2000-01-01'),
+                                                                    Column('COLUMN2', 'nvarchar', 8, True)))
+        test_entries = [['2020-02-30', 'val1'], ['1999-12-31', 'val2'], ['2000-01-01', 'val3']]
+        test_sfdb = create_test_sfdbcontainer(entries=test_entries, schema=test_schema)
+
+        faulty_entries = sc.check_datatype_conformity(test_sfdb)
+
+        self.assertEqual([0, 1], [entry[0] for entry in faulty_entries])
+
+
+if __name__ == '__main__':
+    ut.main()
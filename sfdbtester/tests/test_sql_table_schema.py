@@ -1,7 +1,13 @@
+import json
+import os
+import tempfile
 import unittest as ut
 
+import numpy as np
+
+from sfdbtester.sfdb.sql_datatypes import to_int64
 from sfdbtester.sfdb.sql_table_schema import Column
-from sfdbtester.sfdb.sql_table_schema import SQLTableSchema
+from sfdbtester.sfdb.sql_table_schema import SQLTableSchema, SchemaRegistry, convert_schema_file_to_store
 
 
 def create_test_sqltableschema(column_names=('1', '2'), schema_name='TEST_SCHEMA',
@@ -34,6 +40,32 @@ class TestSQLTableSchema(ut.TestCase):
         test_schema_without_known_schema = SQLTableSchema('UNKNOWN_SCHEMA')
         self.assertFalse(test_schema_without_known_schema.is_full_schema())
 
+    def test_column_properties_modifiable_copy(self):
+        test_schema = SQLTableSchema('FULL_TEST')
+
+        test_schema.column_properties['NEW_COLUMN'] = Column('NEW_COLUMN', 'int', 4, True)
+
+        self.assertIn('NEW_COLUMN', test_schema.columns)
+        self.assertNotIn('NEW_COLUMN', SQLTableSchema.get_shared('FULL_TEST').columns)
+        self.assertNotIn('NEW_COLUMN', SQLTableSchema('FULL_TEST').columns)
+
+    def test_get_datatype_validator_integer_value_range(self):
+        test_schema = SQLTableSchema('FULL_TEST')
+
+        self.assertEqual((0, 1), test_schema.get_datatype_validator('BIT_WITH_NULL').value_range)
+        self.assertEqual((0, 1), test_schema.get_datatype_validator('BOOL_WITH_NULL').value_range)
+        self.assertEqual((0, 99999999), test_schema.get_datatype_validator('INT_WITH_NULL').value_range)
+        self.assertIsNone(test_schema.get_datatype_validator('NVARCHAR_WITH_NULL').value_range)
+
+    def test_get_datatype_validator_validate_numbers_like_regex(self):
+        test_schema = create_test_sqltableschema(column_properties=(Column('1', 'int', 4, False),
+                                                                    Column('2', 'bit', 4, False)))
+        values = np.array(['-0', '-00', '00', '0012', '12345', '1', '0', '2'])
+
+        for column_name in test_schema.columns:
+            validator = test_schema.get_datatype_validator(column_name)
+            np.testing.assert_array_equal(validator(values), validator.validate_numbers(*to_int64(values), values))
+
     def test_get_datatype_regex_pattern_wrong_column(self):
         test_schema = create_test_sqltableschema()
         with self.assertRaises(ValueError):
@@ -202,5 +234,122 @@ class TestSQLTableSchema(ut.TestCase):
         self.assertIsNone(datetime2_pattern.match(test_string))
 
 
+class TestSchemaRegistry(ut.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.schema_file = os.path.join(self.temp_dir.name, 'schemas.json')
+        self._write_schema_file({'TABLE': [{'column_name': 'C1', 'datatype': 'nvarchar', 'length': 4,
+                                            'with_null': True}]})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_schema_file(self, schemas, mtime_ns=None):
+        with open(self.schema_file, mode='w') as f:
+            json.dump(schemas, f)
+        if mtime_ns is not None:
+            os.utime(self.schema_file, ns=(mtime_ns, mtime_ns))
+
+    def test_get_column_properties_known_table(self):
+        registry = SchemaRegistry(self.schema_file)
+
+        column_properties = registry.get_column_properties('TABLE')
+
+        self.assertEqual({'C1': Column('C1', 'nvarchar', 4, True)}, dict(column_properties))
+
+    def test_get_column_properties_range_rules(self):
+        self._write_schema_file({'TABLE': [{'column_name': 'C1', 'datatype': 'datetime', 'length': 8,
+                                            'with_null': True, 'min_value': '2000-01-01'}]})
+        registry = SchemaRegistry(self.schema_file)
+
+        column_properties = registry.get_column_properties('TABLE')
+
+        self.assertEqual(Column('C1', 'datetime', 10, True, '2000-01-01', None), column_properties['C1'])
+
+    def test_get_column_properties_unknown_table(self):
+        registry = SchemaRegistry(self.schema_file)
+
+        self.assertIsNone(registry.get_column_properties('UNKNOWN_TABLE'))
+
+    def test_get_column_properties_read_only(self):
+        registry = SchemaRegistry(self.schema_file)
+
+        with self.assertRaises(TypeError):
+            registry.get_column_properties('TABLE')['C2'] = Column('C2', 'int', 4, True)
+
+    def test_get_schema_shared_instance(self):
+        registry = SchemaRegistry(self.schema_file)
+
+        self.assertIs(registry.get_schema('TABLE'), registry.get_schema('TABLE'))
+
+    def test_get_schema_immutable(self):
+        registry = SchemaRegistry(self.schema_file)
+        schema = registry.get_schema('TABLE')
+
+        with self.assertRaises(AttributeError):
+            schema.columns = {}
+
+    def test_reload_on_modification(self):
+        self._write_schema_file({'TABLE': []}, mtime_ns=1_000_000_000)
+        registry = SchemaRegistry(self.schema_file)
+        old_schema = registry.get_schema('TABLE')
+
+        self._write_schema_file({'TABLE': [{'column_name': 'C1', 'datatype': 'int', 'length': 4, 'with_null': True}]},
+                                mtime_ns=2_000_000_000)
+        new_schema = registry.get_schema('TABLE')
+
+        self.assertIsNot(old_schema, new_schema)
+        self.assertEqual(['C1'], new_schema.columns)
+
+    def test_no_reload_without_modification(self):
+        registry = SchemaRegistry(self.schema_file)
+        column_properties = registry.get_column_properties('TABLE')
+
+        self.assertIs(column_properties, registry.get_column_properties('TABLE'))
+
+    def test_datetime_length(self):
+        self._write_schema_file({'TABLE': [{'column_name': 'C1', 'datatype': 'datetime', 'length': 1,
+                                            'with_null': True}]})
+        registry = SchemaRegistry(self.schema_file)
+
+        self.assertEqual(10, registry.get_column_properties('TABLE')['C1'].length)
+
+    def test_convert_schema_file_to_store(self):
+        self._write_schema_file({'TABLE_A': [], 'TABLE/B': []})
+        store_dir = os.path.join(self.temp_dir.name, 'store')
+
+        manifest_path = convert_schema_file_to_store(self.schema_file, store_dir)
+
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        expected_output = {'tables': {'TABLE_A': 'TABLE_A.json', 'TABLE/B': 'TABLE_B.json'}}
+        self.assertEqual(expected_output, manifest)
+        self.assertTrue(os.path.isfile(os.path.join(store_dir, 'TABLE_B.json')))
+
+    def test_schema_store_lookup(self):
+        column = {'column_name': 'C1', 'datatype': 'int', 'length': 4, 'with_null': False}
+        self._write_schema_file({'TABLE_A': [column], 'TABLE_B': [column]})
+        store_dir = os.path.join(self.temp_dir.name, 'store')
+        convert_schema_file_to_store(self.schema_file, store_dir)
+        os.remove(os.path.join(store_dir, 'TABLE_B.json'))  # Proves that only the requested table is read
+        registry = SchemaRegistry(store_dir)
+
+        column_properties = registry.get_column_properties('TABLE_A')
+
+        self.assertEqual({'C1': Column('C1', 'int', 4, False)}, dict(column_properties))
+        self.assertIsNone(registry.get_column_properties('UNKNOWN_TABLE'))
+
+    def test_open_switches_schema_source(self):
+        registry = SchemaRegistry(self.schema_file)
+        other_schema_file = os.path.join(self.temp_dir.name, 'other_schemas.json')
+        with open(other_schema_file, mode='w') as f:
+            json.dump({'OTHER_TABLE': []}, f)
+
+        registry.open(other_schema_file)
+
+        self.assertIsNone(registry.get_column_properties('TABLE'))
+        self.assertIsNotNone(registry.get_column_properties('OTHER_TABLE'))
+
+
 if __name__ == '__main__':
     ut.main()